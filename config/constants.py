@@ -1,9 +1,24 @@
 import re
+import sys
+from bisect import bisect_left, bisect_right
 
 # 거리 상수
 HALF_KM = 21.0
 FULL_KM = 42.1
 STANDARD_DISTANCES = [5.0, 10.0, 21.1, 42.2, 50.0, 100.0, 109.0]
+_STD_SORTED = tuple(sorted(STANDARD_DISTANCES))
+
+
+def nearest_standard_distance(km: float) -> float:
+    """가장 가까운 표준 거리 (bisect, 동률이면 짧은 쪽)"""
+    i = bisect_left(_STD_SORTED, km)
+    if i <= 0:
+        return _STD_SORTED[0]
+    if i >= len(_STD_SORTED):
+        return _STD_SORTED[-1]
+    lo, hi = _STD_SORTED[i - 1], _STD_SORTED[i]
+    return lo if (km - lo) <= (hi - km) else hi
+
 
 # 거리별 허용 오차 (km)
 DISTANCE_TOLERANCE = {
@@ -14,21 +29,53 @@ DISTANCE_TOLERANCE = {
     (5, 10): 0.6,
     (0, 5): 0.4,
 }
+DEFAULT_DISTANCE_TOLERANCE = 0.5
+
+# 구간 하한 정렬 배열 (bisect 조회용, 구간은 [lo, hi) 로 서로 겹치지 않음)
+_TOL_RANGES = sorted(DISTANCE_TOLERANCE.items())
+_TOL_BOUNDS = [lo for (lo, _hi), _tol in _TOL_RANGES]
+_TOL_UPPER = [hi for (_lo, hi), _tol in _TOL_RANGES]
+_TOL_VALUES = [tol for _rng, tol in _TOL_RANGES]
+
+
+def tolerance_for(km) -> float:
+    """거리(km)에 해당하는 완주 판정 허용 오차 (범위 밖이면 기본값)"""
+    if km is None:
+        return DEFAULT_DISTANCE_TOLERANCE
+    i = bisect_right(_TOL_BOUNDS, km) - 1
+    if i < 0 or km >= _TOL_UPPER[i]:
+        return DEFAULT_DISTANCE_TOLERANCE
+    return _TOL_VALUES[i]
 
 # 정규식
-TIME_RX = re.compile(r"\b\d{1,2}:\d{2}(?::\d{2}(?:\.\d{1,3})?)?\b")
-HM_RX = re.compile(r"\b\d{1,2}:\d{2}\b")
-HMS_RX = re.compile(r"\b\d{1,2}:\d{2}:\d{2}(?:\.\d{1,2})?\b")
+# mm:ss / hh:mm / hh:mm:ss / hh:mm:ss.sss 를 한 번에 매칭 (그룹명으로 각 부분 접근)
+if sys.version_info >= (3, 11):
+    # 원자 그룹으로 초/소수부 되추적 차단
+    # (각 부분 끝에 \b를 두어 기존 패턴과 매칭 결과를 동일하게 유지)
+    TIME_RX = re.compile(
+        r"\b(?P<a>\d{1,2}):(?P<b>\d{2})"
+        r"(?>:(?P<c>\d{2})\b(?>\.(?P<frac>\d{1,3})\b)?)?\b"
+    )
+else:
+    TIME_RX = re.compile(
+        r"\b(?P<a>\d{1,2}):(?P<b>\d{2})(?::(?P<c>\d{2})(?:\.(?P<frac>\d{1,3}))?)?\b"
+    )
 KM_RX = re.compile(r'(\d+(?:\.\d+)?)\s*(?:k|km)\b', re.I)
 
 # 완주 키워드
 FINISH_KEYWORDS_KO = ("도착", "완주", "골인", "결승", "피니시")
 FINISH_KEYWORDS_EN = ("finish", "goal", "completed", "end")
+# 완주 라벨 판정용 (튜플은 표시/참고용, 판정은 이 정규식 사용)
+FINISH_RX = re.compile(
+    "|".join(map(re.escape, FINISH_KEYWORDS_KO + FINISH_KEYWORDS_EN)),
+    re.IGNORECASE,
+)
 
 # HTTP 헤더
 DEFAULT_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
     "Accept-Language": "ko,en;q=0.8",
+    "Connection": "keep-alive",  # 후보 URL 연속 확인 시 같은 소켓 재사용
 }
 
 # ============= 종목 순서 (정렬용) =============
@@ -1,14 +1,18 @@
-import os, requests, threading
+import os, re, threading
 from pathlib import Path
 
 # ============= 경로 설정 =============
 BASE_DIR = Path(__file__).parent.parent.absolute()
 DB_PATH = BASE_DIR / "smartchip.db"
+DB_PATH_STR = str(DB_PATH)  # sqlite3.connect용 (Path → str 변환 1회)
 
 # 정적 파일
 STATIC_DIR = BASE_DIR / "static"
 CERT_DIR = STATIC_DIR / "certs"
-CERT_DIR.mkdir(parents=True, exist_ok=True)
+
+def ensure_dirs():
+    """런타임 디렉터리 생성 (앱/크롤러 시작 시 1회 호출)"""
+    CERT_DIR.mkdir(parents=True, exist_ok=True)
 
 # 웹앱 설정
 WEBAPP_HOST = os.getenv("WEBAPP_HOST", "0.0.0.0")
@@ -18,6 +22,10 @@ WEBAPP_DEBUG = os.getenv("WEBAPP_DEBUG", "0") == "1"
 # 크롤러 설정
 CRAWLER_MAX_WORKERS = int(os.getenv("CRAWLER_MAX_WORKERS", "24"))
 CRAWLER_CACHE_TTL = int(os.getenv("CRAWLER_CACHE_TTL", "30"))
+# 호스트당 동시 요청 상한 (한 호스트가 워커 슬롯을 독점하지 않도록)
+CRAWLER_PER_HOST_CAP = int(os.getenv("CRAWLER_PER_HOST_CAP", "8"))
+# HTML 파싱 전용 프로세스 수 (0이면 크롤링 스레드에서 직접 파싱)
+CRAWLER_PARSE_PROCESSES = int(os.getenv("CRAWLER_PARSE_PROCESSES", "0"))
 
 # SSL 검증
 # 기본: 검증 ON. 전역으로 끄려면 SMARTCHIP_INSECURE_SSL=1
@@ -26,16 +34,28 @@ VERIFY_SSL_DEFAULT = os.getenv("SMARTCHIP_INSECURE_SSL", "0") != "1"
 # 예: SMARTCHIP_INSECURE_HOSTS="smartchip.co.kr,example.com"
 # 변경 (기본값에 smartchip 추가)
 default_insec = "smartchip.co.kr,www.smartchip.co.kr, myresult.co.kr, image.smartchip.co.kr, img.spct.kr"
-INSECURE_HOSTS = set(
+INSECURE_HOSTS = frozenset(
     h.strip().lower()
     for h in os.getenv("SMARTCHIP_INSECURE_HOSTS", default_insec).split(",")
     if h.strip()
 )
-# SSL 경고 숨김
+# 서브도메인까지 한 번에 매칭 (예: *.smartchip.co.kr), 목록이 비면 아무것도 매칭하지 않음
+INSECURE_HOST_RX = re.compile(
+    r"(?:^|\.)(?:" + "|".join(re.escape(h) for h in sorted(INSECURE_HOSTS)) + r")$"
+    if INSECURE_HOSTS else r"(?!)",
+    re.I,
+)
+
+def host_is_insecure(host: str) -> bool:
+    """SSL 검증을 끌 호스트인지 (서브도메인 포함, 대소문자 무시)"""
+    return bool(host) and INSECURE_HOST_RX.search(host) is not None
+
+# SSL 경고 숨김 (InsecureRequestWarning만)
 if (not VERIFY_SSL_DEFAULT) or INSECURE_HOSTS:
     try:
-        import requests
-        requests.packages.urllib3.disable_warnings()
+        import urllib3
+        from urllib3.exceptions import InsecureRequestWarning
+        urllib3.disable_warnings(InsecureRequestWarning)
     except Exception:
         pass
 
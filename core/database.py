@@ -1,172 +1,401 @@
-import sqlite3
-from contextlib import contextmanager
-from typing import Generator
-from config.settings import DB_PATH
-
-SCHEMA_SQL = """
-PRAGMA journal_mode=WAL;
-
-CREATE TABLE IF NOT EXISTS marathons (
-  id INTEGER PRIMARY KEY AUTOINCREMENT,
-  name TEXT NOT NULL,
-  url_template TEXT NOT NULL,
-  usedata TEXT,
-  total_distance_km REAL NOT NULL DEFAULT 21.1,
-  refresh_sec INTEGER NOT NULL DEFAULT 60,
-  enabled INTEGER NOT NULL DEFAULT 1,
-  cert_url_template TEXT,
-  event_date TEXT,
-  updated_at TEXT,
-  -- 아래 4개 컬럼은 과거 DB에 없을 수 있음 (마이그레이션에서 보장)
-  join_code TEXT UNIQUE,
-  join_code_expires_at DATETIME,
-  join_code_try_window_start DATETIME,
-  join_code_try_count INTEGER DEFAULT 0
-);
-
-CREATE TABLE IF NOT EXISTS participants (
-  id INTEGER PRIMARY KEY AUTOINCREMENT,
-  marathon_id INTEGER NOT NULL REFERENCES marathons(id) ON DELETE CASCADE,
-  alias TEXT,
-  nameorbibno TEXT NOT NULL,
-  active INTEGER NOT NULL DEFAULT 1,
-  race_label TEXT,
-  race_total_km REAL,
-  cert_key TEXT,
-  finish_image_url TEXT,
-  finish_image_path TEXT,
-  UNIQUE(marathon_id, nameorbibno)
-);
-
-CREATE TABLE IF NOT EXISTS splits (
-  id INTEGER PRIMARY KEY AUTOINCREMENT,
-  participant_id INTEGER NOT NULL REFERENCES participants(id) ON DELETE CASCADE,
-  point_label TEXT NOT NULL,
-  point_km REAL,
-  net_time TEXT,
-  pass_clock TEXT,
-  pace TEXT,
-  seen_at TEXT,
-  UNIQUE(participant_id, point_label)
-);
-
-CREATE TABLE IF NOT EXISTS assets (
-  id INTEGER PRIMARY KEY AUTOINCREMENT,
-  participant_id INTEGER NOT NULL REFERENCES participants(id) ON DELETE CASCADE,
-  kind TEXT NOT NULL,
-  host TEXT,
-  url TEXT,
-  local_path TEXT,
-  seen_at TEXT,
-  UNIQUE(participant_id, kind)
-);
-
--- 2) groups: 마라톤 내 그룹과 그룹코드
-CREATE TABLE IF NOT EXISTS groups (
-  id INTEGER PRIMARY KEY AUTOINCREMENT,
-  marathon_id INTEGER NOT NULL,
-  name TEXT NOT NULL,
-  group_code TEXT NOT NULL UNIQUE,
-  creator_user_id INTEGER,
-  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-  FOREIGN KEY (marathon_id) REFERENCES marathons(id)
-);
-CREATE INDEX IF NOT EXISTS idx_groups_marathon ON groups(marathon_id);
-CREATE INDEX IF NOT EXISTS idx_groups_group_code ON groups(group_code);
-
--- 3) user_groups: 사용자-그룹 매핑 (멤버십)
-CREATE TABLE IF NOT EXISTS user_groups (
-  user_id INTEGER NOT NULL,
-  group_id INTEGER NOT NULL,
-  role TEXT DEFAULT 'member', -- 'owner' | 'member'
-  joined_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-  PRIMARY KEY (user_id, group_id),
-  FOREIGN KEY (group_id) REFERENCES groups(id)
-);
-
--- (옵션) track_followers: 그룹코드로만 보는 관람자를 굳이 저장할 필요 없지만,
--- 익명 팔로우/구독을 적재하고 싶다면 사용
-CREATE TABLE IF NOT EXISTS track_followers (
-  id INTEGER PRIMARY KEY AUTOINCREMENT,
-  group_id INTEGER NOT NULL,
-  viewer_fingerprint TEXT,
-  created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-  FOREIGN KEY (group_id) REFERENCES groups(id)
-);
-
-CREATE TABLE IF NOT EXISTS groups (
-  id INTEGER PRIMARY KEY AUTOINCREMENT,
-  marathon_id INTEGER NOT NULL,
-  name TEXT NOT NULL,
-  group_code TEXT UNIQUE NOT NULL,
-  enabled INTEGER NOT NULL DEFAULT 1,
-  created_at TEXT,
-  updated_at TEXT,
-  FOREIGN KEY (marathon_id) REFERENCES marathons(id) ON DELETE CASCADE
-);
-CREATE UNIQUE INDEX IF NOT EXISTS idx_groups_code ON groups(group_code);
-"""
-
-@contextmanager
-def get_db() -> Generator[sqlite3.Connection, None, None]:
-    """DB 연결 컨텍스트 매니저"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    # 외래키 강제 & busy timeout
-    conn.execute("PRAGMA foreign_keys=ON")
-    conn.execute("PRAGMA busy_timeout=5000")
-    try:
-        yield conn
-    finally:
-        conn.close()
-
-def _column_exists(conn: sqlite3.Connection, table: str, column: str) -> bool:
-    cur = conn.execute(f"PRAGMA table_info('{table}')")
-    return any(row["name"] == column for row in cur.fetchall())
-
-def init_database():
-    """데이터베이스 초기화"""
-    with get_db() as conn:
-        conn.executescript(SCHEMA_SQL)
-        conn.commit()
-
-def migrate_database():
-    """스키마 마이그레이션"""
-    with get_db() as conn:
-        # participants 보강
-        for col, ddl in [
-            ("race_label", "ALTER TABLE participants ADD COLUMN race_label TEXT"),
-            ("race_total_km", "ALTER TABLE participants ADD COLUMN race_total_km REAL"),
-            ("cert_key", "ALTER TABLE participants ADD COLUMN cert_key TEXT"),
-            ("finish_image_url", "ALTER TABLE participants ADD COLUMN finish_image_url TEXT"),
-            ("finish_image_path", "ALTER TABLE participants ADD COLUMN finish_image_path TEXT"),
-        ]:
-            try:
-                if not _column_exists(conn, "participants", col):
-                    conn.execute(ddl)
-            except sqlite3.OperationalError:
-                pass
-
-        # marathons 보강
-        for col, ddl in [
-            ("cert_url_template", "ALTER TABLE marathons ADD COLUMN cert_url_template TEXT"),
-            ("event_date", "ALTER TABLE marathons ADD COLUMN event_date TEXT"),
-            ("join_code", "ALTER TABLE marathons ADD COLUMN join_code TEXT UNIQUE"),
-            ("join_code_expires_at", "ALTER TABLE marathons ADD COLUMN join_code_expires_at DATETIME"),
-            ("join_code_try_window_start", "ALTER TABLE marathons ADD COLUMN join_code_try_window_start DATETIME"),
-            ("join_code_try_count", "ALTER TABLE marathons ADD COLUMN join_code_try_count INTEGER DEFAULT 0"),
-        ]:
-            try:
-                if not _column_exists(conn, "marathons", col):
-                    conn.execute(ddl)
-            except sqlite3.OperationalError:
-                pass
-
-        # ✅ join_code 컬럼이 있을 때만 인덱스 생성
-        if _column_exists(conn, "marathons", "join_code"):
-            try:
-                conn.execute("CREATE INDEX IF NOT EXISTS idx_marathons_join_code ON marathons(join_code)")
-            except sqlite3.OperationalError:
-                pass
-
-        conn.commit()
\ No newline at end of file
+import sqlite3
+import threading
+import queue
+from contextlib import contextmanager
+from typing import Generator, Optional
+from config.settings import DB_PATH, DB_PATH_STR, CRAWLER_MAX_WORKERS, ensure_dirs
+
+# STRICT 테이블: 선언 타입 강제 (DATETIME 같은 임의 타입명 대신 TEXT/INTEGER/REAL 사용)
+# created_at/joined_at 은 epoch 초(INTEGER)로 저장
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS marathons (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name TEXT NOT NULL,
+  url_template TEXT NOT NULL,
+  usedata TEXT,
+  total_distance_km REAL NOT NULL DEFAULT 21.1,
+  refresh_sec INTEGER NOT NULL DEFAULT 60,
+  enabled INTEGER NOT NULL DEFAULT 1,
+  cert_url_template TEXT,
+  event_date TEXT,
+  updated_at TEXT,
+  -- 아래 4개 컬럼은 과거 DB에 없을 수 있음 (마이그레이션에서 보장)
+  join_code TEXT UNIQUE,
+  join_code_expires_at TEXT,
+  join_code_try_window_start TEXT,
+  join_code_try_count INTEGER DEFAULT 0
+) STRICT;
+
+CREATE TABLE IF NOT EXISTS participants (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  marathon_id INTEGER NOT NULL REFERENCES marathons(id) ON DELETE CASCADE,
+  alias TEXT,
+  nameorbibno TEXT NOT NULL,
+  active INTEGER NOT NULL DEFAULT 1,
+  race_label TEXT,
+  race_total_km REAL,
+  cert_key TEXT,
+  finish_image_url TEXT,
+  finish_image_path TEXT,
+  UNIQUE(marathon_id, nameorbibno)
+) STRICT;
+-- 크롤러/목록의 "대회별 활성 참가자" 조회용
+CREATE INDEX IF NOT EXISTS idx_participants_marathon_active ON participants(marathon_id, active);
+
+CREATE TABLE IF NOT EXISTS splits (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  participant_id INTEGER NOT NULL REFERENCES participants(id) ON DELETE CASCADE,
+  point_label TEXT NOT NULL,
+  point_km REAL,
+  net_time TEXT,
+  pass_clock TEXT,
+  pace TEXT,
+  seen_at TEXT,
+  UNIQUE(participant_id, point_label)
+) STRICT;
+-- 참가자별 최신 스플릿 조회용
+CREATE INDEX IF NOT EXISTS idx_splits_participant_seen ON splits(participant_id, seen_at DESC);
+
+CREATE TABLE IF NOT EXISTS assets (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  participant_id INTEGER NOT NULL REFERENCES participants(id) ON DELETE CASCADE,
+  kind TEXT NOT NULL,
+  host TEXT,
+  url TEXT,
+  local_path TEXT,
+  seen_at TEXT,
+  UNIQUE(participant_id, kind)
+) STRICT;
+
+-- 2) groups: 마라톤 내 그룹과 그룹코드
+CREATE TABLE IF NOT EXISTS groups (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  marathon_id INTEGER NOT NULL,
+  name TEXT NOT NULL,
+  group_code TEXT NOT NULL UNIQUE,
+  creator_user_id INTEGER,
+  enabled INTEGER NOT NULL DEFAULT 1,
+  created_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s','now') AS INTEGER)),
+  updated_at TEXT,
+  FOREIGN KEY (marathon_id) REFERENCES marathons(id) ON DELETE CASCADE
+) STRICT;
+CREATE INDEX IF NOT EXISTS idx_groups_marathon ON groups(marathon_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_groups_code ON groups(group_code);
+
+-- 3) user_groups: 사용자-그룹 매핑 (멤버십)
+CREATE TABLE IF NOT EXISTS user_groups (
+  user_id INTEGER NOT NULL,
+  group_id INTEGER NOT NULL,
+  role TEXT NOT NULL DEFAULT 'member', -- 'owner' | 'member'
+  joined_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s','now') AS INTEGER)),
+  PRIMARY KEY (user_id, group_id),
+  FOREIGN KEY (group_id) REFERENCES groups(id)
+) WITHOUT ROWID, STRICT;
+
+-- (옵션) track_followers: 그룹코드로만 보는 관람자를 굳이 저장할 필요 없지만,
+-- 익명 팔로우/구독을 적재하고 싶다면 사용
+CREATE TABLE IF NOT EXISTS track_followers (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  group_id INTEGER NOT NULL,
+  viewer_fingerprint TEXT,
+  created_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s','now') AS INTEGER)),
+  FOREIGN KEY (group_id) REFERENCES groups(id)
+) STRICT;
+"""
+
+def _schema_script() -> str:
+    """SQLite 버전에 맞춘 스키마 (3.37 미만은 STRICT 미지원)"""
+    if sqlite3.sqlite_version_info >= (3, 37, 0):
+        return SCHEMA_SQL
+    return SCHEMA_SQL.replace(" WITHOUT ROWID, STRICT;", " WITHOUT ROWID;").replace(") STRICT;", ");")
+
+# splits 컬럼 순서 (row_dict=False 튜플 조회 시 인덱스로 사용)
+SPLIT_COLUMNS = ("id", "participant_id", "point_label", "point_km",
+                 "net_time", "pass_clock", "pace", "seen_at")
+SPLIT_SELECT = ", ".join(SPLIT_COLUMNS)
+(SPLIT_ID, SPLIT_PARTICIPANT_ID, SPLIT_LABEL, SPLIT_KM,
+ SPLIT_NET, SPLIT_CLOCK, SPLIT_PACE, SPLIT_SEEN) = range(len(SPLIT_COLUMNS))
+
+# 연결마다 적용하는 PRAGMA (journal_mode=WAL은 DB 파일에 영속되므로 init에서 1회만)
+CONNECTION_PRAGMAS = """
+PRAGMA synchronous=NORMAL;
+PRAGMA cache_size=-1048576;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA foreign_keys=ON;
+PRAGMA busy_timeout=30000;
+"""
+
+# ============= 연결 풀 =============
+# 쓰기: 단일 연결 + 락 (SQLite는 writer가 1개뿐이므로 직렬화)
+# 읽기: 읽기 전용(mode=ro) 연결 N개를 큐로 재사용 (WAL에서 동시 읽기)
+
+_READ_URI = f"{DB_PATH.as_uri()}?mode=ro"
+
+_WRITER: Optional[sqlite3.Connection] = None
+_WRITER_LOCK = threading.RLock()
+
+_READ_POOL_SIZE = max(1, CRAWLER_MAX_WORKERS)
+_READ_POOL: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=_READ_POOL_SIZE)
+_READ_POOL_LOCK = threading.Lock()
+_read_created = 0
+
+# 연결별 prepared statement 캐시 크기 (기본 128 → 배치 SQL이 밀려나지 않도록 확대)
+STATEMENT_CACHE_SIZE = 256
+
+
+def _open_connection(read_only: bool = False) -> sqlite3.Connection:
+    """새 연결 생성 + PRAGMA 1회 적용"""
+    if read_only:
+        conn = sqlite3.connect(
+            _READ_URI,
+            uri=True,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+    else:
+        # autocommit 모드: 트랜잭션은 get_db_write()에서 BEGIN IMMEDIATE로 직접 연다
+        # (여러 스레드가 공유하지만 항상 _WRITER_LOCK 아래에서만 사용)
+        conn = sqlite3.connect(
+            DB_PATH_STR,
+            check_same_thread=False,
+            isolation_level=None,
+            uri=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+    conn.row_factory = sqlite3.Row
+    # 외래키 강제 & busy timeout & 성능 튜닝 (WAL 기준 fsync 1회/커밋)
+    conn.executescript(CONNECTION_PRAGMAS)
+    return conn
+
+
+def _acquire_reader() -> sqlite3.Connection:
+    global _read_created
+    try:
+        return _READ_POOL.get_nowait()
+    except queue.Empty:
+        pass
+
+    with _READ_POOL_LOCK:
+        if _read_created < _READ_POOL_SIZE:
+            conn = _open_connection(read_only=True)
+            _read_created += 1
+            return conn
+
+    # 풀이 가득 찼으면 반납될 때까지 대기
+    return _READ_POOL.get()
+
+
+@contextmanager
+def get_db_read(row_dict: bool = True) -> Generator[sqlite3.Connection, None, None]:
+    """
+    읽기 전용 연결 컨텍스트 매니저 (풀에서 대여 → 반납)
+
+    Args:
+        row_dict: False면 sqlite3.Row 대신 원본 튜플 반환 (대량 조회용)
+    """
+    conn = _acquire_reader()
+    conn.row_factory = sqlite3.Row if row_dict else None
+    try:
+        yield conn
+    finally:
+        _READ_POOL.put(conn)
+
+
+def _get_writer() -> sqlite3.Connection:
+    """단일 writer 연결 (지연 생성, _WRITER_LOCK 보유 상태에서 호출)"""
+    global _WRITER
+    if _WRITER is None:
+        _WRITER = _open_connection()
+    return _WRITER
+
+
+@contextmanager
+def get_db_write(row_dict: bool = True) -> Generator[sqlite3.Connection, None, None]:
+    """
+    쓰기 연결 컨텍스트 매니저
+
+    - 단일 writer 연결을 락으로 직렬화
+    - 블록 전체가 하나의 트랜잭션 (BEGIN IMMEDIATE → 정상 종료 시 COMMIT, 예외 시 ROLLBACK)
+    - 같은 스레드에서 중첩 호출하면 바깥 트랜잭션에 합류
+    - row_dict=False면 튜플 행 반환 (블록 종료 시 이전 설정 복원)
+    """
+    with _WRITER_LOCK:
+        conn = _get_writer()
+        prev_factory = conn.row_factory
+        conn.row_factory = sqlite3.Row if row_dict else None
+
+        try:
+            if conn.in_transaction:
+                # 중첩 호출: 바깥 블록이 커밋/롤백 담당
+                yield conn
+                return
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            else:
+                # 블록 안에서 conn.commit()을 직접 호출했을 수도 있음
+                if conn.in_transaction:
+                    conn.execute("COMMIT")
+        finally:
+            conn.row_factory = prev_factory
+
+
+# 하위 호환: 기존 get_db()는 쓰기 연결로 동작
+get_db = get_db_write
+
+# ============= 배치 upsert =============
+# SQL은 모듈 상수로 고정 → 같은 문자열 객체가 statement 캐시에서 바로 재사용됨
+
+UPDATE_PARTICIPANT_META_SQL = (
+    "UPDATE participants SET race_label = COALESCE(?, race_label), "
+    "race_total_km = COALESCE(?, race_total_km) WHERE id = ?"
+)
+
+UPDATE_FINISH_IMAGE_SQL = (
+    "UPDATE participants SET finish_image_url=?, finish_image_path=? WHERE id=?"
+)
+
+UPSERT_SPLITS_SQL = """
+INSERT INTO splits(participant_id, point_label, point_km, net_time, pass_clock, pace, seen_at)
+VALUES(?,?,?,?,?,?,?)
+ON CONFLICT(participant_id, point_label)
+DO UPDATE SET point_km=excluded.point_km,
+              net_time=excluded.net_time,
+              pass_clock=excluded.pass_clock,
+              pace=excluded.pace,
+              seen_at=excluded.seen_at
+"""
+
+UPSERT_ASSETS_SQL = """
+INSERT INTO assets(participant_id, kind, host, url, local_path, seen_at)
+VALUES(?,?,?,?,?,?)
+ON CONFLICT(participant_id, kind)
+DO UPDATE SET url=excluded.url,
+              host=excluded.host,
+              seen_at=excluded.seen_at
+"""
+
+
+def upsert_splits(conn: sqlite3.Connection, rows) -> None:
+    """
+    스플릿 일괄 upsert (get_db_write() 트랜잭션 안에서 호출)
+
+    rows: (participant_id, point_label, point_km, net_time, pass_clock, pace, seen_at)
+    """
+    if rows:
+        conn.executemany(UPSERT_SPLITS_SQL, rows)
+
+
+def update_participant_meta(conn: sqlite3.Connection, rows) -> None:
+    """
+    참가자 메타(종목/거리) 일괄 갱신 (get_db_write() 트랜잭션 안에서 호출)
+
+    rows: (race_label, race_total_km, participant_id)
+    """
+    if rows:
+        conn.executemany(UPDATE_PARTICIPANT_META_SQL, rows)
+
+
+def upsert_assets(conn: sqlite3.Connection, rows) -> None:
+    """
+    에셋 일괄 upsert (get_db_write() 트랜잭션 안에서 호출)
+
+    rows: (participant_id, kind, host, url, local_path, seen_at)
+    """
+    if rows:
+        conn.executemany(UPSERT_ASSETS_SQL, rows)
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> set:
+    """테이블의 컬럼명 집합 (pragma 테이블 함수로 name만 조회)"""
+    return {r[0] for r in conn.execute("SELECT name FROM pragma_table_info(?)", (table,))}
+
+def init_database():
+    """데이터베이스 초기화"""
+    ensure_dirs()
+    with _WRITER_LOCK:
+        conn = _get_writer()
+        # journal_mode 변경은 트랜잭션 밖에서만 가능
+        conn.execute("PRAGMA journal_mode=WAL")
+        # 스키마 전체를 하나의 IMMEDIATE 트랜잭션으로 (쓰기 락 선점 → SQLITE_BUSY 승격 방지)
+        try:
+            conn.executescript("BEGIN IMMEDIATE;\n" + _schema_script() + "\nCOMMIT;")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+# ============= 마이그레이션 =============
+# 스키마를 바꾸면 아래 목록을 보강하고 SCHEMA_VERSION을 올린다.
+# PRAGMA user_version >= SCHEMA_VERSION 이면 migrate_database()는 즉시 반환.
+SCHEMA_VERSION = 2
+
+# 과거 DB에 없을 수 있는 컬럼: table → [(column, 타입/기본값 선언)]
+# (SQLite의 ADD COLUMN은 UNIQUE 제약을 허용하지 않으므로 join_code는 일반 컬럼 + 인덱스)
+_MIGRATION_COLUMNS = {
+    "participants": [
+        ("race_label", "TEXT"),
+        ("race_total_km", "REAL"),
+        ("cert_key", "TEXT"),
+        ("finish_image_url", "TEXT"),
+        ("finish_image_path", "TEXT"),
+    ],
+    "marathons": [
+        ("cert_url_template", "TEXT"),
+        ("event_date", "TEXT"),
+        ("join_code", "TEXT"),
+        ("join_code_expires_at", "TEXT"),
+        ("join_code_try_window_start", "TEXT"),
+        ("join_code_try_count", "INTEGER DEFAULT 0"),
+    ],
+    # 과거 DB는 enabled/updated_at 없는 groups 정의로 생성됨
+    "groups": [
+        ("creator_user_id", "INTEGER"),
+        ("enabled", "INTEGER NOT NULL DEFAULT 1"),
+        ("updated_at", "TEXT"),
+    ],
+}
+
+# 컬럼 보강 후 순서대로 실행
+_MIGRATION_SQL = [
+    "CREATE INDEX IF NOT EXISTS idx_marathons_join_code ON marathons(join_code)",
+    # 과거 문자열 타임스탬프(CURRENT_TIMESTAMP/ISO) → epoch 초
+    *(
+        f"UPDATE {table} SET {col} = CAST(strftime('%s', {col}) AS INTEGER) "
+        f"WHERE typeof({col}) = 'text' AND strftime('%s', {col}) IS NOT NULL"
+        for table, col in [
+            ("groups", "created_at"),
+            ("user_groups", "joined_at"),
+            ("track_followers", "created_at"),
+        ]
+    ),
+    # 중복 인덱스 정리 (group_code는 UNIQUE 인덱스 하나로 충분)
+    "DROP INDEX IF EXISTS idx_groups_group_code",
+    # 플래너 통계 갱신 (새 인덱스 반영)
+    "ANALYZE",
+]
+
+
+def migrate_database():
+    """스키마 마이그레이션 (ALTER/CREATE 전체를 단일 IMMEDIATE 트랜잭션으로)"""
+    with get_db_write() as conn:
+        # 이미 최신이면 PRAGMA 1회로 끝
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+
+        for table, columns in _MIGRATION_COLUMNS.items():
+            existing = _columns(conn, table)
+            for col, decl in columns:
+                if col not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {col} {decl}")
+
+        for sql in _MIGRATION_SQL:
+            conn.execute(sql)
+
+        conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
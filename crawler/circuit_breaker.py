@@ -0,0 +1,128 @@
+# crawler/circuit_breaker.py
+"""호스트별 서킷 브레이커 - 죽은 사이트에 워커를 낭비하지 않도록 차단"""
+
+import time
+import threading
+from collections import deque
+from typing import Deque, Dict
+
+
+class CircuitBreaker:
+    """
+    서킷 브레이커 (CLOSED → OPEN → HALF_OPEN)
+
+    - CLOSED: 정상. window_sec 안에 실패가 failure_threshold회 쌓이면 OPEN
+    - OPEN: 요청 차단. open_sec 경과 후 HALF_OPEN
+    - HALF_OPEN: half_open_trials건만 시험 요청 허용
+      → 성공하면 CLOSED, 실패하면 다시 OPEN
+
+    사용 예:
+        breaker = CircuitBreaker()
+        if breaker.allow():
+            try:
+                html = fetch(url)
+                breaker.on_success()
+            except Exception:
+                breaker.on_failure()
+                raise
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        window_sec: float = 30.0,
+        open_sec: float = 60.0,
+        half_open_trials: int = 1
+    ):
+        self.failure_threshold = failure_threshold
+        self.window_sec = window_sec
+        self.open_sec = open_sec
+        self.half_open_trials = half_open_trials
+
+        self.state = self.CLOSED
+        self._failures: Deque[float] = deque()  # 최근 실패 시각 (monotonic)
+        self._opened_at = 0.0
+        self._trials = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """요청 허용 여부"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.open_sec:
+                    return False
+                self.state = self.HALF_OPEN
+                self._trials = 0
+
+            if self.state == self.HALF_OPEN:
+                if self._trials >= self.half_open_trials:
+                    return False
+                self._trials += 1
+
+            return True
+
+    def on_success(self):
+        """요청 성공 기록"""
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures.clear()
+            self._trials = 0
+
+    def on_failure(self):
+        """요청 실패 기록"""
+        now = time.monotonic()
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._open(now)
+                return
+
+            self._failures.append(now)
+            while self._failures and now - self._failures[0] > self.window_sec:
+                self._failures.popleft()
+
+            if len(self._failures) >= self.failure_threshold:
+                self._open(now)
+
+    def _open(self, now: float):
+        self.state = self.OPEN
+        self._opened_at = now
+        self._failures.clear()
+        self._trials = 0
+
+
+class HostGuard:
+    """
+    호스트별 서킷 브레이커 + 동시 요청 제한(bulkhead)
+
+    - breaker(host): 호스트별 CircuitBreaker
+    - slot(host): 호스트별 Semaphore (한 호스트가 워커 슬롯을 독점하지 않도록)
+    """
+
+    def __init__(self, per_host_cap: int = 8, **breaker_kwargs):
+        self.per_host_cap = per_host_cap
+        self._breaker_kwargs = breaker_kwargs
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._slots: Dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        b = self._breakers.get(host)
+        if b is None:
+            with self._lock:
+                b = self._breakers.setdefault(host, CircuitBreaker(**self._breaker_kwargs))
+        return b
+
+    def slot(self, host: str) -> threading.Semaphore:
+        s = self._slots.get(host)
+        if s is None:
+            with self._lock:
+                s = self._slots.setdefault(host, threading.Semaphore(self.per_host_cap))
+        return s
+
+    def open_hosts(self) -> Dict[str, str]:
+        """OPEN/HALF_OPEN 상태인 호스트 목록 (디버깅용)"""
+        return {h: b.state for h, b in self._breakers.items() if b.state != CircuitBreaker.CLOSED}
@@ -3,29 +3,171 @@
 
 import time, os, traceback, json, threading
 import random
+import re
 import urllib.parse
-from queue import Queue
-from datetime import datetime
-from contextlib import closing
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+from queue import Queue, Empty, Full
+from datetime import date, datetime
+from contextlib import closing, contextmanager
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, List, Tuple, Any, Optional
 
-from bs4 import BeautifulSoup
-
-from core.database import get_db, init_database, migrate_database
-from config.settings import BASE_DIR, CERT_DIR
-from crawler.fetcher import fetch_cached
-from crawler.worker import get_mr_worker
-from parsers.utils import parse
-from parsers.myresult import MyResultParser, extract_total_net_time # noqa
-from utils.time_utils import first_time, looks_time
+from core.database import (
+    get_db_read, get_db_write, init_database, migrate_database,
+    upsert_splits, upsert_assets, update_participant_meta,
+    UPDATE_FINISH_IMAGE_SQL,
+)
+from config.settings import BASE_DIR
+from crawler.fetcher import fetch_with_retry, _is_transient
+from crawler.circuit_breaker import HostGuard
+from crawler.host_queue import HostFairQueue
+from crawler.worker import get_mr_worker, MR_WORKER_TABS
+from parsers.utils import parse, parse_cached
+from parsers.myresult import MyResultParser, extract_finish_backfill # noqa
+from parsers.smartchip import set_probe_rate_limiter
+from utils.time_utils import looks_time
 from utils.file_utils import save_certificate_to_disk
-from utils.network_utils import get_session
+from utils.network_utils import get_session, resolve_host, default_port
 from utils.distance_utils import ensure_finish_label
-from config.settings import CRAWLER_MAX_WORKERS
+from config.settings import CRAWLER_MAX_WORKERS, CRAWLER_PER_HOST_CAP, CRAWLER_PARSE_PROCESSES
 from webapp.services.records import RecordsService # ✅ 완주 시간 계산기 import
 
 
+# ============= 조회 SQL =============
+# 엔진이 실제로 쓰는 컬럼만 조회 (SELECT * 대신)
+
+ENABLED_MARATHONS_SQL = """
+SELECT id, url_template, usedata, refresh_sec, event_date
+FROM marathons
+WHERE enabled = 1
+"""
+
+# 완주 기록(net_time)과 기록증 이미지가 모두 확보된 참가자는 더 수집할 것이 없으므로 제외
+ACTIVE_ROSTER_SQL = """
+SELECT p.marathon_id, p.id, p.nameorbibno
+FROM participants p
+WHERE p.active = 1
+  AND p.marathon_id IN ({placeholders})
+  AND NOT (
+    p.finish_image_path IS NOT NULL
+    AND EXISTS (
+      SELECT 1 FROM splits s
+      WHERE s.participant_id = p.id
+        AND (s.point_label LIKE '%finish%' OR s.point_label LIKE '%도착%')
+        AND COALESCE(s.net_time, '') <> ''
+    )
+  )
+ORDER BY p.marathon_id
+"""
+
+
+# ============= 결과 정규화 =============
+
+def _filter_dicts(items: List) -> Tuple[List[Dict], int]:
+    """dict 항목만 남기고 버린 개수를 함께 반환 (한 번 순회)"""
+    out = []
+    append = out.append
+    bad = 0
+    for x in items:
+        if type(x) is dict:
+            append(x)
+        else:
+            bad += 1
+    return out, bad
+
+
+# ============= 기록증 URL 추론 =============
+# 파서가 에셋을 못 찾았을 때 호스트별 규칙으로 기록증 URL 생성
+
+def _build_mr_assets(u: str, b: str, bib6: str) -> List[Dict]:
+    """MyResult: https://myresult.co.kr/upload/certificate/{usedata}/{bib}"""
+    return [{
+        "kind": "certificate",
+        "host": "myresult.co.kr",
+        "url": f"https://myresult.co.kr/upload/certificate/{u}/{b}"
+    }]
+
+
+def _build_sc_assets(u: str, b: str, bib6: str) -> List[Dict]:
+    """
+    SmartChip(기록증 뷰어 PHP): https://image.smartchip.co.kr/record_data/TriRun_Record.php?Rally_id={usedata}&Bally_no={bib}
+    (참고: 참조 페이지는 smartchip.co.kr/return_data_livephoto.asp?... 를 referer로 사용)
+    """
+    return [{
+        "kind": "certificate",
+        "host": "image.smartchip.co.kr",
+        "url": f"https://image.smartchip.co.kr/record_data/TriRun_Record.php?Rally_id={u}&Bally_no={b}"
+    }]
+
+
+def _build_spct_assets(u: str, b: str, bib6: str) -> List[Dict]:
+    """
+    SPCT(정적 이미지 직링크): https://img.spct.kr/PhotoResultsJPG/images/{usedata}/{usedata}-{bib6}.jpg
+    referer는 ResultsPhotoResults.php?EVENT_NO={usedata}&BIB_NO={bib_spct6} 를 사용해야 핫링크 방지 통과 확률↑
+    """
+    return [{
+        "kind": "certificate",
+        "host": "img.spct.kr",
+        "url": f"https://img.spct.kr/PhotoResultsJPG/images/{u}/{u}-{bib6}.jpg"
+    }]
+
+
+# 크롤링 대상 호스트(도메인 접미사) → 기록증 URL 빌더
+HOST_ASSET_BUILDERS = {
+    "myresult.co.kr": _build_mr_assets,
+    "smartchip.co.kr": _build_sc_assets,
+    "spct.kr": _build_spct_assets,
+}
+
+
+@lru_cache(maxsize=64)
+def _asset_builder_for(host: str):
+    """호스트명 접미사로 빌더 조회 (예: www.myresult.co.kr → myresult.co.kr)"""
+    parts = host.split(".")
+    for i in range(len(parts)):
+        builder = HOST_ASSET_BUILDERS.get(".".join(parts[i:]))
+        if builder:
+            return builder
+    return None
+
+
+# ============= URL 템플릿 컴파일 =============
+
+_BIB_PLACEHOLDER_RX = re.compile(r"(\{nameorbibno\}|\{bib_spct6\})")
+
+
+@lru_cache(maxsize=256)
+def _compile_url_template(template: str, usedata: str):
+    """
+    URL 템플릿을 대회당 1회 분해해서 bib → URL 함수로 반환
+
+    - {usedata}는 미리 치환
+    - {nameorbibno}만 있으면 str.join 한 번으로 생성
+    - {bib_spct6}가 있으면 6자리 제로패딩 값도 함께 끼워 넣음
+    """
+    base = template.replace("{usedata}", usedata)
+    parts = _BIB_PLACEHOLDER_RX.split(base)
+
+    if "{bib_spct6}" not in parts:
+        pieces = base.split("{nameorbibno}")
+        if len(pieces) == 1:
+            return lambda bib: base
+        return lambda bib: bib.join(pieces)
+
+    def build(bib: str) -> str:
+        bib6 = bib.zfill(6) if bib.isdigit() else bib
+        return "".join(
+            bib if t == "{nameorbibno}" else bib6 if t == "{bib_spct6}" else t
+            for t in parts
+        )
+
+    return build
+
+
 class CrawlerEngine:
     """
     크롤링 엔진
@@ -47,17 +189,64 @@ class CrawlerEngine:
         
         if use_adaptive_scheduler:
             self.scheduler = AdaptiveScheduler()
+            # 스마트칩 상세 페이지 프로브도 호스트 요청률에 포함
+            set_probe_rate_limiter(self.scheduler.acquire_host)
             print("[Engine] Using AdaptiveScheduler (with backoff)")
         else:
             self.scheduler = CrawlerScheduler()
             print("[Engine] Using CrawlerScheduler (basic)")
         
         # 이미지 다운로드 큐
-        self.image_queue: Queue = Queue()
+        # (호스트별 라운드 로빈 + 크기 제한 → 느린 CDN이 있어도 메모리 상한 유지)
+        self.image_queue = HostFairQueue(maxsize=self.IMAGE_QUEUE_MAXSIZE)
         self.image_workers: List[threading.Thread] = []
+
+        # 이미지 저장 결과 → DB 배치 기록 (finish_image_url, finish_image_path, pid)
+        self._image_result_queue: Queue = Queue()
+        self._image_db_writer: Optional[threading.Thread] = None
+        # 기록증 이미지가 이미 저장된 참가자 (SKIP 판정용, DB 조회 대신 set 조회)
+        self._images_done: set = set()
         
+        # 공용 HTTP 세션 (run()에서 1회 생성, keep-alive 연결 재사용)
+        self.session = None
+
+        # 호스트별 서킷 브레이커 + bulkhead
+        # (30초 내 5회 실패 → 60초 차단 → 시험 요청 1건)
+        self.host_guard = HostGuard(
+            per_host_cap=CRAWLER_PER_HOST_CAP,
+            failure_threshold=5,
+            window_sec=30.0,
+            open_sec=60.0,
+            half_open_trials=1,
+        )
+
+        # MyResult 동시 작업 수 = 브라우저 워커 탭 수
+        self._myresult_slots = threading.BoundedSemaphore(MR_WORKER_TABS)
+
+        # 참가자 크롤링용 상주 스레드 풀 (대회/틱마다 재생성하지 않음)
+        self._executor = ThreadPoolExecutor(
+            max_workers=CRAWLER_MAX_WORKERS,
+            thread_name_prefix="crawl",
+        )
+
+        # HTML 파싱 프로세스 풀 (선택, CRAWLER_PARSE_PROCESSES > 0일 때만)
+        # - 파싱은 순수 파이썬 CPU 작업이라 GIL 때문에 스레드를 늘려도 병렬화되지 않음
+        # - 스레드가 많은 프로세스에서 fork는 위험하므로 spawn 사용
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        if CRAWLER_PARSE_PROCESSES > 0:
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=CRAWLER_PARSE_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            print(f"[Engine] Parse process pool: {CRAWLER_PARSE_PROCESSES} workers")
+
         # 실행 상태
         self.running = False
+        self._last_queue_stats = 0.0
+
+        # 틱 단위 캐시: 대회 날짜 파싱 결과, 이번 틱의 seen_at
+        self._event_dates: Dict[int, Tuple[Optional[str], Optional[date]]] = {}
+        self._cycle_now_iso: Optional[str] = None
 
     def _dbg_preview_list(self, lst, n: int = 3) -> str:
         try:
@@ -86,8 +275,8 @@ class CrawlerEngine:
 
         # 세션 워밍업 (선택)
         try:
-            s = get_session()
-            print(f"[Engine] HTTP session ready: {type(s).__name__}")
+            self.session = get_session()
+            print(f"[Engine] HTTP session ready: {type(self.session).__name__}")
         except Exception as e:
             print(f"[fatal] HTTP session init failed: {e}")
             raise
@@ -110,10 +299,20 @@ class CrawlerEngine:
         
         # 이미지 워커 종료
         for _ in self.image_workers:
-            self.image_queue.put(None)
+            self.image_queue.put_stop()
         
         for worker in self.image_workers:
             worker.join(timeout=5)
+
+        # DB 기록 스레드는 남은 결과를 flush하고 종료
+        if self._image_db_writer:
+            self._image_result_queue.put(None)
+            self._image_db_writer.join(timeout=5)
+
+        # 크롤링 스레드 풀 종료 (대기 중인 작업은 취소)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._parse_pool:
+            self._parse_pool.shutdown(wait=False, cancel_futures=True)
         
         print("[Engine] Shutdown complete")
     
@@ -123,64 +322,109 @@ class CrawlerEngine:
             tick = time.time()
             
             try:
-                # 활성화된 대회 조회
-                with get_db() as conn:
-                    marathons = conn.execute(
-                        "SELECT * FROM marathons WHERE enabled=1"
-                    ).fetchall()
-                
-                # 각 대회 처리
-                for marathon in marathons:
-                    self._process_marathon(marathon)
+                # 활성화된 대회 조회 (읽기 풀의 상주 연결 재사용, 필요한 컬럼만)
+                with get_db_read() as conn:
+                    marathons = conn.execute(ENABLED_MARATHONS_SQL).fetchall()
+
+                # 틱 단위 시각 (같은 틱의 저장은 같은 seen_at 공유)
+                today = date.today()
+                self._cycle_now_iso = datetime.now().isoformat()
+
+                # 이번 틱에 실행할 대회만 추림 (날짜/스케줄러)
+                due = [m for m in marathons if self._marathon_due(m, today)]
+
+                # 실행할 대회가 있을 때만 참가자를 한 번의 쿼리로 조회
+                if due:
+                    rosters = self._load_rosters([m["id"] for m in due])
+                    for marathon in due:
+                        self._process_marathon(marathon, rosters.get(marathon["id"], []))
                 
             except Exception as e:
                 print(f"[fatal] {type(e).__name__}: {e}")
+
+            # 이미지 큐 적체 현황 (주기적)
+            if tick - self._last_queue_stats >= self.QUEUE_STATS_SEC:
+                self._last_queue_stats = tick
+                depth = self.image_queue.qsize()
+                if depth:
+                    print(f"[queue] image={depth} by_host={self.image_queue.depth_by_host()}")
             
             # 짧은 대기 (CPU 부하 감소)
             time.sleep(0.1)
     
     # ============= 대회별 처리 =============
     
-    def _process_marathon(self, marathon):
-        """특정 대회 크롤링 처리"""
+    def _marathon_due(self, marathon, today: date) -> bool:
+        """이번 틱에 크롤링할 대회인지 (대회 날짜 + 스케줄러)"""
         mid = marathon["id"]
         refresh_sec = int(marathon["refresh_sec"] or 60)
-        event_date_str = marathon["event_date"] if "event_date" in marathon.keys() else None
 
         # ✅ 대회 날짜 확인
+        event_date = self._event_date(mid, marathon["event_date"])
+        if event_date and today < event_date:
+            return False # 아직 대회 날짜가 아님
+        
+        # ✅ 스케줄러로 실행 가능 여부 확인
+        return self.scheduler.should_run_marathon(mid, refresh_sec)
+
+    def _event_date(self, mid: int, event_date_str: Optional[str]) -> Optional[date]:
+        """대회 날짜 파싱 결과 캐시 (문자열이 바뀌면 다시 파싱)"""
+        cached = self._event_dates.get(mid)
+        if cached and cached[0] == event_date_str:
+            return cached[1]
+
+        event_date = None
         if event_date_str:
             try:
                 event_date = datetime.strptime(event_date_str, "%Y-%m-%d").date()
-                today = datetime.now().date()
-                if today < event_date:
-                    return # 아직 대회 날짜가 아님
             except ValueError:
                 print(f"[warn] mid={mid} has invalid event_date format: {event_date_str}. Ignoring date check.")
-        
-        # ✅ 스케줄러로 실행 가능 여부 확인
-        if not self.scheduler.should_run_marathon(mid, refresh_sec):
-            return
+
+        self._event_dates[mid] = (event_date_str, event_date)
+        return event_date
+
+    def _load_rosters(self, marathon_ids: List[int]) -> Dict[int, List[Dict]]:
+        """
+        여러 대회의 활성 참가자를 한 번에 조회 (수집 완료된 완주자 제외)
+
+        Returns:
+            {marathon_id: [{"id": pid, "nameorbibno": bib}, ...]}
+        """
+        placeholders = ",".join("?" * len(marathon_ids))
+        with get_db_read(row_dict=False) as conn:
+            rows = conn.execute(
+                ACTIVE_ROSTER_SQL.format(placeholders=placeholders),
+                marathon_ids
+            ).fetchall()
+
+        return {
+            mid: [{"id": pid, "nameorbibno": bib} for _, pid, bib in grp]
+            for mid, grp in groupby(rows, key=itemgetter(0))
+        }
+
+    def _process_marathon(self, marathon, participants: List):
+        """특정 대회 크롤링 처리 (_marathon_due 통과한 대회만 호출)"""
+        mid = marathon["id"]
+        refresh_sec = int(marathon["refresh_sec"] or 60)
         
         tick = time.time()
         
         try:
-            # 참가자 조회
-            with get_db() as conn:
-                participants = conn.execute(
-                    "SELECT * FROM participants WHERE marathon_id=? AND active=1",
-                    (mid,)
-                ).fetchall()
-            
             if not participants:
                 # ✅ 참가자 없어도 실행 기록 (다음 주기까지 대기)
                 self.scheduler.mark_marathon_run(mid)
                 return
             
             # 크롤링 실행
-            results = self._crawl_participants(marathon, participants)
+            # (완료된 결과는 SAVE_CHUNK_SIZE 단위로 바로 저장 → 페치와 DB 쓰기가 겹침)
+            results = self._crawl_participants(
+                marathon, participants,
+                on_chunk=lambda chunk: self._save_results(chunk, marathon, participants),
+            )
             
-            # DB 업데이트
-            self._save_results(results, marathon, participants)
+            # DB 업데이트 (남은 결과)
+            if results:
+                self._save_results(results, marathon, participants)
             
             duration = round(time.time() - tick, 2)
             print(f"[ok] mid={mid} participants={len(participants)} dur={duration}s")
@@ -204,78 +448,127 @@ class CrawlerEngine:
     
     # ============= 참가자 크롤링 =============
     
+    # 크롤링 도중 부분 저장 단위 (참가자 수)
+    SAVE_CHUNK_SIZE = 128
+
     def _crawl_participants(
         self,
         marathon,
-        participants: List
+        participants: List,
+        on_chunk=None
     ) -> List[Tuple]:
         """
         참가자들의 데이터 크롤링
         
+        Args:
+            on_chunk: 지정하면 결과가 SAVE_CHUNK_SIZE개 모일 때마다 호출
+                      (나머지 작업은 풀에서 계속 진행되므로 저장과 페치가 겹침)
+        
         Returns:
-            [(participant_id, splits, meta, assets), ...]
+            [(participant_id, splits, meta, assets), ...] (on_chunk로 넘기고 남은 결과)
         """
         url_template = marathon["url_template"]
         usedata = marathon["usedata"] or ""
+        url_fn = _compile_url_template(url_template, usedata)  # bib → URL
         
         results = []
         futures = []
-        myresult_jobs = []
         future_ctx = {}  # ✅ future → (pid, url, bib)
+        skipped_open = 0
+        resolved_hosts = set()  # 이번 주기에 DNS 미리 조회한 호스트
         
-        # 작업 분배
-        with ThreadPoolExecutor(max_workers=CRAWLER_MAX_WORKERS) as executor:
-            for p in participants:
-                pid = p["id"]
-                
-                # ✅ 스케줄러로 페치 가능 여부 확인 (rate limiting)
-                if not self.scheduler.can_fetch_participant(pid):
-                    continue
-                
-                # ✅ 페치 시작 기록
-                self.scheduler.mark_participant_fetch(pid)
-                
-                # URL 생성
-                url = self._build_url(url_template, p["nameorbibno"], usedata)
-                host = (urllib.parse.urlsplit(url).hostname or "").lower()
-                
-                # MyResult는 직렬 처리 (워커 안정성)
-                if "myresult.co.kr" in host:
-                    myresult_jobs.append((pid, url, p["nameorbibno"], usedata))
-                else:
-                    # 나머지는 병렬 처리
-                    future = executor.submit(
-                        self._crawl_one,
-                        pid, url, p["nameorbibno"], usedata
-                    )
-                    futures.append(future)
-                    future_ctx[future] = (pid, url, p["nameorbibno"])  # ✅ 컨텍스트 저장
+        # ✅ 스케줄러로 지금 페치 가능한 참가자만 한 번에 선별 (rate limiting)
+        ready = set(self.scheduler.pick_ready([p["id"] for p in participants]))
+        
+        # 작업 분배 (상주 풀 사용, 틱마다 재생성하지 않음)
+        for p in participants:
+            pid = p["id"]
+            if pid not in ready:
+                continue
+            
+            # URL 생성
+            url = url_fn(p["nameorbibno"])
+            host = (urllib.parse.urlsplit(url).hostname or "").lower()
 
+            # ✅ 서킷 OPEN 호스트는 소켓 타임아웃을 기다리지 않고 건너뜀
+            if not self.host_guard.breaker(host).allow():
+                skipped_open += 1
+                continue
             
-            # 병렬 작업 결과 수집
-            for future in as_completed(futures):
+            # ✅ 호스트당 1회만 DNS 미리 조회 (이후 연결은 캐시 사용, 캐시 키는 실제 접속 포트)
+            host_port = (host, default_port(url))
+            if host_port not in resolved_hosts:
+                resolved_hosts.add(host_port)
+                try:
+                    resolve_host(*host_port)
+                except OSError as e:
+                    print(f"[warn] DNS resolve failed host={host}: {e}")
+
+            # ✅ 페치 시작 기록
+            self.scheduler.mark_participant_fetch(pid)
+            
+            # MyResult는 브라우저 워커 탭 수만큼만 동시에, 나머지는 병렬 처리
+            crawl_fn = self._crawl_one_myresult if "myresult.co.kr" in host else self._crawl_one
+            future = self._executor.submit(
+                crawl_fn,
+                pid, url, p["nameorbibno"], usedata
+            )
+            futures.append(future)
+            future_ctx[future] = (pid, url, p["nameorbibno"])  # ✅ 컨텍스트 저장
+
+        
+        def _flush():
+            nonlocal results
+            if on_chunk and len(results) >= self.SAVE_CHUNK_SIZE:
                 try:
-                    result = future.result()
-                    if result and isinstance(result, tuple):
-                        results.append(result)
-                    else:
-                        ctx = future_ctx.get(future, (None, None, None))
-                        print(f"[warn] future returned unexpected: type={type(result).__name__} ctx={ctx}")
+                    on_chunk(results)
                 except Exception as e:
-                    ctx = future_ctx.get(future, (None, None, None))
                     traceback.print_exc()
-                    print(f"[err] thread -> {type(e).__name__}: {e} | ctx(pid,url,bib)={ctx}")
-        
-        # MyResult 직렬 처리
-        for pid, url, bib, usedata in myresult_jobs:
+                    print(f"[err] chunk save -> {type(e).__name__}: {e}")
+                results = []
+
+        # 병렬 작업 결과 수집
+        for future in as_completed(futures):
             try:
-                result = self._crawl_one(pid, url, bib, usedata)
+                result = future.result()
                 if result and isinstance(result, tuple):
                     results.append(result)
+                    _flush()
+                else:
+                    ctx = future_ctx.get(future, (None, None, None))
+                    print(f"[warn] future returned unexpected: type={type(result).__name__} ctx={ctx}")
             except Exception as e:
-                print(f"[err] myresult -> {type(e).__name__}: {e}")
+                ctx = future_ctx.get(future, (None, None, None))
+                traceback.print_exc()
+                print(f"[err] thread -> {type(e).__name__}: {e} | ctx(pid,url,bib)={ctx}")
+
+        if skipped_open:
+            print(f"[breaker] mid={marathon['id']} skipped={skipped_open} open={self.host_guard.open_hosts()}")
         
         return results
+
+    def _crawl_one_myresult(self, *args) -> Tuple[int, List, Dict, List]:
+        """MyResult 참가자 크롤링 (워커 탭이 빌 때까지 대기 → 탭 수 이상으로 요청을 쌓지 않음)"""
+        with self._myresult_slots:
+            return self._crawl_one(*args)
+
+    @contextmanager
+    def _host_attempt(self, host: str):
+        """요청 1건: 호스트 토큰(AIMD)을 얻은 뒤 호스트당 동시 요청 슬롯(bulkhead) 안에서 실행"""
+        if hasattr(self.scheduler, "acquire_host"):
+            self.scheduler.acquire_host(host)
+        with self.host_guard.slot(host):
+            yield
+
+    def _host_result_recorder(self, host: str):
+        """fetch_with_retry on_fetch 콜백: 실제 요청 결과를 호스트별 요청률(AIMD)에 기록"""
+        def record(latency: float, error: Optional[Exception]):
+            if error is None:
+                self.scheduler.record_host_result(host, latency)
+            else:
+                status = getattr(getattr(error, "response", None), "status_code", None)
+                self.scheduler.record_host_result(host, latency, ok=False, status=status)
+        return record
     
     def _crawl_one(
         self,
@@ -293,18 +586,39 @@ class CrawlerEngine:
         print(f"[crawl_one] pid={pid} bib={bib}")
         # HTML 페칭 (캐시 사용)
         html = None
+        host = urllib.parse.urlsplit(url).hostname or ""
+        breaker = self.host_guard.breaker(host.lower())
+        # AdaptiveScheduler면 호스트별 요청률(AIMD)에 맞춰 대기 후 결과를 피드백
+        # (캐시 적중은 서버 상태와 무관하므로 실제 요청 결과만 on_fetch로 기록)
+        on_fetch = None
+        if hasattr(self.scheduler, "acquire_host"):
+            on_fetch = self._host_result_recorder(host.lower())
         try:
-            html = fetch_cached(url)
+            # 실제 요청(재시도 포함)마다 호스트 토큰 + bulkhead 슬롯, 재시도 대기 중에는 슬롯 반환
+            html = fetch_with_retry(
+                url, session=self.session, on_fetch=on_fetch,
+                guard=lambda: self._host_attempt(host.lower()),
+            )
+            breaker.on_success()
         except Exception as e:
+            # 호스트 장애(429/5xx/타임아웃/연결 실패)만 실패로 집계
+            # 404/403 등은 참가자 쪽 문제(잘못된 배번 등)이고 호스트는 정상 응답한 것 → 성공으로 기록
+            if _is_transient(e):
+                breaker.on_failure()
+            else:
+                breaker.on_success()
             traceback.print_exc()
-            print(f"[err] fetch_cached failed pid={pid} url={url}: {e}")
+            print(f"[err] fetch failed pid={pid} url={url}: {e}")
             html = ""
-        host = urllib.parse.urlsplit(url).hostname or ""
         # print(f"[dbg] fetched host={host} len={len(html) if isinstance(html, (str, bytes)) else 'n/a'} pid={pid}")
         
         # 파싱
         try:
-            data = parse(html, host=host, url=url, usedata=usedata, bib=bib) or {}
+            # HTML이 이전 폴링과 같으면 메모된 결과 재사용
+            data = parse_cached(
+                html, host=host, url=url, usedata=usedata, bib=bib,
+                parse_fn=self._parse_in_pool if self._parse_pool else None,
+            ) or {}
         except Exception as e:
             traceback.print_exc()
             print(f"[err] parse failed pid={pid} url={url}: {e}")
@@ -339,12 +653,12 @@ class CrawlerEngine:
         # print(f"[dbg] raw splits len={len(raw_splits)} preview={self._dbg_preview_list(raw_splits)} | pid={pid}")
         # print(f"[dbg] raw assets len={len(raw_assets)} preview={self._dbg_preview_list(raw_assets)} | pid={pid}")
 
-        splits = [r for r in raw_splits if isinstance(r, dict)]
-        assets = [a for a in raw_assets if isinstance(a, dict)]
-        if len(splits) != len(raw_splits):
-            print(f"[warn] filtered non-dict splits: {len(raw_splits) - len(splits)} removed | pid={pid}")
-        if len(assets) != len(raw_assets):
-            print(f"[warn] filtered non-dict assets: {len(raw_assets) - len(assets)} removed | pid={pid}")
+        splits, bad_splits = _filter_dicts(raw_splits)
+        assets, bad_assets = _filter_dicts(raw_assets)
+        if bad_splits:
+            print(f"[warn] filtered non-dict splits: {bad_splits} removed | pid={pid}")
+        if bad_assets:
+            print(f"[warn] filtered non-dict assets: {bad_assets} removed | pid={pid}")
 
         meta = {
             "race_label": data.get("race_label"),
@@ -356,41 +670,14 @@ class CrawlerEngine:
 
         if not assets:
             inferred = []
-            h = (host or "").lower()
             b = str(bib or "").strip()
             u = str(usedata or "").strip()
-                
-            bib6 = b.zfill(6) if b.isdigit() else b
-            dest_dir = os.path.join(CERT_DIR, u)
-            base_name = f"{u}-{bib6}"
-            dest_path = os.path.join(dest_dir, base_name, ".jpg")
-
-            # 1) MyResult: https://myresult.co.kr/upload/certificate/{usedata}/{bib}
-            if "myresult.co.kr" in h and u and b:
-                inferred.append({
-                    "kind": "certificate",
-                    "host": "myresult.co.kr",
-                    "url": f"https://myresult.co.kr/upload/certificate/{u}/{b}"
-                })
-
-            # 2) SmartChip(기록증 뷰어 PHP): https://image.smartchip.co.kr/record_data/TriRun_Record.php?Rally_id={usedata}&Bally_no={bib}
-            #    (참고: 참조 페이지는 smartchip.co.kr/return_data_livephoto.asp?... 를 referer로 사용)
-            if "smartchip.co.kr" in h and u and b:
-                inferred.append({
-                    "kind": "certificate",
-                    "host": "image.smartchip.co.kr",
-                    "url": f"https://image.smartchip.co.kr/record_data/TriRun_Record.php?Rally_id={u}&Bally_no={b}"
-                })
 
-            # 3) SPCT(정적 이미지 직링크): https://img.spct.kr/PhotoResultsJPG/images/{usedata}/{usedata}-{bib6}.jpg
-            #    referer는 ResultsPhotoResults.php?EVENT_NO={usedata}&BIB_NO={bib_spct6} 를 사용해야 핫링크 방지 통과 확률↑
-            if ("spct.kr" in h or "img.spct.kr" in h) and u and b:
+            # 호스트별 기록증 URL 규칙 (호스트당 1회 해석 후 캐시)
+            builder = _asset_builder_for((host or "").lower())
+            if builder and u and b:
                 bib6 = b.zfill(6) if b.isdigit() else b
-                inferred.append({
-                    "kind": "certificate",
-                    "host": "img.spct.kr",
-                    "url": f"https://img.spct.kr/PhotoResultsJPG/images/{u}/{u}-{bib6}.jpg"
-                })
+                inferred = builder(u, b, bib6)
 
             if inferred:
                 # 파서 결과 대신 폴백 사용
@@ -404,6 +691,19 @@ class CrawlerEngine:
         
         return (pid, splits, meta, assets)
     
+    def _parse_in_pool(self, html: str, **context) -> Dict:
+        """파싱을 프로세스 풀에 위임하고 결과를 기다림 (호출 스레드는 I/O 대기처럼 GIL 해제)"""
+        pool = self._parse_pool
+        if pool is None:
+            return parse(html, **context)
+        try:
+            return pool.submit(parse, html, **context).result()
+        except BrokenProcessPool as e:
+            # 풀이 깨지면 이후로는 스레드에서 직접 파싱
+            print(f"[warn] parse pool broken → fallback to in-thread parse: {e}")
+            self._parse_pool = None
+            return parse(html, **context)
+
     def _handle_myresult_json(
         self,
         html: str,
@@ -442,15 +742,8 @@ class CrawlerEngine:
             if not html2 or html2.startswith("JSON::"):
                 return data
 
-            soup = BeautifulSoup(html2, "html.parser")
-            total = extract_total_net_time(soup)
-
-            finish_clock = ""
-            for row in soup.select(".table-row.ant-row"):
-                cols = row.select(".ant-col")
-                if len(cols) >= 4 and "도착" in cols[0].get_text(" ", strip=True):
-                    finish_clock = first_time(cols[1].get_text(" ", strip=True))
-                    break
+            # lxml XPath로 총 기록 + 도착 통과시각 추출 (미설치 시 BS4 폴백)
+            total, finish_clock = extract_finish_backfill(html2)
 
             if looks_time(total):
                 data.setdefault("splits", []).append({
@@ -484,15 +777,7 @@ class CrawlerEngine:
         - {usedata}: 대회 ID
         - {bib_spct6}: SPCT 6자리 제로패딩
         """
-        url = template.replace("{nameorbibno}", nameorbibno)
-        url = url.replace("{usedata}", usedata or "")
-        
-        # SPCT 6자리 제로패딩 지원
-        if "{bib_spct6}" in url:
-            bib6 = nameorbibno.zfill(6) if nameorbibno.isdigit() else nameorbibno
-            url = url.replace("{bib_spct6}", bib6)
-        
-        return url
+        return _compile_url_template(template, usedata or "")(nameorbibno)
     
     # ============= DB 저장 =============
     
@@ -513,9 +798,20 @@ class CrawlerEngine:
         m_urltpl  = marathon["url_template"] if "url_template" in marathon.keys() else ""
         # ✅ pid → bib 매핑 생성
         pid_to_bib = {p["id"]: p["nameorbibno"] for p in participants}
-        now_iso = datetime.now().isoformat()
+        now_iso = self._cycle_now_iso or datetime.now().isoformat()
         split_batch, meta_batch, asset_batch = [], [], []
         num_assets_enq = 0  # ← 바깥에서 누적
+        finish_idx: Dict[int, List[int]] = {}  # pid → split_batch 내 Finish 행 위치
+
+        # 루프 안 속성/메서드 조회를 줄이기 위해 로컬로 바인딩
+        _get = dict.get
+        split_extend = split_batch.extend
+        meta_append = meta_batch.append
+        asset_append = asset_batch.append
+        image_put = self.image_queue.put
+        image_saturated = False  # 큐가 가득 차면 이번 배치의 나머지 이미지는 건너뜀
+        images_done = self._images_done  # 이미 저장된 참가자 (큐잉 전에 메모리에서 걸러냄)
+        referer_fn = _compile_url_template(m_urltpl or "", m_usedata)
 
         for idx, r in enumerate(results):
             if not r:
@@ -535,140 +831,135 @@ class CrawlerEngine:
                 pid, splits = r[0], r[1] if len(r) > 1 else []
                 meta, assets = {}, []
 
+            splits = splits or []
+            assets = assets or []
+
             # 메타
             # ✅ 완주 여부 확인
-            is_finished = False
-            if splits:
-                for s in splits:
-                    if isinstance(s, dict):
-                        point_label = (s.get("point_label") or "").lower()
-                        if "finish" in point_label or "도착" in point_label:
-                            is_finished = True
-                            break
+            is_finished = any(
+                "finish" in lbl or "도착" in lbl
+                for lbl in ((_get(s, "point_label") or "").lower() for s in splits if type(s) is dict)
+            )
             if isinstance(meta, dict) and meta:
-                meta_batch.append((
+                meta_append((
                     meta.get("race_label"),
                     meta.get("race_total_km"),
                     pid
                 ))
 
-            # 스플릿
-            for s in (splits or []):
-                if not isinstance(s, dict):
-                    print(f"[warn] split item not dict pid={pid} item={repr(s)[:120]}")
-                    continue
-                split_batch.append((
-                    pid,
-                    s.get("point_label"),
-                    s.get("point_km"),
-                    s.get("net_time"),
-                    s.get("pass_clock"),
-                    s.get("pace"),
-                    now_iso
-                ))
+            # 스플릿 (필드 조회는 미리 바인딩한 dict.get 사용)
+            n_before = len(split_batch)
+            split_extend(
+                (pid, _get(s, "point_label"), _get(s, "point_km"), _get(s, "net_time"),
+                 _get(s, "pass_clock"), _get(s, "pace"), now_iso)
+                for s in splits if type(s) is dict
+            )
+            dropped = len(splits) - (len(split_batch) - n_before)
+            if dropped:
+                print(f"[warn] split items not dict pid={pid} dropped={dropped}")
+            for i in range(n_before, len(split_batch)):
+                if "finish" in (split_batch[i][1] or "").lower():
+                    finish_idx.setdefault(pid, []).append(i)
 
             # ✅ 에셋 — 반드시 각 r 내부에서 처리!
-            for a in (assets or []):
-                if not isinstance(a, dict):
+            for a in assets:
+                if type(a) is not dict:
                     print(f"[warn] asset item not dict pid={pid} item={repr(a)[:120]}")
                     continue
-                url = a.get("url")
+                url = _get(a, "url")
                 if not url:
                     continue
 
-                asset_batch.append((
-                    pid,
-                    a.get("kind") or "certificate",
-                    a.get("host"),
-                    url,
-                    None,
-                    now_iso
-                ))
+                a_host = _get(a, "host")
+                asset_append((pid, _get(a, "kind") or "certificate", a_host, url, None, now_iso))
 
                 # 이미지 다운로드 큐
                 bib = pid_to_bib.get(pid)
-                if bib and is_finished: # ✅ 완주한 경우에만 이미지 다운로드 큐에 추가
-                    referer_url = self._build_url(
-                        m_urltpl,
-                        bib,
-                        m_usedata
-                    )
-                    self.image_queue.put((
-                        a.get("host"),
-                        m_usedata,
-                        bib, url,
-                        referer_url, pid
-                    ))
-                    num_assets_enq += 1
+                if bib and is_finished and not image_saturated and pid not in images_done: # ✅ 완주한 경우에만 이미지 다운로드 큐에 추가
+                    referer_url = referer_fn(bib)
+                    try:
+                        image_put(
+                            a_host,
+                            (a_host, m_usedata, bib, url, referer_url, pid),
+                            timeout=self.IMAGE_QUEUE_PUT_TIMEOUT
+                        )
+                        num_assets_enq += 1
+                    except Full:
+                        # 다음 폴링에서 다시 큐잉되므로 여기서는 버림
+                        image_saturated = True
+                        print(f"[warn] image_queue saturated (size={self.image_queue.qsize()}) → skip rest of batch mid={marathon['id']}")
 
         # ✅ 완주 시간 재계산 및 split_batch에 반영
         # pass_clock 기반 계산이 필요한 참가자 ID 목록 생성
+        # (Finish 행 위치를 기록해 두었으므로 전체 split_batch를 다시 훑지 않음)
         pids_to_recalc = {
-            s[0] for s in split_batch 
-            if "finish" in (s[1] or "").lower() and (s[4] or "").strip() and not looks_time(s[3])
+            pid for pid, idxs in finish_idx.items()
+            if any(
+                (split_batch[i][4] or "").strip() and not looks_time(split_batch[i][3])
+                for i in idxs
+            )
         }
 
 
         print(f"[dbg] batches -> splits={len(split_batch)} meta={len(meta_batch)} assets={len(asset_batch)} enqueued={num_assets_enq}")
 
         try:
-            with get_db() as conn:
-                if meta_batch:
-                    conn.executemany(
-                        """UPDATE participants
-                        SET race_label = COALESCE(?, race_label),
-                            race_total_km = COALESCE(?, race_total_km)
-                        WHERE id = ?""",
-                        meta_batch
-                    )
+            # 한 번의 폴링 결과를 하나의 트랜잭션으로 기록
+            with get_db_write() as conn:
+                update_participant_meta(conn, meta_batch)
                 
                 # ✅ 완주 시간 계산 및 업데이트 준비
                 if pids_to_recalc:
                     for pid in pids_to_recalc:
                         calculated_net = RecordsService._calculate_net_time_from_clocks(conn, pid)
                         if calculated_net:
-                            # split_batch에서 해당 참가자의 Finish 기록을 찾아 net_time 업데이트
-                            for i, s in enumerate(split_batch):
-                                if s[0] == pid and "finish" in (s[1] or "").lower():
-                                    # 튜플은 수정 불가하므로 리스트로 변환 후 수정, 다시 튜플로
-                                    s_list = list(s)
-                                    s_list[3] = calculated_net # net_time 필드
-                                    split_batch[i] = tuple(s_list)
-                                    print(f"[dbg] Recalculated net_time for pid={pid}: {calculated_net}")
-
-                if split_batch:
-                    conn.executemany(
-                        """INSERT INTO splits(participant_id, point_label, point_km, 
-                                            net_time, pass_clock, pace, seen_at)
-                        VALUES(?,?,?,?,?,?,?)
-                        ON CONFLICT(participant_id, point_label)
-                        DO UPDATE SET net_time=excluded.net_time,
-                                        pass_clock=excluded.pass_clock,
-                                        pace=excluded.pace,
-                                        seen_at=excluded.seen_at""",
-                        split_batch
-                    )
-
-                if asset_batch:
-                    conn.executemany(
-                        """INSERT INTO assets(participant_id, kind, host, url, 
-                                            local_path, seen_at)
-                        VALUES(?,?,?,?,?,?)
-                        ON CONFLICT(participant_id, kind)
-                        DO UPDATE SET url=excluded.url,
-                                        host=excluded.host,
-                                        seen_at=excluded.seen_at""",
-                        asset_batch
-                    )
-                conn.commit()
+                            # 해당 참가자의 Finish 행만 net_time(3번 필드) 교체
+                            for i in finish_idx[pid]:
+                                s = split_batch[i]
+                                split_batch[i] = s[:3] + (calculated_net,) + s[4:]
+                            print(f"[dbg] Recalculated net_time for pid={pid}: {calculated_net}")
+
+                upsert_splits(conn, split_batch)
+                upsert_assets(conn, asset_batch)
         except Exception as e:
             traceback.print_exc()
             print(f"[fatal] DB batch failed mid={marathon['id']}: {e}")
     
     # ============= 이미지 다운로드 워커 =============
     
+    # 이미지 다운로드 큐 상한 / 가득 찼을 때 대기 시간(초)
+    IMAGE_QUEUE_MAXSIZE = 2048
+    IMAGE_QUEUE_PUT_TIMEOUT = 5
+    # 큐 적체 현황 출력 주기(초)
+    QUEUE_STATS_SEC = 60
+
+    # 이미지 결과 배치 기록 기준
+    IMAGE_DB_BATCH_SIZE = 128
+    IMAGE_DB_FLUSH_SEC = 0.5
+
+    def _load_images_done(self):
+        """이미 기록증 이미지가 저장된 참가자 ID 미리 로드 (파일이 실제로 있는 것만)"""
+        with get_db_read() as conn:
+            rows = conn.execute(
+                "SELECT id, finish_image_path FROM participants WHERE finish_image_path IS NOT NULL"
+            ).fetchall()
+        self._images_done = {
+            row["id"] for row in rows
+            if row["finish_image_path"] and os.path.exists(row["finish_image_path"])
+        }
+        print(f"[Engine] images already saved: {len(self._images_done)}")
+
     def _start_image_workers(self, num_workers: int = 3):
         """이미지 다운로드 워커 시작"""
+        self._load_images_done()
+
+        self._image_db_writer = threading.Thread(
+            target=self._image_db_writer_loop,
+            daemon=True,
+            name="ImageDBWriter"
+        )
+        self._image_db_writer.start()
+
         for i in range(num_workers):
             worker = threading.Thread(
                 target=self._image_worker,
@@ -690,37 +981,56 @@ class CrawlerEngine:
             try:
                 host, usedata, bib, img_url, referer, pid = task # ✅ task unpacking
                 
-                # 1. DB에서 기존 이미지 경로 확인
-                with get_db() as conn:
-                    p_row = conn.execute(
-                        "SELECT finish_image_path FROM participants WHERE id=?",
-                        (pid,)
-                    ).fetchone()
-                
-                # 2. DB에 경로가 있고, 실제 파일도 존재하면 건너뛰기
-                if p_row and p_row['finish_image_path'] and os.path.exists(p_row['finish_image_path']):
-                    # print(f"[img_worker] SKIP pid={pid} | already exists: {p_row['finish_image_path']}")
+                # 1. 이미 저장된 참가자면 건너뛰기 (시작 시 로드한 set + 이번 실행 중 저장분)
+                if pid in self._images_done:
                     continue
                 
-                # 3. 이미지 다운로드 시도
+                # 2. 이미지 다운로드 시도
                 saved_path = save_certificate_to_disk(host, usedata, bib, img_url, referer)
                 
                 if saved_path:
-                    # 4. 성공 시 DB에 경로 업데이트
+                    # 3. 성공 시 DB 기록은 배치 스레드에 위임
                     print(f"[img_worker] OK pid={pid} path={saved_path}")
-                    with get_db() as conn:
-                        conn.execute(
-                            "UPDATE participants SET finish_image_url=?, finish_image_path=? WHERE id=?",
-                            (img_url, saved_path, pid)
-                        )
-                        conn.commit()
+                    self._images_done.add(pid)
+                    self._image_result_queue.put((img_url, saved_path, pid))
                 else:
                     print(f"[img_worker] FAIL pid={pid} | save_certificate_to_disk returned None")
             except Exception as e:
                 traceback.print_exc()
                 print(f"[err] image save: {type(e).__name__}: {e} | pid={pid} url={img_url}")
-            finally:
-                self.image_queue.task_done()
+
+    def _image_db_writer_loop(self):
+        """이미지 저장 결과를 모아서 한 트랜잭션으로 기록 (최대 128건 또는 0.5초마다)"""
+        pending: List[Tuple] = []
+        deadline = None
+        stop = False
+
+        while not stop:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._image_result_queue.get(timeout=timeout)
+                if item is None:
+                    stop = True
+                else:
+                    pending.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.IMAGE_DB_FLUSH_SEC
+            except Empty:
+                pass
+
+            if pending and (
+                stop
+                or len(pending) >= self.IMAGE_DB_BATCH_SIZE
+                or time.monotonic() >= deadline
+            ):
+                try:
+                    with get_db_write() as conn:
+                        conn.executemany(UPDATE_FINISH_IMAGE_SQL, pending)
+                except Exception as e:
+                    traceback.print_exc()
+                    print(f"[err] image db flush ({len(pending)} rows): {type(e).__name__}: {e}")
+                pending = []
+                deadline = None
 
 
 # ============= 실행 함수 =============
@@ -1,8 +1,15 @@
 import urllib, time, re
+import random
+import threading
 import traceback
-from typing import Optional
+from collections import OrderedDict
+from contextlib import nullcontext
+from functools import lru_cache
+from typing import Any, Callable, ContextManager, Optional
 
+import requests
 from bs4 import BeautifulSoup
+from charset_normalizer import from_bytes  # requests 의존성으로 항상 설치됨
 from utils.network_utils import (
     add_cache_buster,
     normalize_url,
@@ -10,29 +17,116 @@ from utils.network_utils import (
     verify_for_host,      # ✅ 호스트별 SSL 검증 결정
 )
 from crawler.worker import get_mr_worker
+from parsers.base import SOUP_FEATURES
 
-_CACHE = {}
 _CACHE_TTL = 30
+_CACHE_MAXSIZE = 1024
+_NEG_CACHE_TTL = 3  # 실패 결과 캐시 (같은 URL 재요청 폭주 방지)
+
+
+class _TTLLRU:
+    """
+    크기 제한 + TTL 캐시 (스레드 안전)
+
+    - get: 만료된 항목은 삭제 후 None, 적중 시 최근 사용으로 이동
+    - set: 가득 차면 가장 오래 안 쓴 항목부터 제거
+    """
+
+    def __init__(self, maxsize: int = _CACHE_MAXSIZE, ttl: float = _CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, now: float):
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return None
+            value, ts = hit
+            if now - ts >= self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, now: float):
+        with self._lock:
+            self._data[key] = (value, now)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_CACHE = _TTLLRU()
+_NEG_CACHE = _TTLLRU(ttl=_NEG_CACHE_TTL)  # key → (예외 클래스, 메시지, response)
+
+# single-flight: 같은 키를 동시에 요청하면 한 스레드만 실제로 가져오고 나머지는 결과 대기
+_INFLIGHT: dict = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+# JS/meta 리다이렉트 감지 (모듈 로드 시 1회 컴파일)
+_JS_REDIRECT_RX = re.compile(r'location\.href\s*=\s*"([^"]+)"', re.I)
+_META_REFRESH_URL_RX = re.compile(r'url\s*=\s*([^;]+)', re.I)
+
+# 브라우저 워커를 먼저 쓰는 호스트 (하위 도메인 포함, 부분 문자열 매칭은 하지 않음)
+_WORKER_HOSTS = frozenset({"myresult.co.kr", "spct.co.kr", "smartchip.co.kr"})
+_WORKER_HOST_SUFFIXES = tuple("." + h for h in sorted(_WORKER_HOSTS))
+
+# 인코딩 추정: 본문 앞부분만 검사 (<meta charset>은 보통 <head> 안에 있음)
+_SNIFF_BYTES = 8192
+_META_CHARSET_RX = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([A-Za-z0-9_\-]+)', re.I)
+
+
+def _sniff_encoding(content: bytes) -> Optional[str]:
+    """헤더에 charset이 없을 때 본문 앞 8KB로 인코딩 추정 (meta 태그 → charset_normalizer)"""
+    head = content[:_SNIFF_BYTES]
+    m = _META_CHARSET_RX.search(head)
+    if m:
+        enc = m.group(1).decode("ascii", "ignore")
+        try:
+            "".encode(enc)
+            return enc
+        except LookupError:
+            pass
+    best = from_bytes(head).best()
+    return best.encoding if best else None
+
+@lru_cache(maxsize=4096)
+def _host_of(url: str) -> str:
+    """URL의 호스트명 (소문자). 같은 참가자 URL이 매 주기 반복되므로 캐시"""
+    return (urllib.parse.urlsplit(url).hostname or "").lower()
 
 def _dbg(msg: str):
     print(f"[fetcher] {msg}")
 
-def fetch(url: str, timeout: int = 10, verify: Optional[bool] = None) -> str:
+def fetch(url: str, timeout: int = 10, verify: Optional[bool] = None, session=None) -> str:
     """
     단일 URL을 가져온다.
     - myresult/spct는 먼저 브라우저 워커 시도
-    - 실패 시 requests 세션으로 폴백
+    - 실패 시 requests 세션으로 폴백 (session 미지정 시 공용 세션)
     - verify가 명시되지 않으면 호스트별 verify_for_host()로 자동 결정
     """
     try:
-        host = (urllib.parse.urlsplit(url).hostname or "").lower()
+        host = _host_of(url)
         url2 = add_cache_buster(url)
 
         if verify is None:
             verify = verify_for_host(host)
 
         # 1) myresult/spct/smartchip은 워커 우선
-        if any(h in host for h in ["myresult.co.kr", "spct.co.kr", "smartchip.co.kr"]):
+        if host in _WORKER_HOSTS or host.endswith(_WORKER_HOST_SUFFIXES):
             try:
                 html = get_mr_worker().fetch(url2, timeout=timeout)
                 if html:
@@ -44,11 +138,18 @@ def fetch(url: str, timeout: int = 10, verify: Optional[bool] = None) -> str:
                 _dbg(f"worker_fetch error host={host}: {e} -> fallback to requests")
 
         # 2) requests 세션으로 폴백
-        s = get_session()                      # ✅ 여기서 항상 초기화 보장
+        s = session or get_session()           # ✅ 여기서 항상 초기화 보장
         r = s.get(url2, timeout=timeout, verify=verify)
         r.raise_for_status()
         # 인코딩 추정 (EUC-KR 등)
-        r.encoding = r.apparent_encoding or r.encoding
+        # - 헤더에 charset이 있으면 그대로 사용 (chardet 비용 회피)
+        # - 없으면 requests가 ISO-8859-1로 가정하므로 그때만 앞 8KB로 추정
+        #   (apparent_encoding은 본문 전체를 스캔함)
+        if not r.encoding or r.encoding.upper() == "ISO-8859-1":
+            enc = _sniff_encoding(r.content)
+            if enc:
+                # _dbg(f"requests_get success host={host} status={r.status_code} enc={enc}")
+                return r.content.decode(enc, errors="replace")
         # _dbg(f"requests_get success host={host} status={r.status_code} enc={r.encoding}")
         return r.text
 
@@ -58,27 +159,157 @@ def fetch(url: str, timeout: int = 10, verify: Optional[bool] = None) -> str:
         # 실패는 상위에서 핸들할 수 있게 예외 그대로 던진다
         raise
 
-def fetch_cached(url: str, timeout: int = 10, verify: Optional[bool] = None) -> str:
-    """캐싱이 적용된 fetch"""
-    now = time.time()
+def _neg_entry(e: Exception) -> tuple:
+    """실패 캐시 항목 (예외 인스턴스는 스레드 간에 공유하지 않고 클래스/메시지만 보관)"""
+    return (type(e), str(e), getattr(e, "response", None))
+
+
+def _error_from(entry: tuple) -> Exception:
+    """실패 캐시 항목 → 새 예외 인스턴스 (HTTPError면 status 판정용 response 유지)"""
+    cls, msg, response = entry
+    try:
+        if issubclass(cls, requests.RequestException):
+            return cls(msg, response=response)
+        return cls(msg)
+    except Exception:
+        return RuntimeError(f"{cls.__name__}: {msg}")
+
+
+def fetch_cached(
+    url: str,
+    timeout: int = 10,
+    verify: Optional[bool] = None,
+    session=None,
+    use_negative_cache: bool = True,
+    on_fetch: Optional[Callable[[float, Optional[Exception]], None]] = None,
+    guard: Optional[Callable[[], ContextManager]] = None
+) -> str:
+    """
+    캐싱이 적용된 fetch (실패도 _NEG_CACHE_TTL초 동안 캐시해 같은 오류를 다시 던짐)
+
+    Args:
+        use_negative_cache: False면 실패 캐시를 보지 않고 실제로 다시 가져옴 (재시도용)
+        on_fetch: 캐시가 아닌 실제 요청을 했을 때만 (소요 시간, 예외 또는 None)으로 호출
+                  (호스트별 요청률 조절에 캐시 적중을 섞지 않기 위함)
+        guard: 실제 요청 1건을 감쌀 컨텍스트 매니저 팩토리 (호스트 토큰/동시 요청 슬롯 등)
+    """
+    now = time.monotonic()
     key = (url, timeout, verify)
-    hit = _CACHE.get(key)
-    if hit:
-        data, ts = hit
-        if now - ts < _CACHE_TTL:
-            _dbg(f"cache_hit url={url}")
+    data = _CACHE.get(key, now)
+    if data is not None:
+        _dbg(f"cache_hit url={url}")
+        return data
+    if use_negative_cache:
+        entry = _NEG_CACHE.get(key, now)
+        if entry is not None:
+            _dbg(f"negative_cache_hit url={url}")
+            raise _error_from(entry)
+
+    with _INFLIGHT_LOCK:
+        event = _INFLIGHT.get(key)
+        leader = event is None
+        if leader:
+            event = _INFLIGHT[key] = threading.Event()
+
+    if not leader:
+        # 먼저 요청한 스레드의 결과를 기다림 (실패했으면 직접 가져옴)
+        event.wait(timeout * 4)
+        now = time.monotonic()
+        data = _CACHE.get(key, now)
+        if data is not None:
+            _dbg(f"singleflight_hit url={url}")
             return data
+        if use_negative_cache:
+            entry = _NEG_CACHE.get(key, now)
+            if entry is not None:
+                raise _error_from(entry)
+        return _fetch_reported(url, timeout, verify, session, on_fetch, guard)
+
+    try:
+        html = _fetch_reported(url, timeout, verify, session, on_fetch, guard)
+        _CACHE.set(key, html, now)
+        _NEG_CACHE.delete(key)
+        return html
+    except Exception as e:
+        _NEG_CACHE.set(key, _neg_entry(e), time.monotonic())
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+        event.set()
+
+def _fetch_reported(url: str, timeout: int, verify: Optional[bool], session, on_fetch, guard=None) -> str:
+    """실제 fetch + on_fetch 콜백 (소요 시간, 예외), guard 안에서 요청"""
+    with (guard() if guard else nullcontext()):
+        started = time.monotonic()
+        try:
+            html = fetch(url, timeout=timeout, verify=verify, session=session)
+        except Exception as e:
+            if on_fetch:
+                on_fetch(time.monotonic() - started, e)
+            raise
+        if on_fetch:
+            on_fetch(time.monotonic() - started, None)
+        return html
+
+# ============= 재시도 (exponential backoff + full jitter) =============
+# 일시적 오류(429/5xx/타임아웃/연결 실패)만 같은 주기 안에서 재시도, 파싱 오류 등은 바로 전달
+# (429/5xx 재시도는 이 층만 담당 - 크롤링 세션의 urllib3 Retry는 연결 수립 실패만 재시도)
+
+RETRY_ATTEMPTS = 3
+RETRY_BASE_SEC = 0.5
+RETRY_MAX_SEC = 8.0
+
+
+def _is_transient(e: Exception) -> bool:
+    """재시도할 만한 일시적 오류인지"""
+    # RetryError는 urllib3가 이미 상태 코드 재시도를 소진한 경우 → 다시 재시도하지 않음
+    if isinstance(e, (requests.Timeout, requests.ConnectionError)):
+        return True
+    if isinstance(e, requests.HTTPError) and e.response is not None:
+        status = e.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+def fetch_with_retry(
+    url: str,
+    timeout: int = 10,
+    verify: Optional[bool] = None,
+    session=None,
+    attempts: int = RETRY_ATTEMPTS,
+    on_fetch: Optional[Callable[[float, Optional[Exception]], None]] = None,
+    guard: Optional[Callable[[], ContextManager]] = None
+) -> str:
+    """
+    fetch_cached + 일시적 오류 재시도
+
+    대기 시간: uniform(0, min(RETRY_MAX_SEC, RETRY_BASE_SEC * 2^n)) (full jitter)
+    실패 캐시는 첫 시도에서만 확인 (재시도는 항상 실제 요청 - 대기 시간이 실패 캐시 TTL보다 짧음)
+    마지막 시도까지 실패하면 예외를 그대로 던짐 (서킷 브레이커에는 최종 결과 1건만 기록됨)
+    on_fetch: fetch_cached 참고 (재시도를 포함해 실제 요청마다 호출)
+    guard: fetch_cached 참고 (시도마다 새로 진입, 대기(sleep)는 guard 밖에서 함)
+    """
+    for attempt in range(attempts):
+        try:
+            return fetch_cached(
+                url, timeout=timeout, verify=verify, session=session,
+                use_negative_cache=(attempt == 0), on_fetch=on_fetch, guard=guard
+            )
+        except Exception as e:
+            if attempt + 1 >= attempts or not _is_transient(e):
+                raise
+            delay = random.uniform(0, min(RETRY_MAX_SEC, RETRY_BASE_SEC * (2 ** attempt)))
+            _dbg(f"retry {attempt + 1}/{attempts - 1} in {delay:.2f}s url={url}: {type(e).__name__}")
+            time.sleep(delay)
 
-    html = fetch(url, timeout=timeout, verify=verify)
-    _CACHE[key] = (html, now)
-    return html
 
 def fetch_html_follow_js_redirect(url: str, timeout: int = 15, verify: Optional[bool] = None) -> BeautifulSoup:
     """
     HTML 로드 후 JS location.href / meta refresh 리다이렉트까지 따라가서 최종 HTML을 반환
     - 세션 전역 헤더를 오염시키지 않도록 요청별 headers 파라미터 사용
     """
-    host = (urllib.parse.urlsplit(url).hostname or "").lower()
+    host = _host_of(url)
     if verify is None:
         verify = verify_for_host(host)
 
@@ -88,10 +319,9 @@ def fetch_html_follow_js_redirect(url: str, timeout: int = 15, verify: Optional[
     resp = s.get(url, timeout=timeout, allow_redirects=True, verify=verify)
     resp.raise_for_status()
     html = resp.text
-    soup = BeautifulSoup(html, "html.parser")
 
-    # 1) <script> location.href="..."; 형태 감지
-    m = re.search(r'location\.href\s*=\s*"([^"]+)"', html, re.I)
+    # 1) <script> location.href="..."; 형태 감지 (soup 생성 전에 원문에서 바로 검사)
+    m = _JS_REDIRECT_RX.search(html)
     if m:
         target = normalize_url(m.group(1))
         base = normalize_url(resp.url)
@@ -103,12 +333,13 @@ def fetch_html_follow_js_redirect(url: str, timeout: int = 15, verify: Optional[
 
         resp2 = s.get(target_abs, timeout=timeout, allow_redirects=True, verify=verify, headers=headers)
         resp2.raise_for_status()
-        return BeautifulSoup(resp2.text, "html.parser")
+        return BeautifulSoup(resp2.text, SOUP_FEATURES)
 
-    # 2) <meta http-equiv="refresh" content="0; url=..."> 대비
+    # 2) <meta http-equiv="refresh" content="0; url=..."> 대비 (여기서만 soup 필요)
+    soup = BeautifulSoup(html, SOUP_FEATURES)
     meta = soup.select_one('meta[http-equiv="refresh" i]')
     if meta and meta.get("content"):
-        m2 = re.search(r'url\s*=\s*([^;]+)', meta["content"], re.I)
+        m2 = _META_REFRESH_URL_RX.search(meta["content"])
         if m2:
             target = normalize_url(m2.group(1).strip(' "\''))
             base = normalize_url(resp.url)
@@ -119,6 +350,6 @@ def fetch_html_follow_js_redirect(url: str, timeout: int = 15, verify: Optional[
 
             resp2 = s.get(target_abs, timeout=timeout, allow_redirects=True, verify=verify, headers=headers)
             resp2.raise_for_status()
-            return BeautifulSoup(resp2.text, "html.parser")
+            return BeautifulSoup(resp2.text, SOUP_FEATURES)
 
     return soup
@@ -0,0 +1,83 @@
+# crawler/host_queue.py
+"""호스트별 공정 큐 - 느린 호스트가 다른 호스트 작업을 막지 않도록 라운드 로빈"""
+
+import threading
+from collections import deque
+from queue import Full
+from typing import Any, Deque, Dict, Optional
+
+
+class HostFairQueue:
+    """
+    크기 제한이 있는 호스트별 라운드 로빈 큐
+
+    - put(host, item): 전체 크기가 maxsize면 timeout까지 대기 후 queue.Full
+    - get(): 호스트를 번갈아 가며 하나씩 꺼냄 (한 CDN이 느려도 다른 호스트는 진행)
+    - put_stop(): 종료 신호(None)는 크기 제한 없이 넣음
+
+    사용 예:
+        q = HostFairQueue(maxsize=2048)
+        q.put("img.spct.kr", task, timeout=5)
+        task = q.get()
+    """
+
+    def __init__(self, maxsize: int = 0):
+        self.maxsize = maxsize
+        self._queues: Dict[str, Deque[Any]] = {}
+        self._hosts: Deque[str] = deque()  # 대기 작업이 있는 호스트 순서
+        self._size = 0
+        self._stops = 0
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def put(self, host: str, item: Any, timeout: Optional[float] = None):
+        """작업 추가 (가득 차면 timeout까지 대기, 그래도 가득이면 queue.Full)"""
+        host = host or ""
+        with self._not_full:
+            if self.maxsize > 0 and self._size >= self.maxsize:
+                if not self._not_full.wait_for(lambda: self._size < self.maxsize, timeout):
+                    raise Full
+
+            q = self._queues.get(host)
+            if q is None:
+                q = self._queues[host] = deque()
+            if not q:
+                self._hosts.append(host)
+            q.append(item)
+            self._size += 1
+            self._not_empty.notify()
+
+    def put_stop(self):
+        """워커 종료 신호 (남은 작업보다 먼저 전달됨)"""
+        with self._lock:
+            self._stops += 1
+            self._not_empty.notify()
+
+    def get(self) -> Any:
+        """다음 작업 (호스트 라운드 로빈). 종료 신호면 None"""
+        with self._not_empty:
+            self._not_empty.wait_for(lambda: self._size > 0 or self._stops > 0)
+
+            if self._stops > 0:
+                self._stops -= 1
+                return None
+
+            host = self._hosts.popleft()
+            q = self._queues[host]
+            item = q.popleft()
+            if q:
+                self._hosts.append(host)  # 남은 작업이 있으면 맨 뒤로
+            else:
+                del self._queues[host]
+            self._size -= 1
+            self._not_full.notify()
+            return item
+
+    def qsize(self) -> int:
+        return self._size
+
+    def depth_by_host(self) -> Dict[str, int]:
+        """호스트별 대기 작업 수 (모니터링용)"""
+        with self._lock:
+            return {h: len(q) for h, q in self._queues.items()}
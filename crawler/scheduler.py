@@ -3,16 +3,22 @@
 
 import time
 import random
-from typing import Dict, Optional
+import threading
+from typing import Dict, Iterable, List, Optional
 from dataclasses import dataclass
 
 
+# 아직 실행한 적 없음 (monotonic 시각은 부팅 기준이라 0을 쓰면 안 됨)
+_NEVER = float("-inf")
+
+
 @dataclass
 class ScheduleConfig:
     """스케줄 설정"""
     min_marathon_interval: int = 5      # 대회별 최소 간격 (초)
     min_participant_gap: float = 3.0    # 참가자별 최소 간격 (초)
-    participant_gap_jitter: float = 2.0 # 참가자별 랜덤 지터 (초)
+    participant_gap_jitter: float = 2.0 # 참가자별 랜덤 지터 (초, 버킷 생성 시 1회 적용)
+    participant_burst: float = 2.0      # 참가자별 토큰 버킷 용량 (연속 허용 횟수)
 
 
 class CrawlerScheduler:
@@ -21,7 +27,7 @@ class CrawlerScheduler:
     
     기능:
     - 대회별 실행 주기 관리
-    - 참가자별 요청 간격 제한
+    - 참가자별 요청 간격 제한 (토큰 버킷)
     - 동시 요청 분산 (랜덤 지터)
     
     사용 예:
@@ -36,6 +42,9 @@ class CrawlerScheduler:
         if scheduler.can_fetch_participant(participant_id):
             # 페치 실행
             scheduler.mark_participant_fetch(participant_id)
+        
+        # 여러 참가자 중 지금 가능한 것만 골라 병렬 처리
+        ready = scheduler.pick_ready(participant_ids, n=32)
     """
     
     def __init__(self, config: Optional[ScheduleConfig] = None):
@@ -47,7 +56,9 @@ class CrawlerScheduler:
         
         # 마지막 실행 시각 추적
         self.last_marathon_run: Dict[int, float] = {}    # marathon_id → timestamp
-        self.last_participant_fetch: Dict[int, float] = {}  # participant_id → timestamp
+
+        # 참가자별 토큰 버킷: participant_id → [tokens, last_refill, rate]
+        self.buckets: Dict[int, List[float]] = {}
     
     # ============= 대회 스케줄링 =============
     
@@ -66,8 +77,8 @@ class CrawlerScheduler:
         Returns:
             True면 실행 가능
         """
-        now = time.time()
-        last_run = self.last_marathon_run.get(marathon_id, 0)
+        now = time.monotonic()
+        last_run = self.last_marathon_run.get(marathon_id, _NEVER)
         
         # 최소 간격과 설정된 주기 중 큰 값 사용
         min_interval = max(self.config.min_marathon_interval, refresh_sec)
@@ -81,7 +92,7 @@ class CrawlerScheduler:
         Args:
             marathon_id: 대회 ID
         """
-        self.last_marathon_run[marathon_id] = time.time()
+        self.last_marathon_run[marathon_id] = time.monotonic()
     
     def get_marathon_wait_time(
         self,
@@ -98,8 +109,8 @@ class CrawlerScheduler:
         Returns:
             대기 시간 (초), 0 이하면 즉시 실행 가능
         """
-        now = time.time()
-        last_run = self.last_marathon_run.get(marathon_id, 0)
+        now = time.monotonic()
+        last_run = self.last_marathon_run.get(marathon_id, _NEVER)
         min_interval = max(self.config.min_marathon_interval, refresh_sec)
         
         elapsed = now - last_run
@@ -107,6 +118,25 @@ class CrawlerScheduler:
     
     # ============= 참가자 스케줄링 =============
     
+    def _refill(self, participant_id: int) -> List[float]:
+        """
+        참가자 버킷을 현재 시각 기준으로 채워서 반환
+
+        - 처음 보는 참가자는 토큰 1개로 시작 (즉시 1회 허용)
+        - 지터는 버킷 생성 시 1회만 적용해 참가자별 주기를 분산
+        """
+        now = time.monotonic()
+        bucket = self.buckets.get(participant_id)
+        if bucket is None:
+            gap = self.config.min_participant_gap + random.random() * self.config.participant_gap_jitter
+            bucket = self.buckets[participant_id] = [1.0, now, 1.0 / max(gap, 1e-6)]
+            return bucket
+
+        tokens, last_refill, rate = bucket
+        bucket[0] = min(self.config.participant_burst, tokens + (now - last_refill) * rate)
+        bucket[1] = now
+        return bucket
+
     def can_fetch_participant(self, participant_id: int) -> bool:
         """
         참가자 페치 가능 여부 (rate limiting)
@@ -115,24 +145,42 @@ class CrawlerScheduler:
             participant_id: 참가자 ID
         
         Returns:
-            True면 페치 가능
+            True면 페치 가능 (토큰 1개 이상)
         """
-        now = time.time()
-        last_fetch = self.last_participant_fetch.get(participant_id, 0)
-        
-        # 최소 간격 + 랜덤 지터
-        min_gap = self.config.min_participant_gap + random.random() * self.config.participant_gap_jitter
-        
-        return (now - last_fetch) >= min_gap
+        return self._refill(participant_id)[0] >= 1.0
     
     def mark_participant_fetch(self, participant_id: int):
         """
-        참가자 페치 완료 기록
+        참가자 페치 완료 기록 (토큰 1개 소모)
         
         Args:
             participant_id: 참가자 ID
         """
-        self.last_participant_fetch[participant_id] = time.time()
+        bucket = self._refill(participant_id)
+        bucket[0] = max(0.0, bucket[0] - 1.0)
+    
+    def pick_ready(self, participant_ids: Iterable[int], n: Optional[int] = None) -> List[int]:
+        """
+        지금 페치 가능한 참가자를 최대 n명 골라 반환 (호출자가 병렬로 처리)
+
+        토큰은 소모하지 않음 → 실제 페치할 때 mark_participant_fetch 호출
+        
+        Args:
+            participant_ids: 후보 참가자 ID들 (순서 유지)
+            n: 최대 개수 (None이면 제한 없음)
+        
+        Returns:
+            페치 가능한 참가자 ID 리스트
+        """
+        ready = []
+        if n is not None and n <= 0:
+            return ready
+        for pid in participant_ids:
+            if self._refill(pid)[0] >= 1.0:
+                ready.append(pid)
+                if n is not None and len(ready) >= n:
+                    break
+        return ready
     
     def get_participant_wait_time(self, participant_id: int) -> float:
         """
@@ -144,12 +192,8 @@ class CrawlerScheduler:
         Returns:
             대기 시간 (초), 0 이하면 즉시 가능
         """
-        now = time.time()
-        last_fetch = self.last_participant_fetch.get(participant_id, 0)
-        min_gap = self.config.min_participant_gap
-        
-        elapsed = now - last_fetch
-        return max(0, min_gap - elapsed)
+        tokens, _, rate = self._refill(participant_id)
+        return max(0, (1.0 - tokens) / rate)
     
     # ============= 통계 =============
     
@@ -166,14 +210,14 @@ class CrawlerScheduler:
         """
         return {
             'tracked_marathons': len(self.last_marathon_run),
-            'tracked_participants': len(self.last_participant_fetch),
+            'tracked_participants': len(self.buckets),
             'config': self.config
         }
     
     def reset(self):
         """스케줄러 초기화 (테스트용)"""
         self.last_marathon_run.clear()
-        self.last_participant_fetch.clear()
+        self.buckets.clear()
     
     def reset_marathon(self, marathon_id: int):
         """특정 대회 스케줄 초기화"""
@@ -181,7 +225,7 @@ class CrawlerScheduler:
     
     def reset_participant(self, participant_id: int):
         """특정 참가자 스케줄 초기화"""
-        self.last_participant_fetch.pop(participant_id, None)
+        self.buckets.pop(participant_id, None)
 
 
 # ============= 고급 스케줄러 =============
@@ -193,6 +237,9 @@ class AdaptiveScheduler(CrawlerScheduler):
     기능:
     - 실패 시 백오프 (exponential backoff)
     - 성공 시 점진적 속도 증가
+    - 호스트별 요청률 AIMD 조절 (acquire_host / record_host_result)
+      · 응답 지연(EMA)이 기준보다 20% 이상 늘지 않으면 요청률 ×1.05
+      · 429/5xx/타임아웃이면 요청률 ×0.5
     
     Example:
         scheduler = AdaptiveScheduler()
@@ -215,6 +262,20 @@ class AdaptiveScheduler(CrawlerScheduler):
         # 백오프 설정
         self.max_backoff = 300  # 최대 5분
         self.backoff_multiplier = 2.0
+
+        # 호스트별 요청률 (AIMD, 크롤링 스레드들이 동시에 호출 → 락 사용)
+        self.initial_host_rate = 10.0  # req/s
+        self.min_host_rate = 0.5
+        self.max_host_rate = 50.0
+        self.rate_increase = 1.05
+        self.rate_decrease = 0.5
+        self.latency_rise_limit = 1.2  # 기준 지연 대비 허용 증가율
+
+        self.host_rate: Dict[str, float] = {}          # host → req/s
+        self.host_latency_ema: Dict[str, float] = {}   # host → 응답 지연 EMA (초)
+        self.host_base_latency: Dict[str, float] = {}  # host → 관측된 최저 EMA
+        self._host_tokens: Dict[str, List[float]] = {}  # host → [tokens, last_refill]
+        self._host_lock = threading.Lock()
     
     def should_run_marathon(
         self,
@@ -237,8 +298,8 @@ class AdaptiveScheduler(CrawlerScheduler):
             self.max_backoff
         )
         
-        now = time.time()
-        last_run = self.last_marathon_run.get(marathon_id, 0)
+        now = time.monotonic()
+        last_run = self.last_marathon_run.get(marathon_id, _NEVER)
         
         return (now - last_run) >= backoff_sec
     
@@ -262,6 +323,71 @@ class AdaptiveScheduler(CrawlerScheduler):
         self.mark_marathon_run(marathon_id)
         self.failure_count[marathon_id] = self.failure_count.get(marathon_id, 0) + 1
     
+    # ============= 호스트별 요청률 (AIMD) =============
+
+    def acquire_host(self, host: str) -> float:
+        """
+        호스트 요청 토큰 1개를 얻을 때까지 대기
+
+        Returns:
+            대기한 시간 (초)
+        """
+        waited = 0.0
+        while True:
+            with self._host_lock:
+                now = time.monotonic()
+                rate = self.host_rate.setdefault(host, self.initial_host_rate)
+                bucket = self._host_tokens.get(host)
+                if bucket is None:
+                    bucket = self._host_tokens[host] = [rate, now]  # 1초 분량으로 시작
+                bucket[0] = min(max(rate, 1.0), bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+                if bucket[0] >= 1.0:
+                    bucket[0] -= 1.0
+                    return waited
+                wait = (1.0 - bucket[0]) / rate
+            wait = min(wait, 1.0)
+            time.sleep(wait)
+            waited += wait
+
+    def record_host_result(
+        self,
+        host: str,
+        latency: float,
+        ok: bool = True,
+        status: Optional[int] = None
+    ):
+        """
+        요청 결과로 호스트 요청률 조절
+
+        Args:
+            host: 호스트명
+            latency: 응답 시간 (초)
+            ok: 성공 여부
+            status: HTTP 상태 코드 (알 수 있을 때)
+        """
+        with self._host_lock:
+            rate = self.host_rate.get(host, self.initial_host_rate)
+
+            overloaded = (not ok and (status is None or status == 429 or status >= 500))
+            if overloaded:
+                # Multiplicative decrease
+                self.host_rate[host] = max(self.min_host_rate, rate * self.rate_decrease)
+                return
+            if not ok:
+                return  # 4xx 등은 속도와 무관
+
+            prev = self.host_latency_ema.get(host)
+            ema = latency if prev is None else prev * 0.8 + latency * 0.2
+            self.host_latency_ema[host] = ema
+
+            base = min(self.host_base_latency.get(host, ema), ema)
+            self.host_base_latency[host] = base
+
+            # Additive(완만한) increase: 지연이 기준 대비 크게 늘지 않았을 때만
+            if ema <= base * self.latency_rise_limit:
+                self.host_rate[host] = min(self.max_host_rate, rate * self.rate_increase)
+
     def get_backoff_time(self, marathon_id: int, refresh_sec: int) -> float:
         """
         현재 백오프 시간 계산
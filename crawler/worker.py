@@ -1,14 +1,51 @@
-import threading, time, json, os
+import asyncio
+import threading, time, json, os, re
 from queue import Queue, Empty
-from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout
+from playwright.async_api import async_playwright, TimeoutError as PWTimeout
 
 # 전역 변수 수정
 _MR_WORKER = None
 _MR_WORKER_LOCK = threading.Lock()
 
+# 컨텍스트당 탭 수 (= 동시에 처리할 수 있는 요청 수, 엔진이 MyResult 동시 작업 수 상한으로 사용)
+MR_WORKER_TABS = max(1, int(os.getenv("MR_WORKER_TABS", "4")))
+# fetch() 호출 측 대기 = timeout + 이 값, 워커도 같은 시간 안에 끝내고 탭을 반환
+FETCH_GRACE_SEC = 8
+
+# 리소스 차단(속도): 요청마다 불리므로 타입은 frozenset, 호스트는 정규식 1회 스캔
+_BLOCK_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+_BLOCK_RX = re.compile(
+    r"google-analytics\.com|googletagmanager\.com|g\.doubleclick\.net"
+    r"|facebook\.com|kakao|naver|daum|hotjar|mixpanel"
+)
+
+
+def _is_json_response(r) -> bool:
+    return (
+        r.request.resource_type in ("xhr", "fetch")
+        and ("json" in (r.headers.get("content-type", "").lower())
+             or r.url.endswith(".json")
+             or "/api/" in r.url)
+    )
+
+
+async def _route(route, req):
+    if req.resource_type in _BLOCK_TYPES or _BLOCK_RX.search(req.url):
+        return await route.abort()
+    return await route.continue_()
+
 class _MyResultWorker:
-    def __init__(self, chrome_path: str | None = None):
+    """
+    MyResult 브라우저 워커 (전용 스레드 + asyncio 이벤트 루프)
+
+    - 브라우저 1개에 컨텍스트 contexts개, 컨텍스트마다 탭 N개(MR_WORKER_TABS, 기본 4)
+    - 컨텍스트끼리는 쿠키/캐시가 분리되지만 Chromium 프로세스는 공유
+    - 들어온 요청은 빈 탭에 배정되어 동시에 처리됨
+    """
+    def __init__(self, chrome_path: str | None = None, tabs: int | None = None, contexts: int = 1):
         self.chrome_path = chrome_path
+        self.tabs = max(1, tabs or MR_WORKER_TABS)
+        self.contexts = max(1, contexts)
         self.in_q: Queue = Queue()
         self.thread = threading.Thread(target=self._run, daemon=True, name="MyResultWorker")
         self.thread.start()
@@ -17,7 +54,8 @@ class _MyResultWorker:
         out_q: Queue = Queue()
         self.in_q.put(("FETCH", url, timeout, out_q))
         try:
-            return out_q.get(timeout=timeout + 8)
+            # 워커 쪽 제한(timeout + FETCH_GRACE_SEC)보다 조금 더 기다림 → 보통은 워커가 "" 를 돌려줌
+            return out_q.get(timeout=timeout + FETCH_GRACE_SEC + 1)
         except Empty:
             return ""  # 타임아웃 → 상위에서 폴백/로그
 
@@ -27,116 +65,160 @@ class _MyResultWorker:
         except Empty: pass
 
     def _run(self):
-        pw = browser = ctx = page = None
+        # 워커 스레드 전용 이벤트 루프 (async Playwright)
+        asyncio.run(self._main())
+
+    async def _main(self):
+        async with async_playwright() as pw:
+            browser = None
+            contexts = []
+            try:
+                launch_kwargs = dict(
+                    headless=True,
+                    args=["--no-sandbox","--disable-setuid-sandbox","--ignore-certificate-errors"]
+                )
+                if self.chrome_path:
+                    launch_kwargs["executable_path"] = self.chrome_path
+                browser = await pw.chromium.launch(**launch_kwargs)
+
+                # 컨텍스트마다 탭 여러 개 → 모든 탭을 한 큐에 넣고 요청을 동시에 처리
+                pages: asyncio.Queue = asyncio.Queue()
+                for _ in range(self.contexts):
+                    ctx = await browser.new_context(
+                        ignore_https_errors=True,
+                        java_script_enabled=True,
+                        viewport={"width": 1200, "height": 800},
+                        user_agent=("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                                    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"),
+                    )
+                    contexts.append(ctx)
+
+                    # 리소스 차단은 컨텍스트 단위로 한 번만 등록 (모든 탭에 적용)
+                    await ctx.route("**/*", _route)
+
+                    for _ in range(self.tabs):
+                        page = await ctx.new_page()
+                        pages.put_nowait(page)
+
+                tasks = set()
+                while True:
+                    # in_q는 스레드 큐 → 블로킹 get은 별도 스레드에서
+                    op, url, timeout, out_q = await asyncio.to_thread(self.in_q.get)
+                    if op == "STOP":
+                        for t in tasks:
+                            t.cancel()
+                        out_q.put("OK"); break
+
+                    task = asyncio.create_task(self._serve(pages, url, timeout, out_q))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+            finally:
+                for ctx in contexts:
+                    try: await ctx.close()
+                    except: pass
+                try: browser and await browser.close()
+                except: pass
+
+    async def _serve(self, pages: "asyncio.Queue", url: str, timeout: int, out_q: Queue):
+        """
+        빈 탭을 잡아서 한 건 처리 (실패/시간 초과 시 빈 문자열)
+
+        탭 대기 + 로딩 전체를 호출 측 대기 시간 안으로 제한
+        (호출 측이 포기한 요청이 탭을 계속 붙잡고 있지 않도록 취소 후 탭 반환)
+        """
+        result = ""
         try:
-            pw = sync_playwright().start()
-            launch_kwargs = dict(
-                headless=True,
-                args=["--no-sandbox","--disable-setuid-sandbox","--ignore-certificate-errors"]
-            )
-            if self.chrome_path:
-                launch_kwargs["executable_path"] = self.chrome_path
-            browser = pw.chromium.launch(**launch_kwargs)
-            ctx = browser.new_context(
-                ignore_https_errors=True,
-                java_script_enabled=True,
-                viewport={"width": 1200, "height": 800},
-                user_agent=("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"),
-            )
-            page = ctx.new_page()
-
-            # 리소스 차단(속도)
-            block_types = {"image","media","font","stylesheet"}
-            block_hosts = ("google-analytics.com","googletagmanager.com","g.doubleclick.net",
-                           "facebook.com","kakao","naver","daum","hotjar","mixpanel")
-            def _route(route, req):
-                if req.resource_type in block_types: return route.abort()
-                if any(h in req.url for h in block_hosts): return route.abort()
-                return route.continue_()
-            page.route("**/*", _route)
-
-            while True:
-                op, url, timeout, out_q = self.in_q.get()
-                if op == "STOP":
-                    out_q.put("OK"); break
-
-                try:
-                    page.set_default_timeout(max(10000, timeout * 1000))
-                    page.goto(url, wait_until="domcontentloaded", timeout=max(12000, timeout*1000))
-
-                    # 1) 네트워크 안정화까지 대기
-                    try:
-                        page.wait_for_load_state("networkidle", timeout=max(6000, int(timeout*700)))
-                    except Exception:
-                        pass
-
-                    # 2) 테이블 DOM이 붙을 때까지 적극 대기 (최대 ~8s)
-                    dom_ok = False
-                    for _ in range(8):
-                        try:
-                            page.wait_for_selector(".table-row.ant-row .ant-col", state="attached", timeout=1000)
-                            dom_ok = True
-                            break
-                        except Exception:
-                            pass
-
-                    if dom_ok:
-                        out_q.put(page.content())
-                        continue
-
-                    # 3) 그래도 DOM이 없으면 JSON XHR 잡기 시도 (5~7s)
-                    data = None
-                    deadline = time.time() + 7
-                    while time.time() < deadline:
-                        try:
-                            resp = page.wait_for_event(
-                                "response",
-                                predicate=lambda r: (
-                                    r.request.resource_type in ("xhr","fetch")
-                                    and ("json" in (r.headers.get("content-type","").lower())
-                                        or r.url.endswith(".json")
-                                        or "/api/" in r.url)
-                                ),
-                                timeout=800,
-                            )
-                            try:
-                                j = resp.json()
-                            except Exception:
-                                continue
-                            data = j
-                            break
-                        except Exception:
-                            pass
-
-                    if data is not None:
-                        out_q.put("JSON::" + json.dumps(data, ensure_ascii=False))
-                        continue
-
-                    # 4) 최후: 현재 DOM 그대로 반환 (스켈레톤일 수도 있음)
-                    out_q.put(page.content())
-
-                except Exception:
-                    out_q.put("")  # 이 건만 실패
+            result = await asyncio.wait_for(self._serve_on_tab(pages, url, timeout), timeout + FETCH_GRACE_SEC)
+        except Exception:
+            result = ""  # 이 건만 실패 (asyncio.TimeoutError 포함)
+        finally:
+            out_q.put(result)
 
+    async def _serve_on_tab(self, pages: "asyncio.Queue", url: str, timeout: int) -> str:
+        page = await pages.get()
+        try:
+            return await self._fetch_page(page, url, timeout)
         finally:
-            try: page and page.context.close()
-            except: pass
-            try: browser and browser.close()
-            except: pass
-            try: pw and pw.stop()
-            except: pass
+            pages.put_nowait(page)  # 취소돼도 탭은 반환 (다음 goto가 이전 로딩을 대체)
+
+    async def _fetch_page(self, page, url: str, timeout: int) -> str:
+        # JSON XHR 응답은 goto 전부터 계속 수집 (폴링 사이에 지나가는 응답을 놓치지 않도록)
+        captured: asyncio.Queue = asyncio.Queue()
+
+        def _on_response(r):
+            if _is_json_response(r):
+                captured.put_nowait(r)
+
+        page.on("response", _on_response)
+        try:
+            return await self._load_page(page, url, timeout, captured)
+        finally:
+            page.remove_listener("response", _on_response)  # 탭은 재사용됨
+
+    async def _load_page(self, page, url: str, timeout: int, captured: "asyncio.Queue") -> str:
+        page.set_default_timeout(max(10000, timeout * 1000))
+        await page.goto(url, wait_until="domcontentloaded", timeout=max(12000, timeout*1000))
+
+        # 1) 네트워크 안정화까지 대기
+        try:
+            await page.wait_for_load_state("networkidle", timeout=max(6000, int(timeout*700)))
+        except Exception:
+            pass
+
+        # 2) 테이블 DOM이 붙을 때까지 대기 (최대 8s, 브라우저 안에서 한 번에)
+        dom_ok = False
+        try:
+            await page.wait_for_function(
+                "document.querySelector('.table-row.ant-row .ant-col') !== null",
+                timeout=8000,
+            )
+            dom_ok = True
+        except Exception:
+            pass
+
+        if dom_ok:
+            return await page.content()
+
+        # 3) 그래도 DOM이 없으면 수집된 JSON XHR 사용 (최대 7s 추가 대기)
+        data = None
+        deadline = time.monotonic() + 7
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                resp = await asyncio.wait_for(captured.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            try:
+                data = await resp.json()
+                break
+            except Exception:
+                continue
+
+        if data is not None:
+            return "JSON::" + json.dumps(data, ensure_ascii=False)
+
+        # 4) 최후: 현재 DOM 그대로 반환 (스켈레톤일 수도 있음)
+        return await page.content()
 
 class _MyResultWorkerPool:
-    """MyResult 전용 워커 풀"""
+    """
+    MyResult 전용 워커 풀
+
+    Chromium은 하나만 띄우고 워커마다 BrowserContext를 따로 둠
+    (쿠키 분리는 유지하면서 메모리는 브라우저 1개분)
+    - 요청은 비어 있는 탭에 바로 배정 → 느린 페이지 뒤에 줄 서지 않음
+    """
     def __init__(self, pool_size=3):
-        self.workers = [_MyResultWorker() for _ in range(pool_size)]
-        self.idx = 0
-    
+        self.worker = _MyResultWorker(os.getenv("CHROME_PATH") or None, contexts=pool_size)
+
     def fetch(self, url: str, timeout: int = 12) -> str:
-        worker = self.workers[self.idx]
-        self.idx = (self.idx + 1) % len(self.workers)
-        return worker.fetch(url, timeout)
+        return self.worker.fetch(url, timeout)
+
+    def stop(self):
+        self.worker.stop()
 
 def get_mr_worker():
     """MyResult 워커 인스턴스를 반환 (싱글톤)"""
@@ -1,7 +1,64 @@
+import threading
+import urllib.parse
+from functools import partial
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from bs4 import BeautifulSoup
 
+# BeautifulSoup 파서: lxml(C 구현)이 있으면 사용, 없으면 내장 html.parser
+try:
+    from lxml import etree
+    SOUP_FEATURES = "lxml"
+except ImportError:
+    etree = None
+    SOUP_FEATURES = "html.parser"
+
+# 파싱마다 호출되는 생성자 → features를 미리 묶어 둔 모듈 수준 이름으로 사용
+make_soup = partial(BeautifulSoup, features=SOUP_FEATURES)
+
+# lxml HTMLParser는 스레드별로 하나 만들어 재사용 (공유 시 내부 락으로 직렬화됨)
+_TREE_PARSERS = threading.local()
+
+
+def make_tree(html: str):
+    """
+    BS4 없이 lxml 트리 생성 (XPath 몇 개만 필요한 경로용)
+
+    Returns:
+        루트 엘리먼트. lxml 미설치거나 빈 문서면 None
+    """
+    if etree is None or not html:
+        return None
+    parser = getattr(_TREE_PARSERS, "parser", None)
+    if parser is None:
+        parser = _TREE_PARSERS.parser = etree.HTMLParser(recover=True)
+    return etree.fromstring(html, parser)
+
+
+def join_url(base: str, ref: str) -> str:
+    """
+    urljoin 빠른 경로 (base는 경로 없는 "https://host")
+
+    - 절대 URL → 그대로
+    - 루트 상대("/...") → 문자열 연결
+    - 그 외(상대 경로, "//host/..." 등) → urljoin
+    """
+    if ref.startswith(("http://", "https://")):
+        return ref
+    if ref.startswith("/") and not ref.startswith("//"):
+        return base + ref
+    return urllib.parse.urljoin(base + "/", ref)
+
+
+def rows_within(soup, container: str, **attrs) -> List:
+    """
+    soup.select("<container> tr")와 같은 결과 (CSS 셀렉터 컴파일/매칭 없이 find_all)
+
+    예: rows_within(soup, "table") == soup.select("table tr")
+        rows_within(soup, "table", class_="result-table") == soup.select("table.result-table tr")
+    """
+    return [tr for tr in soup.find_all("tr") if tr.find_parent(container, **attrs) is not None]
+
 class BaseParser(ABC):
     """파서 베이스 클래스"""
     
@@ -28,5 +85,44 @@ class BaseParser(ABC):
     
     def _make_soup(self, html: str) -> BeautifulSoup:
         """BeautifulSoup 객체 생성"""
-        return BeautifulSoup(html, "html.parser")
+        return make_soup(html)
+
+    def _make_tree(self, html: str):
+        """lxml 트리 생성 (make_tree 참고)"""
+        return make_tree(html)
+
+
+# ============= 파서 레지스트리 =============
+# 호스트 접미사 → 파서 인스턴스. 각 파서 모듈이 import 시 register()로 등록
+# (파서를 하나씩 can_parse로 물어보는 대신 dict 조회)
+
+_REGISTRY: Dict[str, BaseParser] = {}
+
+
+def register(host_suffix: str, parser: BaseParser):
+    """호스트 접미사(하위 도메인 포함)에 파서 등록"""
+    _REGISTRY[host_suffix.lower()] = parser
+
+
+def get_parser(host: Optional[str]) -> Optional[BaseParser]:
+    """
+    호스트에 맞는 파서 반환
+
+    정확히 일치하는 호스트부터 시작해 상위 도메인으로 한 단계씩 올라가며 조회
+    (예: time.spct.co.kr → spct.co.kr)
+    """
+    h = (host or "").lower()
+    while h:
+        parser = _REGISTRY.get(h)
+        if parser is not None:
+            return parser
+        dot = h.find(".")
+        if dot < 0:
+            break
+        h = h[dot + 1:]
+    return None
+
 
+def registered_hosts() -> List[str]:
+    """등록된 호스트 접미사 목록"""
+    return sorted(_REGISTRY)
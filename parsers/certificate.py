@@ -1,16 +1,58 @@
 # parsers/certificate.py
 """기록증(완주증) URL 생성 및 검증"""
 
+import re
+import time
+import threading
+import urllib.parse
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
 from typing import Optional, List, Tuple
 
 from bs4 import BeautifulSoup
 
-from utils.network_utils import get_session, abs_url
+from utils.network_utils import get_session, abs_url, verify_for_host
 from config.constants import DEFAULT_HEADERS
 
 
+# ============= 호스트 분류 =============
+# 호스트 문자열을 한 번만 스캔해서 계열(smartchip/spct/myresult) 판별
+
+_HOST_FAMILY_RE = re.compile(r"(?P<smartchip>smartchip\.co\.kr)|(?P<spct>spct)|(?P<myresult>myresult)")
+
+
+def _host_family(host: Optional[str]) -> Optional[str]:
+    """호스트 계열 이름 또는 None"""
+    m = _HOST_FAMILY_RE.search((host or "").lower())
+    return m.lastgroup if m else None
+
+
 # ============= URL 생성 =============
 
+def _template_params(usedata: str, nameorbibno: str, cert_key: Optional[str]) -> defaultdict:
+    """템플릿 치환값 (모르는 플레이스홀더는 빈 문자열)"""
+    return defaultdict(
+        str,
+        usedata=usedata or "",
+        nameorbibno=nameorbibno or "",
+        cert_key=cert_key or nameorbibno or "",
+    )
+
+
+def _expand_template(template: str, params: defaultdict) -> str:
+    """
+    {usedata}/{nameorbibno}/{cert_key} 치환 (format_map 한 번으로)
+
+    템플릿에 짝이 안 맞는 중괄호 등이 있어 format이 실패하면 문자열 치환으로 처리
+    """
+    try:
+        return template.format_map(params)
+    except (ValueError, IndexError, KeyError, AttributeError):
+        for k in ("usedata", "nameorbibno", "cert_key"):
+            template = template.replace("{" + k + "}", params[k])
+        return template
+
+
 def build_certificate_url(
     host: str,
     usedata: str,
@@ -42,28 +84,13 @@ def build_certificate_url(
         >>> build_certificate_url("spct.co.kr", "2025092102", "123")
         'https://img.spct.kr/PhotoResultsJPG/images/2025092102/2025092102-000123.jpg'
     """
-    host_lower = (host or "").lower()
-    
     # 1) 커스텀 템플릿 우선
     if url_template:
-        return (
-            url_template
-            .replace("{usedata}", usedata or "")
-            .replace("{nameorbibno}", nameorbibno or "")
-            .replace("{cert_key}", cert_key or nameorbibno or "")
-        )
+        return _expand_template(url_template, _template_params(usedata, nameorbibno, cert_key))
     
     # 2) 호스트별 기본 규칙
-    if "smartchip.co.kr" in host_lower:
-        return _build_smartchip_cert_url(usedata, nameorbibno, cert_key)
-    
-    if "spct" in host_lower:
-        return _build_spct_cert_url(usedata, nameorbibno)
-    
-    if "myresult.co.kr" in host_lower:
-        return _build_myresult_cert_url(usedata, nameorbibno)
-    
-    return None
+    builder = _CERT_URL_BUILDERS.get(_host_family(host))
+    return builder(usedata, nameorbibno, cert_key) if builder else None
 
 
 def build_certificate_candidates(
@@ -98,29 +125,18 @@ def build_certificate_candidates(
             ...
         ]
     """
-    host_lower = (host or "").lower()
     key = cert_key or bib
     candidates = []
     
     # 1) 템플릿 우선
     if cert_template:
-        url = (
-            cert_template
-            .replace("{usedata}", usedata or "")
-            .replace("{nameorbibno}", bib or "")
-            .replace("{cert_key}", key or "")
-        )
+        url = _expand_template(cert_template, _template_params(usedata, bib, cert_key))
         candidates.append((url, None))
     
-    # 2) 호스트별 변형 생성
-    if "smartchip.co.kr" in host_lower:
-        candidates.extend(_build_smartchip_candidates(usedata, key))
-    
-    elif "spct" in host_lower:
-        candidates.extend(_build_spct_candidates(usedata, bib))
-    
-    elif "myresult.co.kr" in host_lower:
-        candidates.extend(_build_myresult_candidates(usedata, bib))
+    # 2) 호스트별 변형 (캐시된 tuple)
+    builder = _CANDIDATE_BUILDERS.get(_host_family(host))
+    if builder:
+        candidates.extend(builder(usedata, bib, key))
     
     return candidates
 
@@ -143,9 +159,9 @@ def _build_spct_cert_url(usedata: str, nameorbibno: str) -> str:
     
     event_no = extract_event_no(usedata)
     
-    # 숫자면 6자리 제로패딩
+    # 숫자면 6자리 제로패딩 (zfill은 6자리 이상이면 그대로)
     bib = nameorbibno.strip()
-    if bib.isdigit():
+    if bib.isdecimal():
         bib = bib.zfill(6)
     
     return f"https://img.spct.kr/PhotoResultsJPG/images/{event_no}/{event_no}-{bib}.jpg"
@@ -157,29 +173,31 @@ def _build_myresult_cert_url(usedata: str, nameorbibno: str) -> str:
 
 
 # ============= 후보 생성 (내부) =============
+# 입력만으로 결과가 정해지는 순수 함수 → (usedata, bib)별 캐시, 캐시 값은 변경 불가 tuple
 
+Candidates = Tuple[Tuple[str, Optional[str]], ...]
+
+
+@lru_cache(maxsize=2048)
 def _build_smartchip_candidates(
     usedata: str,
     key: str
-) -> List[Tuple[str, Optional[str]]]:
+) -> Candidates:
     """스마트칩 후보 목록"""
-    candidates = []
-    
     # 1) 페이지 (내부에서 <img> 추출 필요)
     page_url = f"https://smartchip.co.kr/TriRun_Record.asp?Rally_id={usedata}&Bally_no={key}"
-    candidates.append((page_url, None))
     
     # 2) 이미지 직접 (Referer 필요할 수 있음)
     img_url = f"https://image.smartchip.co.kr/record_data/TriRun_Record.php?Rally_id={usedata}&Bally_no={key}"
-    candidates.append((img_url, page_url))
     
-    return candidates
+    return ((page_url, None), (img_url, page_url))
 
 
+@lru_cache(maxsize=2048)
 def _build_spct_candidates(
     usedata: str,
     bib: str
-) -> List[Tuple[str, Optional[str]]]:
+) -> Candidates:
     """SPCT 후보 목록 (여러 포맷 시도)"""
     from parsers.spct import extract_event_no, generate_bib_variants
     
@@ -200,13 +218,14 @@ def _build_spct_candidates(
         img_upper = f"https://img.spct.kr/PhotoResultsJPG/images/{event_no}/{event_no}-{variant}.JPG"
         candidates.append((img_upper, referer))
     
-    return candidates
+    return tuple(candidates)
 
 
+@lru_cache(maxsize=2048)
 def _build_myresult_candidates(
     usedata: str,
     bib: str
-) -> List[Tuple[str, Optional[str]]]:
+) -> Candidates:
     """MyResult 후보 목록"""
     # Referer (상세 페이지)
     referer = f"https://www.myresult.co.kr/{usedata}/{bib}"
@@ -214,15 +233,46 @@ def _build_myresult_candidates(
     # 이미지 URL
     img_url = f"https://www.myresult.co.kr/upload/certificate/{usedata}/{bib}.jpg"
     
-    return [(img_url, referer)]
+    return ((img_url, referer),)
+
+
+# 호스트 계열 → 생성 함수 (인자: usedata, bib, cert_key 또는 key)
+_CERT_URL_BUILDERS = {
+    "smartchip": _build_smartchip_cert_url,
+    "spct": lambda usedata, bib, cert_key: _build_spct_cert_url(usedata, bib),
+    "myresult": lambda usedata, bib, cert_key: _build_myresult_cert_url(usedata, bib),
+}
+
+_CANDIDATE_BUILDERS = {
+    "smartchip": lambda usedata, bib, key: _build_smartchip_candidates(usedata, key),
+    "spct": lambda usedata, bib, key: _build_spct_candidates(usedata, bib),
+    "myresult": lambda usedata, bib, key: _build_myresult_candidates(usedata, bib),
+}
 
 
 # ============= URL 검증 =============
 
+# 검증 결과 캐시: (host, url, referer) → (이미지 URL 또는 None, 만료 시각)
+# - 확인된 URL은 프로세스가 살아 있는 동안 유지 (크기 제한 LRU)
+# - 실패(None)는 CERT_NEGATIVE_TTL초 후 다시 확인 (아직 기록증이 안 올라왔을 수 있음)
+CERT_CACHE_MAXSIZE = 4096
+CERT_NEGATIVE_TTL = 300
+
+_CERT_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+_CERT_CACHE_LOCK = threading.Lock()
+
+
+def clear_certificate_cache():
+    """검증 결과 캐시 비우기 (테스트용)"""
+    with _CERT_CACHE_LOCK:
+        _CERT_CACHE.clear()
+
+
 def ensure_image_url(
     host: str,
     url: str,
-    referer: Optional[str] = None
+    referer: Optional[str] = None,
+    session=None
 ) -> Optional[str]:
     """
     최종 이미지 URL 검증 및 반환
@@ -235,32 +285,62 @@ def ensure_image_url(
         host: 호스트명
         url: URL (페이지 또는 이미지)
         referer: Referer 헤더 (선택)
+        session: 재사용할 세션 (없으면 공용 세션 → keep-alive 연결 풀 공유)
     
     Returns:
         확인된 이미지 URL 또는 None
     """
-    host_lower = (host or "").lower()
-    session = get_session()
+    key = ((host or "").lower(), url, referer)
+    now = time.monotonic()
+    with _CERT_CACHE_LOCK:
+        hit = _CERT_CACHE.get(key)
+        if hit is not None:
+            if now < hit[1]:
+                _CERT_CACHE.move_to_end(key)
+                return hit[0]
+            del _CERT_CACHE[key]
+    
+    result = _resolve_image_url(host, url, referer, session)
+    
+    expires = float("inf") if result else now + CERT_NEGATIVE_TTL
+    with _CERT_CACHE_LOCK:
+        _CERT_CACHE[key] = (result, expires)
+        _CERT_CACHE.move_to_end(key)
+        while len(_CERT_CACHE) > CERT_CACHE_MAXSIZE:
+            _CERT_CACHE.popitem(last=False)
+    return result
+
+
+def _resolve_image_url(
+    host: str,
+    url: str,
+    referer: Optional[str],
+    session
+) -> Optional[str]:
+    """ensure_image_url의 실제 네트워크 확인 (캐시 없음)"""
+    family = _host_family(host)
+    session = session or get_session()
+    verify = verify_for_host((urllib.parse.urlsplit(url).hostname or "").lower())
     
     try:
         # 1) 스마트칩: 페이지에서 이미지 추출
-        if "smartchip.co.kr" in host_lower and "TriRun_Record.asp" in url:
-            return _extract_smartchip_image(url, session)
+        if family == "smartchip" and "TriRun_Record.asp" in url:
+            return _extract_smartchip_image(url, session, verify)
         
         # 2) SPCT/MyResult: 이미지 직접 확인
-        if "spct" in host_lower or "myresult" in host_lower:
-            return _verify_direct_image(url, session)
+        if family in ("spct", "myresult"):
+            return _verify_direct_image(url, session, verify)
         
         # 3) 기타: Referer와 함께 확인
-        return _verify_image_with_referer(url, referer, session)
+        return _verify_image_with_referer(url, referer, session, verify)
     
     except Exception:
         return None
 
 
-def _extract_smartchip_image(url: str, session) -> Optional[str]:
+def _extract_smartchip_image(url: str, session, verify: bool) -> Optional[str]:
     """스마트칩 페이지에서 이미지 URL 추출"""
-    r = session.get(url, timeout=12, verify=VERIFY_YN, headers=DEFAULT_HEADERS)
+    r = session.get(url, timeout=12, verify=verify, headers=DEFAULT_HEADERS)
     r.raise_for_status()
     
     soup = BeautifulSoup(r.text, "html.parser")
@@ -273,21 +353,30 @@ def _extract_smartchip_image(url: str, session) -> Optional[str]:
     return None
 
 
-def _verify_direct_image(url: str, session) -> Optional[str]:
+def _probe_image(url: str, session, verify: bool, headers: dict, timeout: int) -> Tuple[int, str]:
+    """
+    이미지 본문 없이 헤더만 확인 (HEAD)
+    
+    HEAD를 거부하는 CDN(403/405/501)이면 GET(stream)으로 다시 확인하고 본문은 읽지 않음
+    
+    Returns:
+        (status_code, content_type 소문자)
+    """
+    r = session.head(url, timeout=timeout, verify=verify, headers=headers, allow_redirects=True)
+    if r.status_code in (403, 405, 501):
+        r = session.get(url, timeout=timeout, verify=verify, headers=headers, stream=True, allow_redirects=True)
+        r.close()  # 연결을 풀로 반환
+    return r.status_code, (r.headers.get("content-type") or "").lower()
+
+
+def _verify_direct_image(url: str, session, verify: bool) -> Optional[str]:
     """이미지 URL 직접 확인 (SPCT/MyResult)"""
-    r = session.get(
-        url,
-        timeout=12,
-        verify=VERIFY_YN,
-        headers=DEFAULT_HEADERS,
-        allow_redirects=True
-    )
+    status, content_type = _probe_image(url, session, verify, DEFAULT_HEADERS, timeout=12)
     
-    if r.status_code != 200:
+    if status != 200:
         return None
     
     # Content-Type 확인 (비어있어도 200이면 허용)
-    content_type = (r.headers.get("content-type") or "").lower()
     if "image" in content_type or not content_type:
         return url
     
@@ -297,7 +386,8 @@ def _verify_direct_image(url: str, session) -> Optional[str]:
 def _verify_image_with_referer(
     url: str,
     referer: Optional[str],
-    session
+    session,
+    verify: bool
 ) -> Optional[str]:
     """Referer와 함께 이미지 확인"""
     headers = dict(DEFAULT_HEADERS)
@@ -306,19 +396,11 @@ def _verify_image_with_referer(
         headers["Referer"] = referer
         headers["Accept"] = "image/avif,image/webp,image/apng,image/*,*/*;q=0.8"
     
-    r = session.get(
-        url,
-        timeout=10,
-        verify=VERIFY_YN,
-        headers=headers,
-        stream=True,
-        allow_redirects=True
-    )
+    status, content_type = _probe_image(url, session, verify, headers, timeout=10)
     
-    if r.status_code != 200:
+    if status != 200:
         return None
     
-    content_type = (r.headers.get("content-type") or "").lower()
     if "image" in content_type or not content_type:
         return url
     
@@ -2,12 +2,13 @@
 """MyResult 전용 파서"""
 
 import json
-import urllib.parse
+import re
 from typing import Dict, Any, List, Optional
 
-from bs4 import BeautifulSoup
+import soupsieve as sv
+from bs4 import BeautifulSoup, NavigableString
 
-from parsers.base import BaseParser
+from parsers.base import BaseParser, register, etree, make_tree, make_soup, join_url  # etree: lxml 미설치 시 None
 from config.constants import FULL_KM, HALF_KM
 from utils.time_utils import first_time
 from utils.distance_utils import (
@@ -18,6 +19,28 @@ from utils.distance_utils import (
 )
 
 
+# CSS 선택자 (모듈 로드 시 1회 컴파일, 파싱마다 선택자 문자열을 다시 해석하지 않음)
+_SEL_ROW = sv.compile(".table-row.ant-row")
+_SEL_COL = sv.compile(".ant-col")
+_SEL_IMG_CERT = sv.compile('img[src*="/upload/certificate/"]')
+_SEL_A_CERT = sv.compile('a[href*="/upload/certificate/"]')
+_SEL_STAT = sv.compile(".ant-statistic")
+_SEL_STAT_TITLE = sv.compile(".ant-statistic-title")
+_SEL_STAT_VALUE = sv.compile(".ant-statistic-content .ant-statistic-content-value")
+
+# JSON 문자열 값 중 기록증 URL 판별 (패턴을 늘려도 한 번의 스캔)
+CERT_URL_MARKERS = ("/upload/certificate/",)
+_CERT_URL_RX = re.compile("|".join(re.escape(m) for m in CERT_URL_MARKERS))
+
+# 빈 값으로 취급하는 대시 문자
+_DASH_SET = frozenset(("-", "—", "–"))
+
+# JSON 키 판별 (라벨은 원래 키, 통과시간/누적기록은 소문자 키에 적용)
+_LABEL_KEYS_RE = re.compile(r"구간명|섹션|지점|label|section")
+_CLOCK_KEYS_RE = re.compile(r"통과시간|시각|clock|passtime|pass_time")
+_ACC_KEYS_RE = re.compile(r"누적|acc|total|cumulative")  # 누적기록/acctime 포함
+
+
 class MyResultParser(BaseParser):
     """
     MyResult 전용 파서 (Ant Design 기반)
@@ -62,16 +85,29 @@ class MyResultParser(BaseParser):
     
     def _parse_html(self, html: str, host: Optional[str]) -> Dict[str, Any]:
         """HTML 파싱 (Ant Design 테이블)"""
-        soup = self._make_soup(html)
-        
-        # 1. 스플릿 추출
-        splits = self._extract_splits_from_html(soup)
+        # lxml이 있으면 BS4 Tag 래핑 없이 XPath로 처리
+        tree = None
+        if USE_LXML_BACKFILL:
+            try:
+                tree = self._make_tree(html)
+            except Exception:
+                tree = None  # lxml이 거부하는 문서는 BS4로
         
-        # 2. 기록증 추출
-        assets = self._extract_certificate(soup, host)
-        
-        # 3. 거리 메타데이터
-        race_label, race_total_km = self._extract_and_normalize_distance(soup)
+        if tree is not None:
+            splits = self._extract_splits_from_tree(tree)
+            assets = self._extract_certificate_from_tree(tree, host)
+            race_label, race_total_km = self._normalize_distance(_doc_text(tree))
+        else:
+            soup = make_soup(html)
+            
+            # 1. 스플릿 추출
+            splits = self._extract_splits_from_html(soup)
+            
+            # 2. 기록증 추출
+            assets = self._extract_certificate(soup, host)
+            
+            # 3. 거리 메타데이터
+            race_label, race_total_km = self._extract_and_normalize_distance(soup)
         
         return {
             'splits': splits,
@@ -95,38 +131,61 @@ class MyResultParser(BaseParser):
         """
         splits = []
         
-        for row in soup.select(".table-row.ant-row"):
-            cols = row.select(".ant-col")
+        for row in _SEL_ROW.select(soup):
+            cols = _SEL_COL.select(row)
             if len(cols) < 4:
                 continue
             
-            # 컬럼 값 추출 및 정리
-            label = self._clean_value(cols[0].get_text(" ", strip=True)) # 구간명
-            clock = self._clean_value(cols[1].get_text(" ", strip=True)) # 통과시간
-            acc = self._clean_value(cols[2].get_text(" ", strip=True))   # 구간기록 (net time으로 사용)
-            
-            # 시간 추출
-            clock_time = first_time(clock)
-            acc_time = first_time(acc)
-            
-            # 둘 다 없으면 스킵
-            if not (clock_time or acc_time):
+            split = self._split_from_texts(_tag_text(cols[0]), _tag_text(cols[1]), _tag_text(cols[2]))
+            if split:
+                splits.append(split)
+        
+        return splits
+    
+    def _extract_splits_from_tree(self, tree) -> List[Dict[str, Any]]:
+        """_extract_splits_from_html의 lxml(XPath) 버전"""
+        splits = []
+        
+        for row in _XP_ROW(tree):
+            cols = _XP_COL(row)
+            if len(cols) < 4:
                 continue
             
-            splits.append({
-                "point_label": label,
-                "point_km": km_from_label(label),
-                "net_time": acc_time or "",      # 구간기록을 net_time으로 사용
-                "pass_clock": clock_time or "",  # 통과시간
-                "pace": "",
-            })
+            split = self._split_from_texts(_el_text(cols[0]), _el_text(cols[1]), _el_text(cols[2]))
+            if split:
+                splits.append(split)
         
         return splits
     
+    def _split_from_texts(self, label: str, clock: str, acc: str) -> Optional[Dict[str, Any]]:
+        """행의 (구간명, 통과시간, 구간기록) 텍스트 → 스플릿 (시간이 없으면 None)"""
+        # 컬럼 값 정리
+        label = self._clean_value(label)  # 구간명
+        clock = self._clean_value(clock)  # 통과시간
+        acc = self._clean_value(acc)      # 구간기록 (net time으로 사용)
+        
+        # 시간 추출
+        clock_time = first_time(clock)
+        acc_time = first_time(acc)
+        
+        # 둘 다 없으면 스킵
+        if not (clock_time or acc_time):
+            return None
+        
+        return {
+            "point_label": label,
+            "point_km": km_from_label(label),
+            "net_time": acc_time or "",      # 구간기록을 net_time으로 사용
+            "pass_clock": clock_time or "",  # 통과시간
+            "pace": "",
+        }
+    
     def _clean_value(self, value: str) -> str:
         """값 정리 (대시 문자 제거)"""
-        value = (value or "").strip()
-        return "" if value in {"-", "—", "–"} else value
+        if not value:
+            return ""
+        value = value.strip()
+        return "" if value in _DASH_SET else value
     
     # ============= JSON 파싱 =============
     
@@ -146,13 +205,12 @@ class MyResultParser(BaseParser):
         
         splits = []
         assets = []
+        seen_certs = set()
         
-        # 재귀적으로 JSON 탐색
+        # 재귀적으로 JSON 탐색 (스플릿 + 기록증을 한 번의 순회로)
         def walk(x):
             if isinstance(x, dict):
-                label = self._extract_label_from_dict(x)
-                clock = self._extract_clock_from_dict(x)
-                acc = self._extract_acc_from_dict(x)
+                label, clock, acc = self._extract_fields(x)
                 
                 if label and (clock or acc):
                     splits.append({
@@ -163,33 +221,26 @@ class MyResultParser(BaseParser):
                         "pace": "",
                     })
                 
-                # 하위 탐색
+                # 기록증 URL
                 for v in x.values():
-                    walk(v)
-            
-            elif isinstance(x, list):
-                for v in x:
-                    walk(v)
-        
-        # 기록증 탐색
-        def walk_cert(x):
-            if isinstance(x, dict):
-                for k, v in x.items():
-                    if isinstance(v, str) and "/upload/certificate/" in v:
+                    if isinstance(v, str) and v not in seen_certs and _CERT_URL_RX.search(v):
+                        seen_certs.add(v)
                         assets.append({
                             "kind": "certificate",
                             "host": "myresult.co.kr",
                             "url": v
                         })
+                
+                # 하위 탐색
                 for v in x.values():
-                    walk_cert(v)
+                    if isinstance(v, (dict, list)):
+                        walk(v)
             
             elif isinstance(x, list):
                 for v in x:
-                    walk_cert(v)
+                    walk(v)
         
         walk(obj)
-        walk_cert(obj)
         
         return {
             'splits': splits,
@@ -197,46 +248,34 @@ class MyResultParser(BaseParser):
             'assets': assets
         }
     
-    def _extract_label_from_dict(self, d: Dict) -> Optional[str]:
+    def _extract_fields(self, d: Dict) -> tuple:
         """
-        딕셔너리에서 라벨 추출
+        딕셔너리에서 (라벨, 통과시간, 누적기록)을 한 번의 순회로 추출
         
-        키워드: 구간명, 섹션, 지점, label, section
-        제외: name (참가자명과 혼동 방지)
+        - 라벨: 구간명/섹션/지점/label/section 키의 문자열 값 (name 포함 키 제외)
+        - 통과시간: 통과시간/시각/clock/passtime/pass_time
+        - 누적기록: 누적기록/누적/acc/acctime/total/cumulative
+        각 항목은 처음 매칭된 키의 값을 사용
         """
-        for k, v in d.items():
-            if not isinstance(v, str):
-                continue
-            
-            # name은 제외
-            if "name" in k.lower():
-                continue
-            
-            # 라벨 키워드
-            if any(s in k for s in ("구간명", "섹션", "지점", "label", "section")):
-                return v
+        label = clock = acc = None
+        got_label = got_clock = got_acc = False
         
-        return None
-    
-    def _extract_clock_from_dict(self, d: Dict) -> Optional[str]:
-        """딕셔너리에서 통과시간 추출"""
         for k, v in d.items():
             k_lower = k.lower()
             
-            if any(s in k_lower for s in ("통과시간", "시각", "clock", "passtime", "pass_time")):
-                return first_time(str(v))
-        
-        return None
-    
-    def _extract_acc_from_dict(self, d: Dict) -> Optional[str]:
-        """딕셔너리에서 누적기록 추출"""
-        for k, v in d.items():
-            k_lower = k.lower()
+            if not got_label and isinstance(v, str) and "name" not in k_lower and _LABEL_KEYS_RE.search(k):
+                label, got_label = v, True
+            
+            if not got_clock and _CLOCK_KEYS_RE.search(k_lower):
+                clock, got_clock = first_time(str(v)), True
             
-            if any(s in k_lower for s in ("누적기록", "누적", "acc", "acctime", "total", "cumulative")):
-                return first_time(str(v))
+            if not got_acc and _ACC_KEYS_RE.search(k_lower):
+                acc, got_acc = first_time(str(v)), True
+            
+            if got_label and got_clock and got_acc:
+                break
         
-        return None
+        return label, clock, acc
     
     # ============= 기록증 추출 =============
     
@@ -250,30 +289,33 @@ class MyResultParser(BaseParser):
         - <img> 태그의 src
         - <a> 태그의 href
         """
+        # <img> 태그의 src → <a> 태그의 href 순서
+        links = [img["src"] for img in _SEL_IMG_CERT.select(soup) if img.get("src")]
+        links += [a["href"] for a in _SEL_A_CERT.select(soup) if a.get("href")]
+        return self._certificate_assets(links, host)
+    
+    def _extract_certificate_from_tree(self, tree, host: Optional[str]) -> List[Dict[str, str]]:
+        """_extract_certificate의 lxml(XPath) 버전"""
+        return self._certificate_assets(_XP_CERT_SRC(tree) + _XP_CERT_HREF(tree), host)
+    
+    def _certificate_assets(self, links: List[str], host: Optional[str]) -> List[Dict[str, str]]:
+        """기록증 링크 → 절대 URL 자산 목록 (중복 제거, 순서 유지)"""
         assets = []
+        seen = set()  # 중복 URL 확인 (O(1))
         base_host = f"https://{host or 'www.myresult.co.kr'}"
 
-        # <img> 태그에서 찾기
-        for img in soup.select('img[src*="/upload/certificate/"]'):
-            if img.get("src"):
-                cert_url = urllib.parse.urljoin(base_host, img["src"])
-                if not any(a['url'] == cert_url for a in assets):
-                    assets.append({
-                        "kind": "certificate",
-                        "host": host,
-                        "url": cert_url
-                    })
-
-        # <a> 태그에서 찾기
-        for link in soup.select('a[href*="/upload/certificate/"]'):
-            if link.get("href"):
-                cert_url = urllib.parse.urljoin(base_host, link["href"])
-                if not any(a['url'] == cert_url for a in assets):
-                    assets.append({
-                        "kind": "certificate",
-                        "host": host,
-                        "url": cert_url
-                    })
+        for link in links:
+            if not link:
+                continue
+            cert_url = join_url(base_host, link)
+            if cert_url in seen:
+                continue
+            seen.add(cert_url)
+            assets.append({
+                "kind": "certificate",
+                "host": host,
+                "url": cert_url
+            })
         
         return assets
     
@@ -290,7 +332,10 @@ class MyResultParser(BaseParser):
             (race_label, race_total_km)
         """
         # 전체 텍스트에서 거리 추출
-        full_text = soup.get_text(" ", strip=True)
+        return self._normalize_distance(soup.get_text(" ", strip=True))
+    
+    def _normalize_distance(self, full_text: str) -> tuple[Optional[str], Optional[float]]:
+        """페이지 전체 텍스트 → (race_label, race_total_km)"""
         race_label, race_total_km = extract_distance_from_text(full_text)
         
         # 거리 스냅 및 종목명 결정
@@ -321,11 +366,11 @@ def extract_total_net_time(soup: BeautifulSoup) -> str:
     Returns:
         총 기록 (예: "00:37:54") 또는 빈 문자열
     """
-    for stat in soup.select(".ant-statistic"):
-        title_elem = stat.select_one(".ant-statistic-title")
+    for stat in _SEL_STAT.select(soup):
+        title_elem = _SEL_STAT_TITLE.select_one(stat)
         
         if title_elem and "대회기록" in title_elem.get_text(" ", strip=True):
-            value_elem = stat.select_one(".ant-statistic-content .ant-statistic-content-value")
+            value_elem = _SEL_STAT_VALUE.select_one(stat)
             
             if value_elem:
                 value = first_time(value_elem.get_text(" ", strip=True))
@@ -335,6 +380,93 @@ def extract_total_net_time(soup: BeautifulSoup) -> str:
     return ""
 
 
+# ============= Finish 보강 (엔진 hot path) =============
+
+# lxml이 있으면 XPath(C 구현)로, 없으면 BeautifulSoup로 처리
+USE_LXML_BACKFILL = etree is not None
+
+
+def _xp_class(name: str) -> str:
+    """CSS 클래스 매칭 XPath 조건"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+if USE_LXML_BACKFILL:
+    _XP_STAT = etree.XPath(f"//*[{_xp_class('ant-statistic')}]")
+    _XP_STAT_TITLE = etree.XPath(f".//*[{_xp_class('ant-statistic-title')}]")
+    _XP_STAT_VALUE = etree.XPath(
+        f".//*[{_xp_class('ant-statistic-content')}]//*[{_xp_class('ant-statistic-content-value')}]"
+    )
+    _XP_ROW = etree.XPath(
+        f"//*[{_xp_class('table-row')} and {_xp_class('ant-row')}]"
+    )
+    _XP_COL = etree.XPath(f".//*[{_xp_class('ant-col')}]")
+    _XP_CERT_SRC = etree.XPath("//img[contains(@src, '/upload/certificate/')]/@src")
+    _XP_CERT_HREF = etree.XPath("//a[contains(@href, '/upload/certificate/')]/@href")
+    _XP_DOC_TEXT = etree.XPath("//text()[not(ancestor::script or ancestor::style)]")
+
+
+def _tag_text(tag) -> str:
+    """get_text(" ", strip=True)와 같은 결과 (ant-col처럼 문자열 하나뿐인 셀은 하위 순회 생략)"""
+    s = tag.string
+    if type(s) is NavigableString:
+        return s.strip()
+    return tag.get_text(" ", strip=True)
+
+
+def _el_text(el) -> str:
+    """BeautifulSoup get_text(" ", strip=True)와 같은 결과"""
+    if len(el) == 0:
+        return (el.text or "").strip()  # 자식 없는 리프 → text만
+    return " ".join(t.strip() for t in el.itertext() if t.strip())
+
+
+def _doc_text(tree) -> str:
+    """문서 전체 텍스트 (BS4처럼 script/style 내용 제외)"""
+    return " ".join(t.strip() for t in _XP_DOC_TEXT(tree) if t.strip())
+
+
+def extract_finish_backfill(html: str) -> tuple:
+    """
+    결과 페이지 HTML에서 (총 기록, 도착 통과시각) 추출
+
+    Returns:
+        (total_net_time, finish_clock) - 없으면 빈 문자열
+    """
+    if not USE_LXML_BACKFILL:
+        soup = make_soup(html)
+        total = extract_total_net_time(soup)
+        for row in _SEL_ROW.select(soup):
+            cols = _SEL_COL.select(row)
+            if len(cols) >= 4 and "도착" in _tag_text(cols[0]):
+                return total, first_time(_tag_text(cols[1]))
+        return total, ""
+
+    tree = make_tree(html)  # 스레드별 공유 HTMLParser 사용
+    if tree is None:
+        return "", ""
+
+    total = ""
+    for stat in _XP_STAT(tree):
+        titles = _XP_STAT_TITLE(stat)
+        if titles and "대회기록" in _el_text(titles[0]):
+            values = _XP_STAT_VALUE(stat)
+            if values:
+                total = first_time(_el_text(values[0]))
+                if total:
+                    break
+
+    for row in _XP_ROW(tree):
+        cols = _XP_COL(row)
+        if len(cols) >= 4 and "도착" in _el_text(cols[0]):
+            return total, first_time(_el_text(cols[1]))
+
+    return total, ""
+
+
+register("myresult.co.kr", MyResultParser())
+
+
 # ============= 사용 예시 =============
 
 if __name__ == "__main__":
@@ -371,7 +503,7 @@ if __name__ == "__main__":
         </div>
     </div>
     """
-    soup = BeautifulSoup(html_total, "html.parser")
+    soup = make_soup(html_total)
     total = extract_total_net_time(soup)
     print(f"Total net time: {total}")
     
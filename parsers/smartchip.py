@@ -2,19 +2,64 @@
 """스마트칩 전용 파서"""
 
 import re
+import threading
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
 from html import unescape
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, Callable, List, Tuple
 
+import soupsieve as sv
 from bs4 import BeautifulSoup
 
-from parsers.base import BaseParser
+from parsers.base import BaseParser, register, make_soup, rows_within, join_url
 from config.constants import FULL_KM, HALF_KM
 from utils.network_utils import get_session, normalize_url
 from utils.distance_utils import extract_distance_from_text, snap_distance, km_from_label, category_from_km
 from utils.time_utils import first_time
 
 
+# ============= 모듈 수준 패턴 (행/페이지마다 재컴파일하지 않도록) =============
+
+_POINT_KM_RX = re.compile(r"\d+(?:\.\d+)?\s*(?:km|k)\b", re.I)   # v3 지점 라벨 ('43.0Km')
+_HEADING_KM_RX = re.compile(r"\b\d+(?:\.\d+)?\s*km\b")          # 상세 페이지 종목 텍스트 (소문자화 후)
+_DETAIL_LINK_RX = re.compile(r'(Expectedrecord_data\.asp\?[^"\'>\s]+)', re.I)
+_JS_REDIRECT_RX = re.compile(r'location\.href\s*=\s*["\']([^"\']+)["\']', re.I)
+_META_REFRESH_URL_RX = re.compile(r'url\s*=\s*([^;]+)', re.I)
+
+# 속성 부분일치가 필요한 셀렉터는 soupsieve로 미리 컴파일
+_SEL_A_CERT = sv.compile('a[href*="certificate"]')
+_SEL_IMG_LIVEPHOTO = sv.compile('img[src*="livephoto"]')
+_SEL_RALLY_IFRAME = sv.compile('iframe#main_frame[src*="rallyname="], iframe[src*="rallyname="]')
+_SEL_WRAPPER_IFRAME = sv.compile('iframe#myFrame[src*="main.html"]')
+_SEL_MAP_IFRAME = sv.compile('iframe#main_frame[src*="mapsub/nogpx_map_marathon"]')
+_SEL_META_REFRESH = sv.compile('meta[http-equiv="refresh" i]')
+
+# select("td,th") 대신 find_all에 넘길 셀 태그
+_CELL_TAGS = ["td", "th"]
+
+
+@lru_cache(maxsize=256)
+def _rallyname_from_src(src: str) -> str:
+    """iframe src의 rallyname 파라미터 (같은 대회 페이지는 src가 반복되므로 캐시)"""
+    query = urllib.parse.parse_qs(urllib.parse.urlsplit(src).query, keep_blank_values=True)
+    return (query.get("rallyname") or [""])[0]
+
+
+# v2 진행 중 페이지 테이블 헤더
+_V2_HEADERS = frozenset({"POINT", "TIME", "TIME OF DAY", "PACE"})
+
+
+def _table_result(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """_parse_table 반환 포맷"""
+    return {"splits": rows, "summary": {}, "assets": []}
+
+
+def _is_heading_or_green(tag) -> bool:
+    """select("h6.green, .green, h6")와 같은 조건 (h6 또는 green 클래스)"""
+    return tag.name == "h6" or "green" in (tag.get("class") or ())
+
+
 class SmartchipParser(BaseParser):
     """
     스마트칩 전용 파서
@@ -52,11 +97,11 @@ class SmartchipParser(BaseParser):
         if usedata and bib:
             soup, state = self._resolve_detail_soup(usedata, bib, host)
         else:
-            soup = self._make_soup(html)
+            soup = make_soup(html)
             state = "unknown"
         
         if not soup:
-            soup = self._make_soup(html)
+            soup = make_soup(html)
             state = "fallback"
         
         # 2) 테이블 파싱
@@ -82,83 +127,86 @@ class SmartchipParser(BaseParser):
     
     def _parse_table(self, soup: BeautifulSoup) -> Dict[str, Any]:
         """
-        테이블 파싱 (3가지 포맷 시도)
+        테이블 파싱 (3가지 포맷)
         우선순위: v1 → v2 → v3
+
+        - v1: result-table 한 개의 하위 행만 확인
+        - v2 헤더 탐색과 v3 행 추출은 문서 전체 행을 한 번만 순회하며 함께 처리
         """
         # v1: <table class="result-table">
-        result_v1 = self._parse_table_v1(soup)
-        if result_v1 and result_v1.get('splits'):
-            return result_v1
+        table = soup.find("table", class_="result-table")
+        if table:
+            rows = [r for r in map(self._row_v1, table.find_all("tr")[1:]) if r]  # 헤더 제외
+            if rows:
+                return _table_result(rows)
+        
+        # v2 헤더 테이블 + v3 행을 단일 패스로
+        v2_table, v2_header = None, None
+        v3_rows = []
+        for tr in rows_within(soup, "table"):
+            cells = tr.find_all(_CELL_TAGS)
+            
+            if v2_table is None:
+                upper_cols = [c.get_text(" ", strip=True).upper() for c in cells]
+                if _V2_HEADERS.issubset(upper_cols):
+                    v2_table, v2_header = tr.find_parent("table"), upper_cols
+            
+            row = self._row_v3([c for c in cells if c.name == "td" and "userinfo" in (c.get("class") or ())])
+            if row:
+                v3_rows.append(row)
         
         # v2: POINT | TIME | TIME OF DAY | PACE 헤더
-        result_v2 = self._parse_table_v2(soup)
-        if result_v2 and result_v2.get('splits'):
-            return result_v2
+        if v2_table is not None:
+            rows = self._rows_v2(v2_table, v2_header)
+            if rows:
+                return _table_result(rows)
         
         # v3: td.userinfo 반복
-        return self._parse_table_v3(soup) or result_v2 or result_v1 or {"splits": [], "summary": {}, "assets": []}
+        return _table_result(v3_rows)
     
-    def _parse_table_v1(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _row_v1(self, tr) -> Optional[Dict[str, Any]]:
         """
-        v1 테이블 파싱
+        v1 행 파싱
         <table class="result-table">
           <tr><td>POINT</td><td>TIME</td><td>PASS TIME</td><td>PACE</td></tr>
           <tr><td>5.0km</td><td>00:25:30</td><td>09:25:30</td><td>05:06</td></tr>
         </table>
         """
-        table = soup.select_one("table.result-table")
-        if not table:
-            return {"splits": [], "summary": {}, "assets": []}
-        
-        rows = []
-        for tr in table.select("tr")[1:]:  # 헤더 제외
-            tds = [td.get_text(" ", strip=True) for td in tr.find_all("td")]
-            if len(tds) < 4:
-                continue
-            
-            point, net, clk, pace = tds[0], tds[1], tds[2], tds[3]
-            point_km = km_from_label(point)
-            
-            rows.append({
-                "point_label": point,
-                "point_km": point_km,
-                "net_time": net,
-                "pass_clock": clk,
-                "pace": pace,
-            })
+        tds = [td.get_text(" ", strip=True) for td in tr.find_all("td")]
+        if len(tds) < 4:
+            return None
         
-        return {"splits": rows, "summary": {}, "assets": []}
+        point, net, clk, pace = tds[0], tds[1], tds[2], tds[3]
+        return {
+            "point_label": point,
+            "point_km": km_from_label(point),
+            "net_time": net,
+            "pass_clock": clk,
+            "pace": pace,
+        }
     
-    def _parse_table_v2(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _rows_v2(self, table, header: List[str]) -> List[Dict[str, Any]]:
         """
         v2 테이블 파싱 (진행 중 페이지)
         헤더: POINT | TIME | TIME OF DAY | PACE(min/km)
         """
-        table, header_idx = self._find_table_with_headers(
-            soup, 
-            ["POINT", "TIME", "TIME OF DAY", "PACE"]
-        )
-        
-        if not table:
-            return {"splits": [], "summary": {}, "assets": []}
-        
         # 컬럼 인덱스 매핑
         col_map = {
-            "POINT": self._get_col_index(header_idx, "POINT"),
-            "TIME": self._get_col_index(header_idx, "TIME"),
-            "TIME OF DAY": self._get_col_index(header_idx, "TIME OF DAY"),
-            "PACE": self._get_col_index(header_idx, "PACE"),
+            "POINT": self._get_col_index(header, "POINT"),
+            "TIME": self._get_col_index(header, "TIME"),
+            "TIME OF DAY": self._get_col_index(header, "TIME OF DAY"),
+            "PACE": self._get_col_index(header, "PACE"),
         }
         
         rows = []
         data_started = False
         
-        for tr in table.select("tr"):
-            cols = [c.get_text(" ", strip=True) for c in tr.select("td,th")]
+        for tr in table.find_all("tr"):
+            cols = [c.get_text(" ", strip=True) for c in tr.find_all(_CELL_TAGS)]
             
             # 헤더 행 스킵
             if not data_started:
-                if set([c.upper() for c in cols]) & {"POINT", "TIME", "TIME OF DAY", "PACE"}:
+                if set([c.upper() for c in cols]) & _V2_HEADERS:
                     data_started = True
                 continue
             
@@ -175,63 +223,56 @@ class SmartchipParser(BaseParser):
             if not point or not any([net, clk, pace]):
                 continue
             
-            point_km = km_from_label(point)
-            
             rows.append({
                 "point_label": point,
-                "point_km": point_km,
+                "point_km": km_from_label(point),
                 "net_time": net,
                 "pass_clock": clk,
                 "pace": pace,
             })
         
-        return {"splits": rows, "summary": {}, "assets": []}
+        return rows
     
-    def _parse_table_v3(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _row_v3(self, tds: List) -> Optional[Dict[str, Any]]:
         """
-        v3 테이블 파싱
+        v3 행 파싱
         td.userinfo가 4개 이상 반복되는 행
         첫 셀: '43.0Km' 같은 지점 라벨
         """
-        rows = []
+        if len(tds) < 4:
+            return None
         
-        for tr in soup.select("table tr"):
-            tds = tr.select("td.userinfo")
-            if len(tds) < 4:
-                continue
-            
-            point = tds[0].get_text(" ", strip=True)
-            net = tds[1].get_text(" ", strip=True)
-            clk = tds[2].get_text(" ", strip=True)
-            pace = tds[3].get_text(" ", strip=True)
-            
-            # 'Km' 패턴 확인
-            if not re.search(r"\d+(?:\.\d+)?\s*(?:km|k)\b", point, re.I):
-                continue
-            
-            point_km = km_from_label(point)
-            
-            rows.append({
-                "point_label": point,
-                "point_km": point_km,
-                "net_time": first_time(net) or net.strip(),
-                "pass_clock": first_time(clk) or clk.strip(),
-                "pace": pace.strip(),
-            })
+        point = tds[0].get_text(" ", strip=True)
+        
+        # 'Km' 패턴 확인
+        if not _POINT_KM_RX.search(point):
+            return None
+        
+        net = tds[1].get_text(" ", strip=True)
+        clk = tds[2].get_text(" ", strip=True)
+        pace = tds[3].get_text(" ", strip=True)
         
-        return {"splits": rows, "summary": {}, "assets": []}
+        return {
+            "point_label": point,
+            "point_km": km_from_label(point),
+            "net_time": first_time(net) or net.strip(),
+            "pass_clock": first_time(clk) or clk.strip(),
+            "pace": pace.strip(),
+        }
     
     def _extract_assets(self, soup: BeautifulSoup, host: str) -> List[Dict[str, Any]]:
         """라이브포토, 기록증 등 이미지 에셋 추출"""
         assets = []
+        seen_urls = set()  # 중복 확인 (assets 선형 탐색 대신)
         base_url = f"https://{host or 'smartchip.co.kr'}"
 
         # 1. 기록증 (<a> 태그)
-        for link in soup.select('a[href*="certificate"]'):
+        for link in _SEL_A_CERT.select(soup):
             href = link.get('href')
             if href:
-                cert_url = urllib.parse.urljoin(base_url, href)
-                if not any(a['url'] == cert_url for a in assets):
+                cert_url = join_url(base_url, href)
+                if cert_url not in seen_urls:
+                    seen_urls.add(cert_url)
                     assets.append({
                         "kind": "certificate",
                         "host": host,
@@ -239,11 +280,12 @@ class SmartchipParser(BaseParser):
                     })
 
         # 2. 라이브포토 (<img> 태그)
-        for img in soup.select('img[src*="livephoto"]'):
+        for img in _SEL_IMG_LIVEPHOTO.select(soup):
             src = img.get('src')
             if src:
-                img_url = urllib.parse.urljoin(base_url, src)
-                if not any(a['url'] == img_url for a in assets):
+                img_url = join_url(base_url, src)
+                if img_url not in seen_urls:
+                    seen_urls.add(img_url)
                     assets.append({
                         "kind": "livephoto",
                         "host": host,
@@ -277,11 +319,11 @@ class SmartchipParser(BaseParser):
         if race_total_km is None:
             race_label, race_total_km = self._extract_distance_from_iframe(soup)
         
-        # 3) 테이블 최대값
+        # 3) 테이블 최대값 (중간 리스트 없이 한 번의 순회로)
         if race_total_km is None and splits:
-            kms = [s.get("point_km") for s in splits if s.get("point_km") is not None]
-            if kms:
-                race_total_km = max(kms)
+            max_km = max((km for s in splits if (km := s.get("point_km")) is not None), default=None)
+            if max_km is not None:
+                race_total_km = max_km
                 race_label = race_label or f"{race_total_km:g}K"
         
         # 0 또는 1km 미만은 무시 (스타트 행만 있는 경우)
@@ -300,7 +342,7 @@ class SmartchipParser(BaseParser):
         soup: BeautifulSoup
     ) -> Tuple[Optional[str], Optional[float]]:
         """헤더 텍스트에서 거리 추출 (h6.green 등)"""
-        for el in soup.select("h6.green, .green, h6"):
+        for el in soup.find_all(_is_heading_or_green):
             txt = el.get_text(" ", strip=True).lower()
             label, km = extract_distance_from_text(txt)
             if km is not None:
@@ -312,15 +354,11 @@ class SmartchipParser(BaseParser):
         soup: BeautifulSoup
     ) -> Tuple[Optional[str], Optional[float]]:
         """iframe rallyname 파라미터에서 거리 추출"""
-        iframe = soup.select_one('iframe#main_frame[src*="rallyname="], iframe[src*="rallyname="]')
+        iframe = _SEL_RALLY_IFRAME.select_one(soup)
         if not iframe or not iframe.get("src"):
             return None, None
         
-        query = urllib.parse.parse_qs(
-            urllib.parse.urlsplit(iframe["src"]).query,
-            keep_blank_values=True
-        )
-        rallyname = (query.get("rallyname") or [""])[0]
+        rallyname = _rallyname_from_src(iframe["src"])
         
         label, km = extract_distance_from_text(rallyname)
         if km is not None:
@@ -348,26 +386,36 @@ class SmartchipParser(BaseParser):
         
         target_host = host or "smartchip.co.kr"
         
-        # 1) 진행 중 페이지 시도
-        soup1 = self._fetch_url_both_schemes(
-            f"/Expectedrecord_data.asp?usedata={usedata}&nameorbibno={bib}",
-            target_host, session,
-            timeout
-        )
-        if soup1 and self._has_split_table(soup1):
-            return soup1, "in_progress"
-        
-        # 2) 종료 페이지 시도
-        soup2 = self._fetch_url_both_schemes(
-            f"/return_data_livephoto.asp?usedata={usedata}&nameorbibno={bib}",
-            target_host, session,
-            timeout
+        # 진행 중 / 종료 페이지 × https/http (각 쌍은 https 우선)
+        in_progress = _scheme_urls(target_host, f"/Expectedrecord_data.asp?usedata={usedata}&nameorbibno={bib}")
+        finished = _scheme_urls(target_host, f"/return_data_livephoto.asp?usedata={usedata}&nameorbibno={bib}")
+        has_table = {}  # id(soup) → 스플릿 테이블 여부 (완료 때마다 다시 판정하지 않도록)
+        
+        def decide(results):
+            # 순차 시도(진행 중 https → http → 종료 https → http)와 같은 결론을 결과가 모이는 대로 판정
+            soups = []
+            for urls, state in ((in_progress, "in_progress"), (finished, "finished")):
+                soup = _first_accepted(results, urls)
+                if soup is _PENDING:
+                    return _PENDING
+                if soup is not None:
+                    key = id(soup)
+                    if key not in has_table:
+                        has_table[key] = self._has_split_table(soup)
+                    if has_table[key]:
+                        return soup, state
+                soups.append(soup)
+            
+            # 둘 다 테이블이 없으면 우선순위로 반환
+            soup = soups[0] or soups[1]
+            return soup, "in_progress_no_table" if soup else "unknown"
+        
+        # 대부분 https가 응답하므로 https 두 개를 먼저 투입
+        return _probe_urls(
+            session,
+            [in_progress[0], finished[0], in_progress[1], finished[1]],
+            timeout, decide
         )
-        if soup2 and self._has_split_table(soup2):
-            return soup2, "finished"
-        
-        # 둘 다 테이블이 없으면 우선순위로 반환
-        return (soup1 or soup2), "in_progress_no_table" if (soup1 or soup2) else "unknown"
     
     def _fetch_url_both_schemes(
         self, 
@@ -376,73 +424,47 @@ class SmartchipParser(BaseParser):
         session, 
         timeout: int = 10
     ) -> Optional[BeautifulSoup]:
-        """https/http 양쪽 시도"""
-        for scheme in ("https://", "http://"):
-            url = scheme + host + (url_path if url_path.startswith("/") else "/" + url_path)
-            try:
-                r = session.get(url, timeout=timeout, allow_redirects=True)
-                r.raise_for_status()
-                return BeautifulSoup(r.text, "html.parser")
-            except Exception:
-                continue
-        return None
+        """https/http 양쪽 시도 (https 우선, 실패 시 http 결과)"""
+        urls = _scheme_urls(host, url_path)
+        return _probe_urls(session, urls, timeout, lambda results: _first_accepted(results, urls))
     
     # ============= 유틸리티 =============
     
     def _has_split_table(self, soup: BeautifulSoup) -> bool:
         """스플릿 테이블이 있는지 확인"""
         # v1: result-table 클래스
-        if soup.select_one("table.result-table"):
-            return len(soup.select("table.result-table tr")) >= 2
+        if soup.find("table", class_="result-table"):
+            return len(rows_within(soup, "table", class_="result-table")) >= 2
         
-        # v2: POINT/TIME/TIME OF DAY/PACE 헤더
-        for tr in soup.select("table tr"):
-            headers = [h.get_text(" ", strip=True).upper() for h in tr.select("td,th")]
-            if {"POINT", "TIME", "TIME OF DAY", "PACE"}.issubset(set(headers)):
+        # v2(POINT/TIME/TIME OF DAY/PACE 헤더) 또는 v3(td.userinfo 반복) 행 → 한 번의 순회로 확인
+        for tr in rows_within(soup, "table"):
+            cells = tr.find_all(_CELL_TAGS)
+            if _V2_HEADERS.issubset([c.get_text(" ", strip=True).upper() for c in cells]):
+                return True
+            
+            tds = [c for c in cells if c.name == "td" and "userinfo" in (c.get("class") or ())]
+            if len(tds) >= 4 and _POINT_KM_RX.search(tds[0].get_text(" ", strip=True)):
                 return True
-        
-        # v3: td.userinfo 반복
-        for tr in soup.select("table tr"):
-            tds = tr.select("td.userinfo")
-            if len(tds) >= 4:
-                first = tds[0].get_text(" ", strip=True)
-                if re.search(r"\d+(?:\.\d+)?\s*(?:km|k)\b", first, re.I):
-                    return True
         
         return False
     
     def _is_wrapper_home(self, soup: BeautifulSoup) -> bool:
         """PWA 홈 래퍼 페이지인지 확인"""
-        return soup.select_one('iframe#myFrame[src*="main.html"]') is not None
+        return _SEL_WRAPPER_IFRAME.select_one(soup) is not None
     
     def _looks_detail_page(self, soup: BeautifulSoup) -> bool:
         """상세 페이지인지 확인"""
         # 지도 iframe 확인
-        if soup.select_one('iframe#main_frame[src*="mapsub/nogpx_map_marathon"]'):
+        if _SEL_MAP_IFRAME.select_one(soup):
             return True
         
         # 종목 텍스트 확인
-        for el in soup.select("h6.green, .green, h6"):
-            if re.search(r'\b\d+(?:\.\d+)?\s*km\b', el.get_text(" ", strip=True).lower()):
+        for el in soup.find_all(_is_heading_or_green):
+            if _HEADING_KM_RX.search(el.get_text(" ", strip=True).lower()):
                 return True
         
         return False
     
-    def _find_table_with_headers(
-        self, 
-        soup: BeautifulSoup, 
-        required_headers: List[str]
-    ) -> Tuple[Optional[BeautifulSoup], Optional[List[str]]]:
-        """특정 헤더를 가진 테이블 찾기"""
-        for tr in soup.select("table tr"):
-            cols = [c.get_text(" ", strip=True) for c in tr.select("td,th")]
-            upper_cols = [x.upper() for x in cols]
-            
-            if set(required_headers).issubset(set(upper_cols)):
-                return tr.find_parent("table"), upper_cols
-        
-        return None, None
-    
     def _get_col_index(self, header: List[str], name: str) -> Optional[int]:
         """헤더에서 컬럼 인덱스 찾기"""
         try:
@@ -490,17 +512,16 @@ def fetch_smartchip_page(
     
     # 1) usedata+bib 직접 접근
     if usedata and bib:
-        for scheme in ("https://", "http://"):
-            target = f"{scheme}smartchip.co.kr/Expectedrecord_data.asp?usedata={usedata}&nameorbibno={bib}"
-            try:
-                r = session.get(target, timeout=timeout, allow_redirects=True)
-                r.raise_for_status()
-                soup = BeautifulSoup(r.text, "html.parser")
-                
-                if parser._looks_detail_page(soup) and not parser._is_wrapper_home(soup):
-                    return soup
-            except Exception:
-                pass
+        urls = _scheme_urls("smartchip.co.kr", f"/Expectedrecord_data.asp?usedata={usedata}&nameorbibno={bib}")
+        soup = _probe_urls(
+            session, urls, timeout,
+            lambda results: _first_accepted(
+                results, urls,
+                lambda s: parser._looks_detail_page(s) and not parser._is_wrapper_home(s)
+            )
+        )
+        if soup:
+            return soup
     
     # 2) rallyinfo 직접 접근
     if rallyinfo and bib:
@@ -526,20 +547,13 @@ def _try_rally_info_url(
     if not all([yeargbn, rallyno, rallyname]):
         return None
     
-    for scheme in ("https://", "http://"):
-        map_url = (
-            f"{scheme}smartchip.co.kr/mapsub/nogpx_map_marathon.html"
-            f"?yeargbn={yeargbn}&rallyno={rallyno}"
-            f"&rallyname={urllib.parse.quote(rallyname)}&bib={bib}"
-        )
-        try:
-            r = session.get(map_url, timeout=timeout, allow_redirects=True)
-            r.raise_for_status()
-            return BeautifulSoup(r.text, "html.parser")
-        except Exception:
-            pass
-    
-    return None
+    urls = _scheme_urls(
+        "smartchip.co.kr",
+        f"/mapsub/nogpx_map_marathon.html"
+        f"?yeargbn={yeargbn}&rallyno={rallyno}"
+        f"&rallyname={urllib.parse.quote(rallyname)}&bib={bib}"
+    )
+    return _probe_urls(session, urls, timeout, lambda results: _first_accepted(results, urls))
 
 
 def _fetch_with_redirect_tracking(
@@ -558,7 +572,7 @@ def _fetch_with_redirect_tracking(
     base = r.url
     
     # 1) Expectedrecord_data 링크 찾기
-    m = re.search(r'(Expectedrecord_data\.asp\?[^"\'>\s]+)', html, re.I)
+    m = _DETAIL_LINK_RX.search(html)
     if m:
         target = urllib.parse.urljoin(base, unescape(m.group(1)))
         soup = _try_fetch_detail(session, target, timeout, parser)
@@ -566,7 +580,7 @@ def _fetch_with_redirect_tracking(
             return soup
     
     # 2) JS redirect
-    m2 = re.search(r'location\.href\s*=\s*["\']([^"\']+)["\']', html, re.I)
+    m2 = _JS_REDIRECT_RX.search(html)
     if m2:
         target = urllib.parse.urljoin(base, unescape(m2.group(1)))
         soup = _try_fetch_detail(session, normalize_url(target), timeout, parser)
@@ -574,19 +588,125 @@ def _fetch_with_redirect_tracking(
             return soup
     
     # 3) 메타 리프레시
-    soup = BeautifulSoup(html, "html.parser")
-    meta = soup.select_one('meta[http-equiv="refresh" i]')
+    soup = make_soup(html)
+    meta = _SEL_META_REFRESH.select_one(soup)
     if meta and meta.get("content"):
-        mm = re.search(r'url\s*=\s*([^;]+)', meta["content"], re.I)
+        mm = _META_REFRESH_URL_RX.search(meta["content"])
         if mm:
             target = urllib.parse.urljoin(base, mm.group(1).strip(' "\''))
             r2 = session.get(normalize_url(target), timeout=timeout, allow_redirects=True)
             r2.raise_for_status()
-            return BeautifulSoup(r2.text, "html.parser")
+            return make_soup(r2.text)
     
     return soup
 
 
+# ============= 병렬 프로브 (happy eyeballs) =============
+# https/http × 엔드포인트 후보를 순차로 시도하면 느린/죽은 쪽의 timeout이 그대로 누적됨
+# → 우선순위 순서로 PROBE_HEAD_START초씩 시차를 두고 동시에 요청하고, 결론이 나는 즉시 반환
+#   (앞 요청이 빨리 응답하면 뒤 요청은 아예 보내지 않음)
+
+PROBE_HEAD_START = 0.25  # 다음 후보 투입까지 앞 후보에게 주는 선행 시간 (초)
+PROBE_MAX_WORKERS = 16   # 프로세스 전체 프로브 동시 요청 상한 (조회마다 풀을 만들지 않음)
+
+_PENDING = object()  # 아직 응답이 없는 후보 (decide 판정 보류)
+
+_PROBE_POOL = ThreadPoolExecutor(max_workers=PROBE_MAX_WORKERS, thread_name_prefix="smartchip-probe")
+
+# 프로브 요청마다 호출할 호스트 요청률 제한 (host → 토큰을 얻을 때까지 대기)
+_probe_rate_limiter: Optional[Callable[[str], Any]] = None
+
+
+def set_probe_rate_limiter(acquire: Optional[Callable[[str], Any]]):
+    """
+    프로브 요청도 호스트 요청률 제한을 받도록 등록 (예: AdaptiveScheduler.acquire_host)
+
+    None이면 해제. 파싱을 별도 프로세스에서 하면 그 프로세스에는 등록되지 않음
+    """
+    global _probe_rate_limiter
+    _probe_rate_limiter = acquire
+
+
+def _scheme_urls(host: str, url_path: str) -> Tuple[str, str]:
+    """(https URL, http URL)"""
+    path = url_path if url_path.startswith("/") else "/" + url_path
+    return ("https://" + host + path, "http://" + host + path)
+
+
+def _fetch_soup(session, url: str, timeout: int) -> Optional[BeautifulSoup]:
+    """GET → soup (실패하면 None)"""
+    try:
+        r = session.get(url, timeout=timeout, allow_redirects=True)
+        r.raise_for_status()
+        return make_soup(r.text)
+    except Exception:
+        return None
+
+
+def _probe_one(session, url: str, timeout: int, settled: threading.Event) -> Optional[BeautifulSoup]:
+    """프로브 1건 (결론이 이미 났으면 요청하지 않음)"""
+    if settled.is_set():
+        return None
+    acquire = _probe_rate_limiter
+    if acquire is not None:
+        acquire((urllib.parse.urlsplit(url).hostname or "").lower())
+        if settled.is_set():  # 토큰 대기 중에 결론이 났으면 요청 생략
+            return None
+    return _fetch_soup(session, url, timeout)
+
+
+def _first_accepted(results: Dict[str, Optional[BeautifulSoup]], urls, accept=None):
+    """
+    urls 우선순위에서 처음으로 받아들일 수 있는 soup
+
+    Returns:
+        soup / None(전부 실패·불합격) / _PENDING(앞 순위 응답이 아직 없음)
+    """
+    for url in urls:
+        if url not in results:
+            return _PENDING
+        soup = results[url]
+        if soup is not None and (accept is None or accept(soup)):
+            return soup
+    return None
+
+
+def _probe_urls(session, urls, timeout: int, decide, head_start: Optional[float] = None):
+    """
+    urls를 시차를 두고 동시에 요청
+
+    - urls 순서대로 head_start초 간격으로 투입 (진행 중 요청이 끝나면 바로 다음 투입)
+    - 응답이 올 때마다 decide(results)로 판정 → _PENDING이 아니면 바로 반환
+      results: {url: soup 또는 None(실패)}, 아직 없는 키는 진행 중/미투입
+    - 결론이 난 뒤 남은 요청은 기다리지 않음 (공용 풀에서 아직 시작하지 않은 프로브는 취소/생략)
+    """
+    if head_start is None:
+        head_start = PROBE_HEAD_START
+    results: Dict[str, Optional[BeautifulSoup]] = {}
+    remaining = list(urls)
+    pending = {}
+    settled = threading.Event()
+    
+    try:
+        while True:
+            if remaining:
+                url = remaining.pop(0)
+                pending[_PROBE_POOL.submit(_probe_one, session, url, timeout, settled)] = url
+            
+            done, _ = wait(pending, timeout=head_start if remaining else None, return_when=FIRST_COMPLETED)
+            for fut in done:
+                results[pending.pop(fut)] = fut.result()  # _fetch_soup은 예외 대신 None 반환
+            
+            if done or not remaining:
+                out = decide(results)
+                if out is not _PENDING:
+                    return out
+    finally:
+        settled.set()
+        for fut in pending:
+            fut.cancel()
+
+
 def _try_fetch_detail(
     session, 
     url: str, 
@@ -597,11 +717,14 @@ def _try_fetch_detail(
     try:
         r = session.get(url, timeout=timeout, allow_redirects=True)
         r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
+        soup = make_soup(r.text)
         
         if parser._looks_detail_page(soup) and not parser._is_wrapper_home(soup):
             return soup
     except Exception:
         pass
     
-    return None
\ No newline at end of file
+    return None
+
+
+register("smartchip.co.kr", SmartchipParser())
@@ -2,11 +2,12 @@
 """SPCT 전용 파서"""
 
 import re
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
+import soupsieve as sv
 from bs4 import BeautifulSoup
 
-from parsers.base import BaseParser
+from parsers.base import BaseParser, register, make_soup, rows_within
 from config.constants import FULL_KM, HALF_KM
 from utils.time_utils import first_time
 from utils.distance_utils import (
@@ -17,6 +18,41 @@ from utils.distance_utils import (
 )
 
 
+# 구간 값 "09:27:56.78 (00:26:16.51)" 분해용 (행마다 재컴파일하지 않도록 모듈 수준)
+_PAREN_RX = re.compile(r"\(([^)]*)\)")        # 괄호 안 = 구간기록
+_STRIP_PAREN_RX = re.compile(r"\([^)]*\)")    # 괄호 제거 → 통과시각
+
+# 정형 값 "시각 (구간기록)" 전체를 한 번에 분해 (각 시간은 first_time과 같은 형식)
+_TIME_PART = r"\d{1,2}:\d{2}(?::\d{2}(?:\.\d{1,3})?)?"
+_SPLIT_VALUE_RX = re.compile(rf"\s*({_TIME_PART})\s*\(\s*({_TIME_PART})\s*\)\s*")
+
+
+def _split_times(value: str) -> Tuple[str, str]:
+    """
+    구간 값 → (통과시각, 구간기록)
+
+    - 정형 값: 정규식 한 번으로 (괄호 검색 + 괄호 제거 문자열 생성 생략)
+    - 괄호 없음: 통과시각만
+    - 그 외: 괄호 안 첫 시간 = 구간기록, 괄호를 지운 나머지의 첫 시간 = 통과시각
+    """
+    m = _SPLIT_VALUE_RX.fullmatch(value)
+    if m:
+        return m.group(1), m.group(2)
+    if "(" not in value:
+        return first_time(value), ""
+    
+    paren_match = _PAREN_RX.search(value)
+    net_time = first_time(paren_match.group(1)) if paren_match else ""
+    return first_time(_STRIP_PAREN_RX.sub(" ", value)), net_time
+
+
+# 요약/기록증 셀렉터 (soupsieve로 미리 컴파일)
+_SEL_TOTAL = sv.compile(".record .time")
+_SEL_RECORD_P = sv.compile(".record p")
+_SEL_CERT_IMG = sv.compile(".image-container img")
+_SEL_PHOTO_IMG = sv.compile('img[src*="/PhotoResultsJPG/images/"]')
+
+
 class SPCTParser(BaseParser):
     """
     SPCT (Seoul Photo & Chip Timing) 전용 파서
@@ -50,7 +86,7 @@ class SPCTParser(BaseParser):
                 'race_total_km': float    # 총 거리
             }
         """
-        soup = self._make_soup(html)
+        soup = make_soup(html)
         host = context.get('host')
         
         # 1. 요약 정보 추출 (총기록, Start/Finish 시각)
@@ -88,14 +124,14 @@ class SPCTParser(BaseParser):
         summary = {}
         
         # 총기록 (예: 03:53:41.25)
-        time_elem = soup.select_one(".record .time")
+        time_elem = _SEL_TOTAL.select_one(soup)
         if time_elem:
             total = time_elem.get_text(strip=True)
             if total:
                 summary["total_net"] = total
         
         # Start/Finish 시각
-        for p in soup.select(".record p"):
+        for p in _SEL_RECORD_P.select(soup):
             text = p.get_text(" ", strip=True)
             
             if "Start Time" in text:
@@ -127,7 +163,7 @@ class SPCTParser(BaseParser):
         """
         splits = []
         
-        for tr in soup.select("table tbody tr"):
+        for tr in rows_within(soup, "tbody"):
             tds = tr.find_all("td")
             if len(tds) < 2:
                 continue
@@ -135,15 +171,7 @@ class SPCTParser(BaseParser):
             label = tds[0].get_text(" ", strip=True)  # "Section 1"
             value = tds[1].get_text(" ", strip=True)  # "09:27:56.78 (00:26:16.51)"
             
-            # 괄호 안 = 구간기록
-            net_time = ""
-            paren_match = re.search(r"\(([^)]*)\)", value)
-            if paren_match:
-                net_time = first_time(paren_match.group(1))
-            
-            # 괄호 밖 = 통과시각
-            value_no_paren = re.sub(r"\([^)]*\)", " ", value)
-            pass_clock = first_time(value_no_paren)
+            pass_clock, net_time = _split_times(value)
             
             # 유효한 시간이 하나라도 있으면 추가
             if net_time or pass_clock:
@@ -204,8 +232,8 @@ class SPCTParser(BaseParser):
         
         # .image-container img 또는 /PhotoResultsJPG/images/ 경로
         img = (
-            soup.select_one(".image-container img") or
-            soup.select_one('img[src*="/PhotoResultsJPG/images/"]')
+            _SEL_CERT_IMG.select_one(soup) or
+            _SEL_PHOTO_IMG.select_one(soup)
         )
         
         if img and img.get("src"):
@@ -268,7 +296,7 @@ def extract_event_no(usedata: str) -> str:
     return ev
 
 
-def generate_bib_variants(bib: str) -> List[str]:
+def generate_bib_variants(bib: str) -> Tuple[str, ...]:
     """
     SPCT 서버가 요구할 수 있는 bib 포맷들을 생성
     
@@ -279,45 +307,28 @@ def generate_bib_variants(bib: str) -> List[str]:
     4. 6자리 제로패딩 (0 제거 기준)
     
     예시:
-    - "123" → ["123", "123", "000123", "000123"]
-    - "001234" → ["001234", "1234", "001234", "001234"]
-    - "ABC123" → ["ABC123"]  (숫자 아니면 원본만)
+    - "123" → ("123", "000123")
+    - "001234" → ("001234", "1234")
+    - "ABC123" → ("ABC123",)  (숫자 아니면 원본만)
     
     Args:
         bib: 참가번호
     
     Returns:
-        가능한 포맷 리스트 (중복 제거됨)
+        가능한 포맷 tuple (중복 제거, 순서 유지)
     """
-    if not bib:
-        return []
-    
-    b = bib.strip()
-    variants = []
+    b = bib.strip() if bib else ""
+    if not b:
+        return ()
     
-    # 1. 원본 그대로
-    variants.append(b)
+    # 숫자 전용이 아니면 원본만 (isdecimal: 0-9 계열만, 위첨자 등 제외)
+    if not b.isdecimal():
+        return (b,)
     
-    # 숫자 전용일 때만 변형 시도
-    if b.isdigit():
-        # 2. 좌측 0 제거
-        b_no_zero = b.lstrip("0") or "0"
-        variants.append(b_no_zero)
-        
-        # 3. 6자리 제로패딩 (원본 기준)
-        b_padded_raw = b if len(b) >= 6 else b.zfill(6)
-        variants.append(b_padded_raw)
-        
-        # 4. 6자리 제로패딩 (0 제거 기준)
-        b_padded_trim = b_no_zero if len(b_no_zero) >= 6 else b_no_zero.zfill(6)
-        variants.append(b_padded_trim)
-    
-    # 중복 제거 (순서 유지)
-    seen = set()
-    unique_variants = []
-    for variant in variants:
-        if variant and variant not in seen:
-            seen.add(variant)
-            unique_variants.append(variant)
-    
-    return unique_variants
\ No newline at end of file
+    # 원본 / 좌측 0 제거 / 6자리 제로패딩(원본 기준) / 6자리 제로패딩(0 제거 기준)
+    # (zfill은 6자리 이상이면 그대로 반환)
+    b_no_zero = b.lstrip("0") or "0"
+    return tuple(dict.fromkeys((b, b_no_zero, b.zfill(6), b_no_zero.zfill(6))))
+
+
+register("spct.co.kr", SPCTParser())  # time.spct.co.kr 등 하위 도메인 포함
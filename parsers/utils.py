@@ -1,74 +1,22 @@
 # parsers/utils.py
 """파서 공통 유틸리티 (라우팅, 폴백, 팩토리)"""
 
-from typing import Dict, Any, Optional
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
 
 from bs4 import BeautifulSoup
 
-from parsers.smartchip import SmartchipParser
-from parsers.spct import SPCTParser
-from parsers.myresult import MyResultParser
+# 파서 모듈 import 시 각 파서가 레지스트리에 등록됨
+import parsers.smartchip  # noqa: F401
+import parsers.spct  # noqa: F401
+import parsers.myresult  # noqa: F401
+from parsers.base import get_parser, registered_hosts
 from utils.distance_utils import km_from_label
 from utils.time_utils import all_times
 
 
-# ============= 파서 매핑 =============
-
-PARSER_MAP = {
-    "smartchip.co.kr": "smartchip",
-    "spct.co.kr": "spct",
-    "time.spct.co.kr": "spct",
-    "myresult.co.kr": "myresult",
-    "www.myresult.co.kr": "myresult",
-}
-
-# 파서 인스턴스 캐시 (싱글톤)
-_PARSER_CACHE = {}
-
-
-# ============= 파서 팩토리 =============
-
-def get_parser(host: str):
-    """
-    호스트에 맞는 파서 인스턴스 반환 (캐싱)
-    
-    Args:
-        host: 호스트명 (예: smartchip.co.kr)
-    
-    Returns:
-        파서 인스턴스 또는 None
-    """
-    if not host:
-        return None
-    
-    host_lower = host.lower()
-    
-    # 정확한 매칭
-    if host_lower in PARSER_MAP:
-        parser_type = PARSER_MAP[host_lower]
-    else:
-        # 부분 매칭 (하위 도메인 지원)
-        parser_type = None
-        for domain, ptype in PARSER_MAP.items():
-            if domain in host_lower:
-                parser_type = ptype
-                break
-    
-    if not parser_type:
-        return None
-    
-    # 캐시에서 가져오거나 생성
-    if parser_type not in _PARSER_CACHE:
-        if parser_type == "smartchip":
-            _PARSER_CACHE[parser_type] = SmartchipParser()
-        elif parser_type == "spct":
-            _PARSER_CACHE[parser_type] = SPCTParser()
-        elif parser_type == "myresult":
-            _PARSER_CACHE[parser_type] = MyResultParser()
-    
-    return _PARSER_CACHE.get(parser_type)
-
-
 # ============= 메인 파서 함수 =============
 
 def parse(
@@ -131,6 +79,109 @@ def parse(
     return parse_generic_table(html)
 
 
+# ============= 파싱 메모 =============
+# 폴링 간 HTML이 그대로인 참가자(완주자 등)는 재파싱 없이 이전 결과 재사용
+# 키: (host, usedata, bib, blake2b(html)) - 충돌 내성이 필요 없으므로 sha256 대신 blake2b
+
+PARSE_MEMO_SIZE = 50000
+
+# 파싱 중 추가 네트워크 요청을 하는 파서 → 결과가 HTML만으로 결정되지 않으므로 제외
+_MEMO_EXCLUDED_HOSTS = ("smartchip.co.kr",)
+
+# 메모에는 splits를 행(dict) 대신 필드별 열(tuple)로 보관 (참가자 × 스플릿 수만큼 dict가 쌓이지 않도록)
+SPLIT_FIELDS = ("point_label", "point_km", "net_time", "pass_clock", "pace")
+
+_PARSE_MEMO: "OrderedDict[tuple, Tuple[Dict[str, Any], Optional[tuple]]]" = OrderedDict()
+_PARSE_MEMO_LOCK = threading.Lock()
+
+
+def parse_cached(
+    html: str,
+    host: Optional[str] = None,
+    url: Optional[str] = None,
+    usedata: Optional[str] = None,
+    bib: Optional[str] = None,
+    parse_fn=None
+) -> Dict[str, Any]:
+    """
+    parse()의 메모이즈 버전 (LRU)
+
+    - 같은 참가자의 HTML이 바뀌지 않았으면 캐시된 결과의 복사본 반환
+    - 호출 측에서 결과를 수정해도 캐시가 오염되지 않도록 splits/assets는 복사
+    - parse_fn: 캐시 미스 시 parse 대신 호출할 함수 (예: 프로세스 풀 위임)
+    """
+    host_lower = (host or "").lower()
+    if not html or any(h in host_lower for h in _MEMO_EXCLUDED_HOSTS):
+        return parse(html, host=host, url=url, usedata=usedata, bib=bib)
+
+    raw = html.encode("utf-8", "surrogatepass") if isinstance(html, str) else html
+    key = (host_lower, usedata, bib, hashlib.blake2b(raw, digest_size=8).digest())
+
+    with _PARSE_MEMO_LOCK:
+        hit = _PARSE_MEMO.get(key)
+        if hit is not None:
+            _PARSE_MEMO.move_to_end(key)
+    if hit is not None:
+        return _unpack_result(hit)
+
+    result = (parse_fn or parse)(html, host=host, url=url, usedata=usedata, bib=bib)
+    if isinstance(result, dict):
+        packed = _pack_result(result)
+        with _PARSE_MEMO_LOCK:
+            _PARSE_MEMO[key] = packed
+            if len(_PARSE_MEMO) > PARSE_MEMO_SIZE:
+                _PARSE_MEMO.popitem(last=False)
+    return result
+
+
+def clear_parse_memo():
+    """파싱 메모 비우기"""
+    with _PARSE_MEMO_LOCK:
+        _PARSE_MEMO.clear()
+
+
+def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """결과 복사 (splits/assets 항목 dict까지)"""
+    out = dict(result)
+    for k in ("splits", "assets"):
+        v = out.get(k)
+        if isinstance(v, list):
+            out[k] = [dict(x) if isinstance(x, dict) else x for x in v]
+    return out
+
+
+def _pack_result(result: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[tuple]]:
+    """
+    메모 저장용으로 결과 압축
+
+    Returns:
+        (splits를 뺀 결과 복사본, 필드별 열 튜플)
+        표준 필드만 가진 스플릿이 아니면 열 대신 기존처럼 dict 리스트 복사본을 보관하고 None
+    """
+    splits = result.get("splits")
+    if (
+        isinstance(splits, list) and splits
+        and all(type(s) is dict and tuple(s) == SPLIT_FIELDS for s in splits)
+    ):
+        out = dict(result)
+        out["splits"] = None
+        assets = out.get("assets")
+        if isinstance(assets, list):
+            out["assets"] = [dict(x) if isinstance(x, dict) else x for x in assets]
+        columns = tuple(tuple(s[f] for s in splits) for f in SPLIT_FIELDS)
+        return (out, columns)
+    return (_copy_result(result), None)
+
+
+def _unpack_result(entry: Tuple[Dict[str, Any], Optional[tuple]]) -> Dict[str, Any]:
+    """_pack_result의 역변환 (호출 측이 수정해도 되는 새 dict 반환)"""
+    out, columns = entry
+    out = _copy_result(out)
+    if columns is not None:
+        out["splits"] = [dict(zip(SPLIT_FIELDS, row)) for row in zip(*columns)]
+    return out
+
+
 # ============= 범용 파서 =============
 
 def parse_generic_table(html: str) -> Dict[str, Any]:
@@ -214,8 +265,8 @@ def can_parse(host: str) -> bool:
 
 
 def list_supported_hosts() -> list[str]:
-    """지원하는 호스트 목록"""
-    return list(PARSER_MAP.keys())
+    """지원하는 호스트 목록 (하위 도메인 포함)"""
+    return registered_hosts()
 
 
 # ============= 사용 예시 =============
@@ -0,0 +1,165 @@
+import threading
+import unittest
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+
+from crawler import fetcher
+from utils.network_utils import _create_session
+
+
+def _http_error(status: int) -> requests.HTTPError:
+    resp = requests.Response()
+    resp.status_code = status
+    return requests.HTTPError(f"{status} Server Error", response=resp)
+
+
+class FetchWithRetryTest(unittest.TestCase):
+    def setUp(self):
+        fetcher._CACHE.clear()
+        fetcher._NEG_CACHE.clear()
+        patcher = mock.patch.object(fetcher.time, "sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_transient_failure_then_success_returns_html(self):
+        calls = []
+
+        def fake_fetch(url, timeout=10, verify=None, session=None):
+            calls.append(url)
+            if len(calls) == 1:
+                raise requests.ConnectionError("connection reset")
+            return "<html>ok</html>"
+
+        with mock.patch.object(fetcher, "fetch", side_effect=fake_fetch):
+            html = fetcher.fetch_with_retry("http://example.test/a")
+
+        self.assertEqual(html, "<html>ok</html>")
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(self.sleep.call_count, 1)
+
+    def test_retry_bypasses_negative_cache(self):
+        # 직전 실패가 실패 캐시에 남아 있어도 재시도는 실제 요청을 보내야 함
+        url = "http://example.test/b"
+        with mock.patch.object(fetcher, "fetch", side_effect=_http_error(503)):
+            with self.assertRaises(requests.HTTPError):
+                fetcher.fetch_cached(url)
+
+        with mock.patch.object(fetcher, "fetch", return_value="<html>ok</html>") as fake:
+            html = fetcher.fetch_with_retry(url)
+
+        self.assertEqual(html, "<html>ok</html>")
+        self.assertEqual(fake.call_count, 1)
+        self.assertIsNone(fetcher._NEG_CACHE.get((url, 10, None), fetcher.time.monotonic()))
+
+    def test_non_transient_error_is_not_retried(self):
+        with mock.patch.object(fetcher, "fetch", side_effect=_http_error(404)) as fake:
+            with self.assertRaises(requests.HTTPError):
+                fetcher.fetch_with_retry("http://example.test/c")
+
+        self.assertEqual(fake.call_count, 1)
+        self.sleep.assert_not_called()
+
+    def test_negative_cache_raises_fresh_exception(self):
+        url = "http://example.test/d"
+        with mock.patch.object(fetcher, "fetch", side_effect=_http_error(503)) as fake:
+            errors = []
+            for _ in range(2):
+                try:
+                    fetcher.fetch_cached(url)
+                except requests.HTTPError as e:
+                    errors.append(e)
+
+        self.assertEqual(fake.call_count, 1)
+        self.assertIsNot(errors[0], errors[1])
+        self.assertEqual(errors[1].response.status_code, 503)
+
+    def test_on_fetch_reports_network_requests_only(self):
+        url = "http://example.test/e"
+        reports = []
+        with mock.patch.object(fetcher, "fetch", return_value="<html>ok</html>") as fake:
+            fetcher.fetch_with_retry(url, on_fetch=lambda latency, error: reports.append(error))
+            # 두 번째 호출은 캐시 적중 → 요청률 조절에 기록되지 않아야 함
+            fetcher.fetch_with_retry(url, on_fetch=lambda latency, error: reports.append(error))
+
+        self.assertEqual(fake.call_count, 1)
+        self.assertEqual(reports, [None])
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    """server.statuses 순서대로 응답 (마지막 값 반복), 요청 수는 server.hits"""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits += 1
+            status = server.statuses[min(server.hits, len(server.statuses)) - 1]
+        body = b"<html>ok</html>" if status == 200 else b"busy"
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FetchWithRetryServerTest(unittest.TestCase):
+    """실제 HTTPAdapter(크롤링 세션 설정) + 로컬 서버로 요청 수 확인"""
+
+    def setUp(self):
+        fetcher._CACHE.clear()
+        fetcher._NEG_CACHE.clear()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StatusHandler)
+        self.server.lock = threading.Lock()
+        self.server.hits = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.session = _create_session()
+        self.addCleanup(self.session.close)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/r"
+
+        self.in_guard = False
+        self.guard_entries = 0
+        self.slept_in_guard = False
+
+        def fake_sleep(_sec):
+            self.slept_in_guard |= self.in_guard
+
+        patcher = mock.patch.object(fetcher.time, "sleep", side_effect=fake_sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @contextmanager
+    def guard(self):
+        self.guard_entries += 1
+        self.in_guard = True
+        try:
+            yield
+        finally:
+            self.in_guard = False
+
+    def test_persistent_503_sends_one_request_per_attempt(self):
+        self.server.statuses = [503]
+        with self.assertRaises(requests.HTTPError):
+            fetcher.fetch_with_retry(self.url, session=self.session, guard=self.guard)
+
+        self.assertEqual(self.server.hits, fetcher.RETRY_ATTEMPTS)
+        self.assertEqual(self.guard_entries, fetcher.RETRY_ATTEMPTS)
+        self.assertFalse(self.slept_in_guard)
+
+    def test_503_then_success(self):
+        self.server.statuses = [503, 200]
+        html = fetcher.fetch_with_retry(self.url, session=self.session, guard=self.guard)
+
+        self.assertEqual(html, "<html>ok</html>")
+        self.assertEqual(self.server.hits, 2)
+        self.assertEqual(self.guard_entries, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import itertools
+import threading
+import time
+import unittest
+from unittest import mock
+
+from parsers import smartchip
+from parsers.smartchip import SmartchipParser
+
+TABLE_HTML = (
+    "<table class='result-table'><tr><td>h</td></tr>"
+    "<tr><td>5km</td><td>1</td><td>2</td><td>3</td></tr></table>"
+)
+PLAIN_HTML = "<p>x</p>"
+
+# 순차 코드의 시도 순서: 진행 중 https → http → 종료 https → http
+ENDPOINTS = [(True, True), (True, False), (False, True), (False, False)]
+
+# 응답 지연 프로필 (ENDPOINTS 순서, 초)
+LATENCY_PROFILES = {
+    "same": (0.0, 0.0, 0.0, 0.0),
+    "https_slow": (0.03, 0.0, 0.03, 0.0),
+    "reverse_priority": (0.04, 0.03, 0.02, 0.01),
+}
+
+
+class _FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.encoding = "utf-8"
+
+    def raise_for_status(self):
+        pass
+
+
+class _FakeSession:
+    """(진행 중 여부, https 여부) → (결과 종류, 지연) 대로 응답하는 세션"""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=None, allow_redirects=True):
+        with self._lock:
+            self.calls.append(url)
+        kind, delay = self.spec[("Expectedrecord" in url, url.startswith("https://"))]
+        time.sleep(delay)
+        if kind == "fail":
+            raise IOError("unreachable")
+        return _FakeResponse(TABLE_HTML if kind == "table" else PLAIN_HTML)
+
+
+def _serial_result(kinds):
+    """변경 전 순차 코드의 결론 (결과 종류, state)"""
+    def first_ok(in_progress):
+        for https in (True, False):
+            kind = kinds[(in_progress, https)]
+            if kind != "fail":
+                return kind
+        return None
+
+    in_progress = first_ok(True)
+    if in_progress == "table":
+        return "table", "in_progress"
+    finished = first_ok(False)
+    if finished == "table":
+        return "table", "finished"
+    kind = in_progress or finished
+    return kind, "in_progress_no_table" if kind else "unknown"
+
+
+class ResolveDetailSoupTest(unittest.TestCase):
+    def setUp(self):
+        self.parser = SmartchipParser()
+        for target, value in (("PROBE_HEAD_START", 0.01), ("_probe_rate_limiter", None)):
+            patcher = mock.patch.object(smartchip, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _resolve(self, session):
+        with mock.patch.object(smartchip, "get_session", return_value=session):
+            soup, state = self.parser._resolve_detail_soup("202550000158", "10396", "smartchip.co.kr")
+        if soup is None:
+            return None, state
+        return ("table" if self.parser._has_split_table(soup) else "plain"), state
+
+    def test_matches_serial_order_for_all_outcomes(self):
+        # 4개 엔드포인트 × (테이블/테이블 없음/실패) = 81가지 × 지연 프로필
+        for profile, latencies in LATENCY_PROFILES.items():
+            for combo in itertools.product(("table", "plain", "fail"), repeat=4):
+                kinds = dict(zip(ENDPOINTS, combo))
+                spec = {ep: (kinds[ep], delay) for ep, delay in zip(ENDPOINTS, latencies)}
+                with self.subTest(profile=profile, combo=combo):
+                    self.assertEqual(self._resolve(_FakeSession(spec)), _serial_result(kinds))
+
+    def test_fast_first_candidate_sends_single_request(self):
+        spec = {ep: ("table", 0.0) for ep in ENDPOINTS}
+        session = _FakeSession(spec)
+        with mock.patch.object(smartchip, "PROBE_HEAD_START", 0.5):
+            self.assertEqual(self._resolve(session), ("table", "in_progress"))
+        time.sleep(0.05)
+        self.assertEqual(len(session.calls), 1)
+
+    def test_slow_failures_overlap_instead_of_adding_up(self):
+        # 순차로는 0.3 + 0.3초, 동시에 보내면 ~0.3초
+        spec = {
+            (True, True): ("fail", 0.3),
+            (True, False): ("plain", 0.0),
+            (False, True): ("fail", 0.3),
+            (False, False): ("table", 0.0),
+        }
+        started = time.monotonic()
+        self.assertEqual(self._resolve(_FakeSession(spec)), ("table", "finished"))
+        self.assertLess(time.monotonic() - started, 0.5)
+
+    def test_each_probe_takes_a_host_token(self):
+        spec = {ep: ("fail", 0.0) for ep in ENDPOINTS}
+        session = _FakeSession(spec)
+        acquired = []
+        with mock.patch.object(smartchip, "_probe_rate_limiter", acquired.append):
+            self.assertEqual(self._resolve(session), (None, "unknown"))
+        self.assertEqual(len(session.calls), 4)
+        self.assertEqual(acquired, ["smartchip.co.kr"] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,17 @@
-from config.constants import STANDARD_DISTANCES, FULL_KM, HALF_KM, KM_RX,FINISH_KEYWORDS_EN, FINISH_KEYWORDS_KO
+from config.constants import nearest_standard_distance, FULL_KM, HALF_KM, KM_RX, FINISH_RX
 import re
+from functools import lru_cache
 
+# 스플릿 행마다 호출되는 경로 → 패턴은 모듈 로드 시 한 번만 컴파일
+_KM_LABEL_RX = re.compile(r"(\d+(?:\.\d+)?)\s*km", re.I)
+_NUMBER_ONLY_RX = re.compile(r"(\d+(?:\.\d+)?)")
+
+@lru_cache(maxsize=1024)
 def km_from_label(label: str) -> float | None:
     if not label:
         return None
     # e.g., "5km", "5.0km", "10.5 km"
-    m = re.search(r"(\d+(?:\.\d+)?)\s*km", label, re.I)
+    m = _KM_LABEL_RX.search(label)
     if m:
         try:
             return float(m.group(1))
@@ -13,7 +19,7 @@ def km_from_label(label: str) -> float | None:
             return None
     
     # 숫자만 있는 경우 (e.g., "42.195")
-    m = re.fullmatch(r"(\d+(?:\.\d+)?)", label.strip())
+    m = _NUMBER_ONLY_RX.fullmatch(label.strip())
     if m:
         try:
             return float(m.group(1))
@@ -26,9 +32,18 @@ def snap_distance(km: float|None) -> float|None:
     if not km or km <= 0:
         return None
     # 가까운 표준 거리로 스냅(±0.6km)
-    best = min(STANDARD_DISTANCES, key=lambda d: abs(d-km))
+    best = nearest_standard_distance(km)
     return best if abs(best-km) <= 0.6 else km
 
+_FULL_KW_RX = re.compile(r"\b(full|풀코스|풀)\b")
+_HALF_KW_RX = re.compile(r"\b(half|하프)\b")
+_KM_UNIT_RX = re.compile(r"(\d+(?:\.\d+)?)\s*(?:km|k)\b")
+
+# 헤더/rallyname처럼 짧은 텍스트는 참가자마다 반복되므로 캐시
+# (페이지 전체 텍스트는 참가자별로 달라 캐시해도 적중하지 않고 메모리만 차지 → 제외)
+DISTANCE_CACHE_MAX_CHARS = 256
+
+
 def extract_distance_from_text(text: str) -> tuple[str | None, float | None]:
     """
     텍스트 안에서 거리/키워드를 찾아서 (레이블, km) 반환.
@@ -37,15 +52,26 @@ def extract_distance_from_text(text: str) -> tuple[str | None, float | None]:
     - "109K" "5km" 등 숫자+단위 → 해당 수치
     """
     t = (text or "").strip().lower()
+    if len(t) <= DISTANCE_CACHE_MAX_CHARS:
+        return _distance_from_lowered_cached(t)
+    return _distance_from_lowered(t)
+
+
+@lru_cache(maxsize=512)
+def _distance_from_lowered_cached(t: str) -> tuple[str | None, float | None]:
+    return _distance_from_lowered(t)
+
 
-    # ① 키워드 우선
-    if re.search(r"\b(full|풀코스|풀)\b", t):
+def _distance_from_lowered(t: str) -> tuple[str | None, float | None]:
+    """extract_distance_from_text 본체 (t는 strip/lower 된 텍스트)"""
+    # ① 키워드 우선 (부분 문자열이 없으면 정규식 생략 - 페이지 전체 텍스트일 때 큰 차이)
+    if ("full" in t or "풀" in t) and _FULL_KW_RX.search(t):
         return ("Full", float(FULL_KM))
-    if re.search(r"\b(half|하프)\b", t):
+    if ("half" in t or "하프" in t) and _HALF_KW_RX.search(t):
         return ("Half", float(HALF_KM))
 
     # ② 숫자 + 단위(KM/K)
-    m = re.search(r"(\d+(?:\.\d+)?)\s*(?:km|k)\b", t)
+    m = _KM_UNIT_RX.search(t)
     if m:
         km = float(m.group(1))
         return (f"{km:g}K", km)
@@ -123,9 +149,7 @@ def _clean_text(s: str) -> str:
     return s
 
 def is_finish_label(label: str) -> bool:
-    raw = _clean_text(label)
-    low = raw.lower()
-    return any(k in raw for k in FINISH_KEYWORDS_KO) or any(k in low for k in FINISH_KEYWORDS_EN)
+    return bool(FINISH_RX.search(_clean_text(label)))
 
 def ensure_finish_label(splits, race_total_km=None):
     """마지막 스플릿이 완주로 간주되면 point_label을 Finish로 보강."""
@@ -4,9 +4,9 @@ from requests.exceptions import SSLError
 # from urllib3.exceptions import InsecureRequestWarning
 # import urllib3; urllib3.disable_warnings(InsecureRequestWarning)
 from urllib.parse import urlsplit
-from config.settings import BASE_DIR, CERT_DIR, VERIFY_SSL_DEFAULT, INSECURE_HOSTS
+from config.settings import BASE_DIR, CERT_DIR, VERIFY_SSL_DEFAULT, host_is_insecure
 from config.constants import DEFAULT_HEADERS
-from utils.network_utils import _SESSION
+from utils.network_utils import get_image_session
 
 def safe_filepart(s: str) -> str:
     # 파일명 안전화(한글은 그대로 두고, 위험 문자만 제거)
@@ -25,11 +25,10 @@ def guess_ext_from_headers(url: str, resp: requests.Response) -> str:
 def verify_for_host(host: str) -> bool:
     """
     호스트별 SSL 검증 여부 결정.
-    INSECURE_HOSTS에 있으면 False, 아니면 VERIFY_SSL_DEFAULT.
+    INSECURE_HOSTS(서브도메인 포함)에 있으면 False, 아니면 VERIFY_SSL_DEFAULT.
     """
     try:
-        h = (host or "").lower().strip()
-        return (h not in INSECURE_HOSTS) and bool(VERIFY_SSL_DEFAULT)
+        return bool(VERIFY_SSL_DEFAULT) and not host_is_insecure((host or "").strip())
     except Exception:
         return bool(VERIFY_SSL_DEFAULT)
 
@@ -47,7 +46,7 @@ def download_image_to(dest_path: str,
     - min_ok_size보다 작으면 실패로 간주
     """
     try:
-        sess = _SESSION or requests.Session()
+        sess = get_image_session()
         headers = dict(DEFAULT_HEADERS)
         if referer:
             headers["Referer"] = referer
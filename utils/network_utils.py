@@ -4,12 +4,18 @@
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
 import urllib.parse
 import random
+import socket
 import time
 import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
-from config.settings import VERIFY_SSL_DEFAULT, CRAWLER_MAX_WORKERS, INSECURE_HOSTS
+from config.settings import VERIFY_SSL_DEFAULT, CRAWLER_MAX_WORKERS, host_is_insecure
 from config.constants import DEFAULT_HEADERS
 
 
@@ -17,13 +23,20 @@ from config.constants import DEFAULT_HEADERS
 _SESSION = None
 _SESSION_LOCK = threading.Lock()
 
+# 기록증 이미지 다운로드 전용 세션 (크롤링 세션의 연결 풀을 점유하지 않도록 분리)
+_IMAGE_SESSION = None
+IMAGE_SESSION_POOL_SIZE = 3  # 이미지 워커 수와 맞춤
+
+# urllib3가 응답 상태로 재시도할 코드 (이미지 세션만 사용)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
 
 def get_session() -> requests.Session:
     """
     전역 requests.Session 반환 (싱글톤)
     
     - 연결 풀 재사용으로 성능 향상
-    - 자동 재시도 설정
+    - 연결 수립 실패만 자동 재시도 (429/5xx/타임아웃은 fetch_with_retry가 재시도)
     - 스레드 안전
     
     Returns:
@@ -38,23 +51,56 @@ def get_session() -> requests.Session:
     return _SESSION
 
 
-def _create_session() -> requests.Session:
-    """새로운 Session 객체 생성 (내부용)"""
+def get_image_session() -> requests.Session:
+    """
+    기록증 이미지 다운로드용 Session 반환 (싱글톤)
+
+    - 크롤링 세션과 연결 풀을 분리해서 이미지 다운로드가 크롤링을 막지 않게 함
+    - 풀 크기는 이미지 워커 수 수준으로 작게 유지
+    """
+    global _IMAGE_SESSION
+
+    with _SESSION_LOCK:
+        if _IMAGE_SESSION is None:
+            _IMAGE_SESSION = _create_session(
+                pool_connections=IMAGE_SESSION_POOL_SIZE,
+                pool_maxsize=IMAGE_SESSION_POOL_SIZE,
+                retry_statuses=RETRY_STATUSES,
+            )
+
+    return _IMAGE_SESSION
+
+
+def _create_session(
+    pool_connections: Optional[int] = None,
+    pool_maxsize: Optional[int] = None,
+    retry_statuses: Tuple[int, ...] = ()
+) -> requests.Session:
+    """
+    새로운 Session 객체 생성 (내부용)
+
+    retry_statuses가 비어 있으면 연결 수립 실패만 재시도 (요청이 서버에 닿지 않은 경우)
+    - 크롤링 세션의 429/5xx/읽기 타임아웃은 fetch_with_retry가 호스트 토큰을 얻어 가며 재시도
+      (여기서도 재시도하면 두 층이 곱해져 과부하 호스트에 요청이 몇 배로 늘어남)
+    """
     sess = requests.Session()
     
     # 재시도 전략
     retry = Retry(
-        total=2,
-        backoff_factor=0.2,
-        status_forcelist=(429, 500, 502, 503, 504),
+        total=3,
+        read=None if retry_statuses else 0,
+        backoff_factor=0.3,
+        status_forcelist=retry_statuses,
         allowed_methods=frozenset(["GET", "POST"])
     )
     
     # 연결 풀 설정 (동시성에 맞춰 조정)
-    pool_size = CRAWLER_MAX_WORKERS * 2
-    adapter = HTTPAdapter(
-        pool_connections=pool_size,
-        pool_maxsize=pool_size,
+    # - pool_connections: 호스트별 풀 개수 (대상 호스트 수보다 넉넉하게)
+    # - pool_maxsize: 호스트당 유지할 keep-alive 연결 수 (TLS 세션 재사용)
+    # - 호스트→IP 조회 캐시 (참가자마다 getaddrinfo 반복 방지, 이 세션의 연결에만 적용)
+    adapter = DNSCachingAdapter(
+        pool_connections=pool_connections or CRAWLER_MAX_WORKERS,
+        pool_maxsize=pool_maxsize or CRAWLER_MAX_WORKERS * 2,
         max_retries=retry
     )
     
@@ -69,11 +115,121 @@ def _create_session() -> requests.Session:
 
 def reset_session():
     """Session 초기화 (테스트용)"""
-    global _SESSION
+    global _SESSION, _IMAGE_SESSION
     with _SESSION_LOCK:
         if _SESSION:
             _SESSION.close()
             _SESSION = None
+        if _IMAGE_SESSION:
+            _IMAGE_SESSION.close()
+            _IMAGE_SESSION = None
+
+
+# ============= DNS 캐시 =============
+# 대회 하나의 URL은 대부분 같은 호스트 → 새 연결마다 DNS 조회할 필요 없음
+DNS_CACHE_TTL = 300  # 초
+
+_DNS_CACHE: Dict[Tuple[str, int], Tuple[List, float]] = {}
+_DNS_LOCK = threading.Lock()
+
+
+def resolve_host(host: str, port: int) -> List:
+    """
+    getaddrinfo 결과를 TTL 동안 캐시해서 반환
+
+    Args:
+        host: 호스트명
+        port: 접속할 포트 (URL의 실제 포트)
+
+    Returns:
+        socket.getaddrinfo() 결과 리스트
+
+    Raises:
+        OSError: 조회 실패 (실패는 캐시하지 않음)
+    """
+    key = (host, port)
+    now = time.monotonic()
+
+    hit = _DNS_CACHE.get(key)
+    if hit and now - hit[1] < DNS_CACHE_TTL:
+        return hit[0]
+
+    infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+    with _DNS_LOCK:
+        _DNS_CACHE[key] = (infos, now)
+    return infos
+
+
+def default_port(url: str) -> int:
+    """URL의 접속 포트 (명시되지 않았으면 스킴 기본 포트)"""
+    parts = urllib.parse.urlsplit(url)
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    return port or (443 if parts.scheme == "https" else 80)
+
+
+class _DNSCachedConnectionMixin:
+    """캐시된 IP로 접속 (SNI/인증서 검증/Host 헤더는 원래 호스트명 기준)"""
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            infos = resolve_host(host, self.port)
+        except OSError:
+            return super()._new_conn()  # 조회 실패는 캐시하지 않음 → 원래 경로의 예외 그대로
+
+        last_error = None
+        for _af, _socktype, _proto, _canon, sockaddr in infos:
+            self._dns_host = sockaddr[0]
+            try:
+                return super()._new_conn()
+            except (NewConnectionError, ConnectTimeoutError) as e:
+                last_error = e
+            finally:
+                self._dns_host = host
+
+        # 캐시된 주소가 모두 실패 → 항목만 지우고 실패 (다음 연결/재시도에서 새로 조회)
+        with _DNS_LOCK:
+            _DNS_CACHE.pop((host, self.port), None)
+        raise last_error
+
+
+class _DNSCachedHTTPConnection(_DNSCachedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _DNSCachedHTTPSConnection(_DNSCachedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _DNSCachedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _DNSCachedHTTPConnection
+
+
+class _DNSCachedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _DNSCachedHTTPSConnection
+
+
+class DNSCachingAdapter(HTTPAdapter):
+    """
+    이 어댑터를 마운트한 세션의 연결만 DNS 캐시 사용
+    (urllib3 전역 create_connection은 건드리지 않음 → 다른 라이브러리/세션에는 영향 없음)
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _DNSCachedHTTPConnectionPool,
+            "https": _DNSCachedHTTPSConnectionPool,
+        }
+
+
+def clear_dns_cache():
+    """DNS 캐시 비우기"""
+    with _DNS_LOCK:
+        _DNS_CACHE.clear()
 
 
 # ============= URL 유틸리티 =============
@@ -154,9 +310,10 @@ def abs_url(base_host: str, url: str) -> str:
 
 # ============= SSL 검증 =============
 
+@lru_cache(maxsize=256)
 def verify_for_host(host: str) -> bool:
     """
-    특정 호스트에 대한 SSL 검증 여부 결정
+    특정 호스트에 대한 SSL 검증 여부 결정 (설정은 시작 시 고정 → 호스트별 캐시)
     
     Args:
         host: 호스트명 (예: smartchip.co.kr)
@@ -164,8 +321,7 @@ def verify_for_host(host: str) -> bool:
     Returns:
         True면 검증, False면 무시
     """
-    host = (host or "").lower()
-    return host not in INSECURE_HOSTS and VERIFY_SSL_DEFAULT
+    return VERIFY_SSL_DEFAULT and not host_is_insecure(host)
 
 
 # ============= 사용 예시 =============
@@ -7,7 +7,7 @@ def looks_time(text: str) -> bool:
     return bool(TIME_RX.search(str(text)))
 
 def all_times(text: str) -> list[str]:
-    return TIME_RX.findall(text or "")
+    return [m.group(0) for m in TIME_RX.finditer(text or "")]
 
 def first_time(text: str) -> str:
     m = TIME_RX.search(text or "")
@@ -2,11 +2,13 @@
 
 from flask import Flask
 
-from config.settings import BASE_DIR
+from config.settings import BASE_DIR, ensure_dirs
 
 
 def create_app():
     """Flask 애플리케이션을 생성하고 설정합니다."""
+    ensure_dirs()
+
     app = Flask(
         __name__,
         template_folder=BASE_DIR / "templates",
@@ -7,6 +7,7 @@ from webapp.services.marathon import MarathonService
 from webapp.services.participant import ParticipantService
 from webapp.services.records import RecordsService
 from webapp.services.group import GroupService
+from utils.network_utils import get_session
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
@@ -207,7 +208,7 @@ def debug_participant():
         return jsonify({"error": "Participant has no URL template"}), 400
 
     try:
-        r = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=15)
+        r = get_session().get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=15)
         r.raise_for_status()
         soup = BeautifulSoup(r.text, "html.parser")
         rows = []
@@ -1,9 +1,9 @@
 # webapp/services/group.py
 from typing import Optional, Dict
 from datetime import datetime
-import secrets, string
+import secrets, string, time
 
-from core.database import get_db
+from core.database import get_db_read, get_db_write
 
 class GroupService:
     @staticmethod
@@ -25,21 +25,22 @@ class GroupService:
             return {"success": False, "error": "group_name is required"}
 
         try:
-            with get_db() as conn:
+            with get_db_write() as conn:
                 # 대회 존재 확인 (선택)
                 m = conn.execute("SELECT id FROM marathons WHERE id=?", (marathon_id,)).fetchone()
                 if not m:
                     return {"success": False, "error": "마라톤을 찾을 수 없습니다"}
 
                 code = GroupService._gen_unique_code(conn, 8)
+                # created_at은 명시적으로 epoch 초 기록
+                # (과거 DB의 groups는 DEFAULT CURRENT_TIMESTAMP 정의가 그대로 남아 있음)
                 cur = conn.execute(
                     """
                     INSERT INTO groups (marathon_id, name, group_code, enabled, created_at, updated_at)
                     VALUES (?, ?, ?, 1, ?, ?)
                     """,
-                    (marathon_id, group_name.strip(), code, datetime.now().isoformat(), datetime.now().isoformat())
+                    (marathon_id, group_name.strip(), code, int(time.time()), datetime.now().isoformat())
                 )
-                conn.commit()
                 return {"success": True, "group_id": cur.lastrowid, "group_code": code}
         except Exception as e:
             return {"success": False, "error": f"{type(e).__name__}: {e}"}
@@ -48,7 +49,7 @@ class GroupService:
     def get_by_code(group_code: str) -> Optional[Dict]:
         if not group_code:
             return None
-        with get_db() as conn:
+        with get_db_read() as conn:
             row = conn.execute(
                 "SELECT * FROM groups WHERE group_code=?", (group_code.strip().upper(),)
             ).fetchone()
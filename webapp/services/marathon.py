@@ -6,7 +6,7 @@ from datetime import datetime
 import random
 import string
 
-from core.database import get_db
+from core.database import get_db_read, get_db_write
 
 
 class MarathonService:
@@ -39,7 +39,7 @@ class MarathonService:
         Returns:
             마라톤 목록
         """
-        with get_db() as conn:
+        with get_db_read() as conn:
             if enabled_only:
                 query = "SELECT * FROM marathons WHERE enabled=1 ORDER BY id DESC"
             else:
@@ -59,7 +59,7 @@ class MarathonService:
         Returns:
             마라톤 정보 또는 None
         """
-        with get_db() as conn:
+        with get_db_read() as conn:
             row = conn.execute(
                 "SELECT * FROM marathons WHERE id=?",
                 (marathon_id,)
@@ -74,7 +74,7 @@ class MarathonService:
         """
         if not code:
             return None
-        with get_db() as conn:
+        with get_db_read() as conn:
             row = conn.execute(
                 "SELECT * FROM marathons WHERE join_code=?",
                 (code.strip(),)
@@ -108,7 +108,7 @@ class MarathonService:
             return {'success': False, 'error': '새로고침 주기는 최소 5초 이상이어야 합니다'}
 
         try:
-            with get_db() as conn:
+            with get_db_write() as conn:
                 # 고유 참여 코드 생성
                 join_code = MarathonService.generate_unique_code(conn, length=8)
                 cursor = conn.execute(
@@ -130,7 +130,6 @@ class MarathonService:
                         datetime.now().isoformat()
                     )
                 )
-                conn.commit()
 
                 return {
                     'success': True,
@@ -153,7 +152,7 @@ class MarathonService:
             return {'success': False, 'error': 'marathon_id가 필요합니다'}
 
         try:
-            with get_db() as conn:
+            with get_db_write() as conn:
                 # 존재 여부 확인
                 row = conn.execute(
                     "SELECT id FROM marathons WHERE id=?",
@@ -169,7 +168,6 @@ class MarathonService:
                     "UPDATE marathons SET join_code=?, updated_at=? WHERE id=?",
                     (new_code, datetime.now().isoformat(), marathon_id)
                 )
-                conn.commit()
 
                 return {'success': True, 'join_code': new_code}
 
@@ -239,12 +237,11 @@ class MarathonService:
         values.append(marathon_id)
         
         try:
-            with get_db() as conn:
+            with get_db_write() as conn:
                 conn.execute(
                     f"UPDATE marathons SET {', '.join(fields)} WHERE id=?",
                     values
                 )
-                conn.commit()
                 
                 return {'success': True}
         
@@ -266,12 +263,11 @@ class MarathonService:
             {'success': bool, 'error': str}
         """
         try:
-            with get_db() as conn:
+            with get_db_write() as conn:
                 conn.execute(
                     "DELETE FROM marathons WHERE id=?",
                     (marathon_id,)
                 )
-                conn.commit()
                 
                 return {'success': True}
         
@@ -293,7 +289,7 @@ class MarathonService:
             {'success': bool, 'enabled': bool, 'error': str}
         """
         try:
-            with get_db() as conn:
+            with get_db_write() as conn:
                 # 현재 상태 조회
                 row = conn.execute(
                     "SELECT enabled FROM marathons WHERE id=?",
@@ -313,7 +309,6 @@ class MarathonService:
                     "UPDATE marathons SET enabled=?, updated_at=? WHERE id=?",
                     (new_enabled, datetime.now().isoformat(), marathon_id)
                 )
-                conn.commit()
                 
                 return {
                     'success': True,
@@ -342,7 +337,7 @@ class MarathonService:
                 'last_updated': str
             }
         """
-        with get_db() as conn:
+        with get_db_read() as conn:
             # 참가자 수
             total_participants = conn.execute(
                 "SELECT COUNT(*) FROM participants WHERE marathon_id=?",
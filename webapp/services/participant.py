@@ -5,7 +5,7 @@ from typing import Dict, List, Optional, Any
 from urllib.parse import urlsplit
 
 from utils.time_utils import looks_time
-from core.database import get_db
+from core.database import get_db_read, get_db_write
 from webapp.services.prediction import PredictionService
 
 
@@ -60,7 +60,7 @@ class ParticipantService:
 
         # 중복 방지: 같은 마라톤 내 동일 nameorbibno는 스킵
         try:
-            with get_db() as conn:
+            with get_db_write() as conn:
                 # 이미 존재하는 bib 목록 미리 조회
                 bib_list = [b for _, _, b in clean_rows]
                 placeholders = ",".join(["?"] * len(bib_list))
@@ -89,8 +89,6 @@ class ParticipantService:
                         errors.append(f"row {idx}: insert fail ({type(e).__name__}: {e})")
                         skipped += 1
 
-                conn.commit()
-
             return {
                 "success": True,
                 "created": created,
@@ -126,10 +124,14 @@ class ParticipantService:
     - marathon_id가 없어도 마라톤 총거리를 JOIN해서 예측 가능하게 함
     - 스플릿은 한 번에 가져와 pid별로 그룹화
         """
-        from core.database import get_db
+        from core.database import (
+            get_db_read, SPLIT_SELECT, SPLIT_PARTICIPANT_ID, SPLIT_LABEL,
+            SPLIT_KM, SPLIT_NET, SPLIT_CLOCK, SPLIT_PACE,
+        )
         from webapp.services.prediction import PredictionService
 
-        with get_db() as conn:
+        # 대량 조회 경로: sqlite3.Row 대신 튜플로 받아 직접 dict 구성
+        with get_db_read(row_dict=False) as conn:
             # 1) 참가자 + 마라톤 JOIN (항상)
             base_sql = (
                 "SELECT p.*, m.total_distance_km "
@@ -145,8 +147,9 @@ class ParticipantService:
             where = (" WHERE " + " AND ".join(conds)) if conds else ""
             order = " ORDER BY p.id DESC"
 
-            rows = conn.execute(base_sql + where + order, params).fetchall()
-            participants = [dict(r) for r in rows]
+            cur = conn.execute(base_sql + where + order, params)
+            cols = [d[0] for d in cur.description]
+            participants = [dict(zip(cols, r)) for r in cur.fetchall()]
             if not participants:
                 return []
 
@@ -155,14 +158,22 @@ class ParticipantService:
             splits_by_pid = {pid: [] for pid in pids}
             placeholders = ",".join("?" for _ in pids)
             split_rows = conn.execute(
-                f"""SELECT participant_id, point_label, point_km, net_time, pass_clock, pace
+                f"""SELECT {SPLIT_SELECT}
                     FROM splits
                     WHERE participant_id IN ({placeholders})
                     ORDER BY id ASC""",
                 pids
-            ).fetchall()
+            )
             for s in split_rows:
-                splits_by_pid[s["participant_id"]].append(dict(s))
+                pid = s[SPLIT_PARTICIPANT_ID]
+                splits_by_pid[pid].append({
+                    "participant_id": pid,
+                    "point_label": s[SPLIT_LABEL],
+                    "point_km": s[SPLIT_KM],
+                    "net_time": s[SPLIT_NET],
+                    "pass_clock": s[SPLIT_CLOCK],
+                    "pace": s[SPLIT_PACE],
+                })
 
             # 3) 예측 계산 + 호환 필드 주입
             for p in participants:
@@ -195,7 +206,7 @@ class ParticipantService:
         Returns:
             참가자 정보 또는 None
         """
-        with get_db() as conn:
+        with get_db_read() as conn:
             row = conn.execute(
                 "SELECT * FROM participants WHERE id=?",
                 (participant_id,)
@@ -232,13 +243,12 @@ class ParticipantService:
         )
         
         try:
-            with get_db() as conn:
+            with get_db_write() as conn:
                 cursor = conn.execute(
                     """INSERT INTO participants(marathon_id, alias, nameorbibno, active)
                        VALUES(?, ?, ?, 1)""",
                     (marathon_id, alias.strip() if alias else None, nameorbibno)
                 )
-                conn.commit()
                 
                 return {
                     'success': True,
@@ -293,12 +303,11 @@ class ParticipantService:
         values.append(participant_id)
         
         try:
-            with get_db() as conn:
+            with get_db_write() as conn:
                 conn.execute(
                     f"UPDATE participants SET {', '.join(fields)} WHERE id=?",
                     values
                 )
-                conn.commit()
                 
                 return {'success': True}
         
@@ -320,12 +329,11 @@ class ParticipantService:
             {'success': bool, 'error': str}
         """
         try:
-            with get_db() as conn:
+            with get_db_write() as conn:
                 conn.execute(
                     "DELETE FROM participants WHERE id=?",
                     (participant_id,)
                 )
-                conn.commit()
                 
                 return {'success': True}
         
@@ -351,7 +359,7 @@ class ParticipantService:
                 'url': str
             }
         """
-        with get_db() as conn:
+        with get_db_read() as conn:
             # 예측 및 기록 계산에 필요한 서비스들을 먼저 import 합니다.
             from webapp.services.prediction import PredictionService
 
@@ -414,7 +422,7 @@ class ParticipantService:
         Returns:
             정규화된 참가번호
         """
-        with get_db() as conn:
+        with get_db_read() as conn:
             row = conn.execute(
                 "SELECT url_template FROM marathons WHERE id=?",
                 (marathon_id,)
@@ -3,7 +3,7 @@
 
 from typing import List, Dict, Optional
 
-from config.constants import FINISH_KEYWORDS_KO, FINISH_KEYWORDS_EN, DISTANCE_TOLERANCE
+from config.constants import FINISH_RX, tolerance_for
 from utils.time_utils import looks_time, sec_from_mmss, eta_from_clock, sec_per_km
 from utils.distance_utils import km_from_label, snap_distance, ensure_finish_label
 import re
@@ -17,9 +17,7 @@ def _clean(s: Optional[str]) -> str:
     s = _ZWSP_RE.sub("", s).replace("\xa0"," ").strip()
     return _WS_RE.sub(" ", s)
 def _is_finish_label(label: Optional[str]) -> bool:
-    raw = _clean(label)
-    low = raw.lower()
-    return any(k in raw for k in FINISH_KEYWORDS_KO) or any(k in low for k in FINISH_KEYWORDS_EN)
+    return bool(FINISH_RX.search(_clean(label)))
 
 class PredictionService:
     @staticmethod
@@ -47,8 +45,10 @@ class PredictionService:
 
         # 2) 주행 중 예측
         last_split = splits[-1]
-        psecs = [sec_per_km(s.get("pace")) for s in splits if sec_per_km(s.get("pace")) is not None]
-        use_spk = sec_per_km(last_split.get("pace")) or (sum(psecs) / len(psecs) if psecs else None)
+        # 페이스는 스플릿마다 한 번만 파싱 (마지막 값도 재사용)
+        paces = [sec_per_km(s.get("pace")) for s in splits]
+        psecs = [p for p in paces if p is not None]
+        use_spk = paces[-1] or (sum(psecs) / len(psecs) if psecs else None)
         if use_spk is None:
             return {"finished": False, "status_text": "주행중",
                     "next_point_km": None, "next_point_eta": None,
@@ -94,11 +94,7 @@ class PredictionService:
 
         # 2) 목표거리 근접
         snapped_km = snap_distance(total_km) or total_km
-        tolerance = 0.5
-        for (min_km, max_km), tol in DISTANCE_TOLERANCE.items():
-            if min_km <= snapped_km < max_km:
-                tolerance = tol
-                break
+        tolerance = tolerance_for(snapped_km)
 
         for s in reversed(splits):
             point_km = s.get("point_km") or km_from_label(_clean(s.get("point_label")))
@@ -4,7 +4,7 @@
 import re
 from typing import List, Dict, Optional
 
-from core.database import get_db
+from core.database import get_db_read
 from utils.distance_utils import label_for_distance
 from utils.file_utils import to_web_static_url
 from utils.time_utils import looks_time
@@ -74,7 +74,7 @@ class RecordsService:
         """
         모든 활성 참가자의 기록을 조회, 필터링, 정렬
         """
-        with get_db() as conn:
+        with get_db_read() as conn:
             participants = conn.execute("""
                 SELECT p.*, m.name AS marathon_name, m.total_distance_km AS default_km, m.url_template
                 FROM participants p
@@ -127,29 +127,31 @@ class RecordsService:
     def _pick_best_record(conn, participant: Dict) -> Optional[Dict]:
         """참가자의 최종 기록(net, clock) 선택"""
         participant_id = participant["id"]
-        splits = conn.execute(
-            "SELECT * FROM splits WHERE participant_id=? ORDER BY id ASC",
+        # 참가자 수만큼 반복 호출되는 경로 → Row 대신 튜플로 조회
+        cur = conn.cursor()
+        cur.row_factory = None
+        splits = cur.execute(
+            "SELECT point_label, net_time, pass_clock FROM splits WHERE participant_id=? ORDER BY id ASC",
             (participant_id,)
         ).fetchall()
 
         if not splits:
             return None
-        splits = [dict(row) for row in splits]
 
-        # 완주 기록 선택
-        finish_splits = [s for s in splits if PredictionService.is_finish_label(s.get("point_label"))]
+        # 완주 기록 선택 (point_label, net_time, pass_clock)
+        finish_splits = [s for s in splits if PredictionService.is_finish_label(s[0])]
         best_split = finish_splits[-1] if finish_splits else splits[-1]
 
-        record = (best_split["net_time"] or "").strip()
+        record = (best_split[1] or "").strip()
 
         # 그래도 net_time이 없으면 마지막 스플릿의 net_time을 다시 시도
         if not looks_time(record):
-            record = (splits[-1]["net_time"] or "").strip()
+            record = (splits[-1][1] or "").strip()
 
-        clock = (best_split["pass_clock"] or "").strip()
+        clock = (best_split[2] or "").strip()
 
         return {
-            "point_label": best_split["point_label"],
+            "point_label": best_split[0],
             "record": record if looks_time(record) else "",
             "clock": clock if looks_time(clock) else "",
         }